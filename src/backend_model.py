@@ -3,7 +3,11 @@ from __future__ import annotations
 from typing         import Final, NamedTuple, Self, Callable, Iterable, TypeAlias
 from dataclasses    import dataclass
 from datetime       import date, timedelta
-from math           import sqrt, ceil, floor
+from math           import sqrt, ceil, floor, sin, cos, pi, nan
+from bisect         import bisect_left, bisect_right
+from heapq          import merge
+from array          import array
+from itertools      import groupby, accumulate
 
 from generic_lib.utils import *
 from constants   import *
@@ -14,7 +18,7 @@ _FLAG_DEBUG_PRINTS_SECTION_SOLVER: Final[bool] = False
 DBG_PRINT: Callable[..., None] = print if _FLAG_DEBUG_PRINTS_SECTION_SOLVER else lambda *x, **y: None
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Measurement:
     absolute : float | None
     mean     : float | None
@@ -23,27 +27,104 @@ class Measurement:
     minimum: float | date | None = None
     maximum: float | date | None = None
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Frame_statistics:
     readings_count: int
     
     days_stats: Measurement
-    reading_attributes_stats: list[ Measurement ]
+    reading_attributes_stats: tuple[ Measurement, ... ]
+    
+    def __post_init__(self) -> None:
+        object.__setattr__( self, "reading_attributes_stats", tuple( self.reading_attributes_stats ) )
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Analyzed_month:
     month : int
     points: Frame_statistics
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Analyzed_year:
     year  : int
     points: Frame_statistics
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Analyzed_year_month:
     year  : int
-    months: list[ Analyzed_month ]
+    months: tuple[ Analyzed_month, ... ]
+    
+    def __post_init__(self) -> None:
+        object.__setattr__( self, "months", tuple( self.months ) )
+
+reading_delta_t = NamedTuple( "reading_delta_t", [("delta", float), ("ddays", int), ("rate", float), ("reset", bool)] )
+
+class Reading_Deltas:
+    """
+    Change of each reading-attribute (meter) since its nearest earlier reading, computed in a single pass
+
+    This is the one delta stage of a report, consumed by the detail table as well as by the statistics of `Analyze_Reading`:
+        - missing (None) and zero values are bridged by the nearest earlier non-zero value of the same meter
+        - negative deltas are flagged as `reset`, e.g. because a meter got changed and was reset to 0
+    
+    The deltas are stored per meter in flat `array`s (NaN marks readings without a delta),
+    thus even long histories only take a few bytes per reading and meter.
+    """
+    
+    __slots__ = ( "readings", "__delta", "__ddays" )
+    
+    readings: list[db.Reading]
+    __delta : list[array]
+    __ddays : list[array]
+    
+    def __init__(self, readings: list[db.Reading]) -> None:
+        """
+        Args:
+            readings (`list[ db.Reading ]`): raw data directly from database, dates must be distinct
+        """
+        # sort all data entries by date (they usually are already in order, but we can not be sure)
+        self.readings = sorted( readings, key=lambda r: r.date )
+        
+        ordinals = [ r.date.toordinal() for r in self.readings ]
+        
+        self.__delta = [ array( 'd', [nan] ) * len(ordinals) for _ in range(COUNT_READING_ATTRIBUTES) ]
+        self.__ddays = [ array( 'l', [0]   ) * len(ordinals) for _ in range(COUNT_READING_ATTRIBUTES) ]
+        
+        for k in range(COUNT_READING_ATTRIBUTES):
+            delta, ddays = self.__delta[k], self.__ddays[k]
+            earlier_v, earlier_o = None, None
+            
+            for i, r in enumerate( self.readings ):
+                v = r.attributes[k]
+                
+                if v is None:
+                    continue
+                
+                if earlier_v is not None:
+                    delta[i] = v - earlier_v
+                    ddays[i] = ordinals[i] - earlier_o
+                
+                if v:
+                    earlier_v, earlier_o = v, ordinals[i]
+    
+    def __len__(self) -> int:
+        return len( self.readings )
+    
+    def __getitem__(self, index: tuple[int, int]) -> reading_delta_t | None:
+        """
+        Args:
+            index (`tuple[int, int]`): (index of the reading, index of the reading-attribute)
+
+        Returns:
+            `reading_delta_t | None`: change since the nearest earlier value, `None` if the reading has no value or there is no earlier value
+        """
+        i, k = index
+        delta = self.__delta[k][i]
+        
+        if delta != delta: # NaN
+            return None
+        
+        ddays = self.__ddays[k][i]
+        
+        return reading_delta_t( delta, ddays, delta / ddays, delta < 0 )
 
 class Analyze_Reading:
     """
@@ -55,17 +136,24 @@ class Analyze_Reading:
         - as single data frame
     """
     
+    __deltas   : Reading_Deltas
     __readings : list[db.Reading]
-    __year_ids : list[int]
     
     def __init__(self, readings: list[db.Reading] ) -> None:
         """
         Args:
             readings (`list[ db.Reading ]`): raw data directly from database
         """
-        # sort all data entries by date (they usually are already in order, but we can not be sure)
-        self.__readings = sorted( readings, key=lambda r: r.date )
-        self.__year_ids = sorted( set( map(lambda r: r.date.year, readings) ) )
+        self.__deltas   = Reading_Deltas( readings )
+        self.__readings = self.__deltas.readings
+    
+    @property
+    def deltas(self) -> Reading_Deltas:
+        """
+        Returns:
+            `Reading_Deltas`: delta stage the statistics are based on, shareable with the detail table of the same readings
+        """
+        return self.__deltas
     
     def monthly(self) -> list[ Analyzed_year_month ]:
         """
@@ -77,40 +165,25 @@ class Analyze_Reading:
         Returns:
             `list[ Analyzed_year_month ]`: list of yearly grouped and monthly analyzed data
         """
-        years = [ Analyzed_year_month( yr, [] ) for yr in self.__year_ids ]
-        
-        for year in years:
-            readings_in_year = list( filter( lambda r: r.date.year == year.year, self.__readings ) )
-            
-            months: dict[int, list[db.Reading]] = dict()
-            
-            for reading in readings_in_year:
-                if not reading.date.month in months.keys():
-                    months[ reading.date.month ] = []
-                
-                months[ reading.date.month ].append( reading )
-            
-            
-            # month_ids = list( map( lambda r: r.date.month, readings_in_year ) )
-            # months = {
-            #     m_id : 
-            #     list( filter(lambda r: r.date.month == m_id, readings_in_year) ) for m_id in month_ids
-            # }
-            
-            # filter out months with insufficient readings (needs at least 2, to calculate statistical data)
-            months = dict( filter( lambda kv: len(kv[1]) > 1, months.items() ) )
-            
-            year.months = [
-                Analyzed_month( 
-                    month_id,
-                    self._calculate_statistics(
-                        points, 
-                        date(year.year, month_id, 1), 
-                        date(year.year, month_id+1, 1) if month_id < 12 else date(year.year+1, 1, 1) 
+        years: list[ Analyzed_year_month ] = []
+        
+        for year_id, month_frames in groupby( self._frames( lambda r: (r.date.year, r.date.month) ), key=lambda f: f[0][0] ):
+            years.append( Analyzed_year_month(
+                year_id,
+                [
+                    Analyzed_month( 
+                        month_id,
+                        self._calculate_statistics(
+                            start, end,
+                            date(year_id, month_id, 1), 
+                            date(year_id, month_id+1, 1) if month_id < 12 else date(year_id+1, 1, 1) 
+                        )
                     )
-                )
-                for month_id, points in months.items()
-            ]
+                    for (_, month_id), start, end in month_frames
+                    # filter out months with insufficient readings (needs at least 2, to calculate statistical data)
+                    if end - start > 1
+                ]
+            ) )
         
         return list( filter( lambda y: y.months, years ) )
 
@@ -124,19 +197,13 @@ class Analyze_Reading:
         Returns:
             `list[ Analyzed_year ]`: list of yearly grouped and monthly analyzed data
         """
-        
-        out_list = []
-        for year_id in self.__year_ids:
-            points = list( filter( lambda r: r.date.year == year_id, self.__readings ) )
-
-            out_list.append(
-                Analyzed_year(
-                    year_id,
-                    self._calculate_statistics( points, date(year_id, 1, 1), date(year_id+1, 1, 1) )
-                )
+        return [
+            Analyzed_year(
+                year_id,
+                self._calculate_statistics( start, end, date(year_id, 1, 1), date(year_id+1, 1, 1) )
             )
-        
-        return out_list
+            for year_id, start, end in self._frames( lambda r: r.date.year )
+        ]
 
     def completely(self) -> Frame_statistics:
         """
@@ -146,16 +213,37 @@ class Analyze_Reading:
             `Frame_statistics`: completely analyzed data-frame
         """
         
-        return self._calculate_statistics( self.__readings )
+        return self._calculate_statistics( 0, len(self.__readings) )
+
+    def _frames(self, key: Callable[[db.Reading], T]) -> list[ tuple[T, int, int] ]:
+        """
+        split the (sorted) readings into consecutive frames of equal keys
+
+        Args:
+            key (`Callable[[db.Reading], T]`): key of a reading, e.g. its year
+
+        Returns:
+            `list[ tuple[T, int, int] ]`: (key, start index, end index) of each frame
+        """
+        frames = []
+        start  = 0
+        
+        for frame_key, group in groupby( self.__readings, key=key ):
+            end = start + sum( 1 for _ in group )
+            frames.append( (frame_key, start, end) )
+            start = end
+        
+        return frames
 
-    @staticmethod
     def _calculate_statistics(
-        points:list[ db.Reading ],
+        self,
+        start:int,
+        end:int,
         extrapolation_date_lower_bound:date=None,
         extrapolation_date_upper_bound:date=None
         ) -> Frame_statistics:
         """
-        statistically analyze a set of reading points
+        statistically analyze a frame of reading points
 
         calculates the following for the total days and for each reading-attribute:
         - sum
@@ -169,13 +257,15 @@ class Analyze_Reading:
             Expect noisy values for insufficiently small time spans or insufficient amounts of data points.
 
         Args:
-            points (`list[ db.Reading ]`): raw data directly from database
+            start (`int`): index of the first reading of the frame
+            end (`int`): index after the last reading of the frame
             extrapolation_date_lower_bound (`date`, optional): lower bound for extra-/interpolation. Defaults to None.
             extrapolation_date_upper_bound (`date`, optional): upper bound for extra-/interpolation. Defaults to None.
 
         Returns:
             `Frame_statistics`: statistically analyzed data points
         """
+        points = self.__readings[start:end]
         
         amount_points = len(points)
         
@@ -189,7 +279,6 @@ class Analyze_Reading:
         delta_d, total_d, sum_stats_d, sum_stats_sqr_d = 0.0, 0.0, 0.0, 0.0
         mean_d, deviation_d = 0.0, None
         
-        delta           : list[float]      = [0.0]  * COUNT_READING_ATTRIBUTES
         total           : list[float|None] = [0.0]  * COUNT_READING_ATTRIBUTES
         sum_stats       : list[float|None] = [0.0]  * COUNT_READING_ATTRIBUTES
         sum_stats_sqr   : list[float|None] = [0.0]  * COUNT_READING_ATTRIBUTES
@@ -233,43 +322,32 @@ class Analyze_Reading:
             sum_stats_d     += delta_d
             sum_stats_sqr_d += delta_d ** 2
             
+            days_in_frame = (r.date - points[0].date).days
+            
             # iterate over all reading value objs
             for k in range( COUNT_DIGIT_OBJS ):
-                # implicitly catches case 7
-                if r.attributes[k] is None:
-                    continue
-                
-                earlier_v = None
-                n = (i-1)+1
-
-                # search for an earlier value to calculate a delta value
+                # the delta stage bridges missing values with the nearest earlier value
                 # catches case 2, 3, 5
-                while (n:=n-1) >= 0:
-                    earlier_v = points[n].attributes[k]
-                    if earlier_v:
-                        delta[k] = r.attributes[k] - earlier_v
-                        break
+                change = self.__deltas[ start+i, k ]
                 
-                # we are not able to calculate a data value if all previous values are None
-                # catches case 4, 6
-                if earlier_v is None:
+                # we are not able to calculate a data value if all previous values (of this frame) are None
+                # implicitly catches case 7, catches case 4, 6
+                if change is None or change.ddays > days_in_frame:
                     continue
                 
-                ddays = ( r.date - points[n].date ).days
-                
                 # to correct for large negative values, e.g. because a meter got changed and was reseted to 0 or other faulty data
                 # in this context we usually expect positive changes, i.e. strictly monotonic increasing data points
                 # therefor we reject negative deltas and do not include that time span (and values)
                 # case 1
-                if delta[k] < 0:
-                    gap[k] += ddays
+                if change.reset:
+                    gap[k] += change.ddays
                     continue
                 
                 included_points[k] += 1
                 
-                total[k]         += delta[k]
-                sum_stats[k]     += delta[k] / ddays
-                sum_stats_sqr[k] += (delta[k] / ddays) ** 2
+                total[k]         += change.delta
+                sum_stats[k]     += change.rate
+                sum_stats_sqr[k] += change.rate ** 2
         
         # ------------------------------------------------------------------------------------------------------------------------------------------
         # mean and deviation are measured in respect to the change of value per day
@@ -313,6 +391,444 @@ class Analyze_Reading:
 
 
 
+class Consumption_Rate:
+    """
+    Piecewise linear consumption of a single reading-attribute (meter)
+
+    The readings are resampled once into a cumulative consumption series over the reading dates,
+    thus the consumption of any date-range can be determined in `O(log n)` without revisiting the readings.
+    
+    Same as in `Analyze_Reading`:
+        - missing values (None or 0.0) are bridged by the next earlier value
+        - negative deltas (i.e. meter resets) and days outside of the readings are filled in with the mean consumption per day
+    """
+    
+    __ordinals  : list[int]
+    __cumulative: list[float]
+    __mean_rate : float | None
+    
+    def __init__(self, readings: list[db.Reading], attribute_index: int) -> None:
+        """
+        Args:
+            readings (`list[ db.Reading ]`): raw data directly from database
+            attribute_index (`int`): index of the reading-attribute, i.e. meter, to resample
+        """
+        points = sorted(
+            ( (r.date.toordinal(), r.attributes[attribute_index]) for r in readings if r.attributes[attribute_index] ),
+            key=lambda p: p[0]
+        )
+        
+        # first pass: mean consumption per day of all valid (non negative) deltas
+        valid_delta, valid_days = 0.0, 0
+        for (o0, v0), (o1, v1) in zip( points, points[1:] ):
+            if v1 - v0 >= 0:
+                valid_delta += v1 - v0
+                valid_days  += o1 - o0
+        
+        self.__mean_rate = valid_delta / valid_days if valid_days > 0 else None
+        
+        # second pass: cumulative consumption at each reading date
+        self.__ordinals   = [ p[0] for p in points ]
+        self.__cumulative = [ 0.0 ] * len(points)
+        
+        for i in range( 1, len(points) ):
+            delta = points[i][1] - points[i-1][1]
+            
+            if delta < 0:
+                delta = ( points[i][0] - points[i-1][0] ) * ( self.__mean_rate or 0.0 )
+            
+            self.__cumulative[i] = self.__cumulative[i-1] + delta
+    
+    def is_valid(self) -> bool:
+        """
+        Returns:
+            `bool`: True iff the readings allowed to determine any consumption rate
+        """
+        return self.__mean_rate is not None
+    
+    def cumulative(self, day: date) -> float:
+        """
+        cumulative consumption at a given date relative to the first reading
+
+        Args:
+            day (`date`): date to evaluate, dates outside of the readings are extrapolated with the mean consumption per day
+
+        Returns:
+            `float`: cumulative consumption
+        """
+        assert self.is_valid(), "consumption rate is undetermined, at least two valid readings are required"
+        
+        o = day.toordinal()
+        i = bisect_right( self.__ordinals, o ) - 1
+        
+        if i < 0:
+            return ( o - self.__ordinals[0] ) * self.__mean_rate
+        
+        if i >= len(self.__ordinals) - 1:
+            return self.__cumulative[-1] + ( o - self.__ordinals[-1] ) * self.__mean_rate
+        
+        o0, o1 = self.__ordinals[i], self.__ordinals[i+1]
+        c0, c1 = self.__cumulative[i], self.__cumulative[i+1]
+        
+        return c0 + ( c1 - c0 ) * ( o - o0 ) / ( o1 - o0 )
+    
+    def consumption(self, date_range: Dates_Delta) -> float:
+        """
+        consumption in a date-range, measured in the same manner as `Dates_Delta.days`
+
+        Args:
+            date_range (`Dates_Delta`): date-range to evaluate
+
+        Returns:
+            `float`: consumption in the date-range
+        """
+        return self.cumulative( date_range.date_high ) - self.cumulative( date_range.date_low )
+    
+    def breakpoints(self, date_range: Dates_Delta) -> list[date]:
+        """
+        reading dates strictly inside of a date-range, i.e. dates the consumption per day may change
+
+        Args:
+            date_range (`Dates_Delta`): date-range to evaluate
+
+        Returns:
+            `list[date]`: sorted reading dates
+        """
+        i_low  = bisect_right( self.__ordinals, date_range.date_low.toordinal() )
+        i_high = bisect_left ( self.__ordinals, date_range.date_high.toordinal() )
+        
+        return [ date.fromordinal( o ) for o in self.__ordinals[i_low:i_high] ]
+
+
+tariff_costs_t = NamedTuple("tariff_costs_t", [("units", float), ("base_costs", float), ("consumption_costs", float), ("total", float)] )
+class Tariff_Schedule:
+    """
+    Price schedule of a single meter (reading-attribute)
+
+    Each tariff is valid from its `valid_from` date on until the next tariff of the schedule.
+    Costs are evaluated by a sorted merge of the tariff change points and the breakpoints of the consumption,
+    thus each merged segment has a single tariff and a constant consumption per day.
+    """
+    
+    __tariffs   : list[db.Tariff]
+    __ordinals  : list[int]
+    
+    def __init__(self, tariffs: list[db.Tariff], meter: int) -> None:
+        """
+        Args:
+            tariffs (`list[ db.Tariff ]`): raw data directly from database, tariffs of other meters are ignored
+            meter (`int`): index of the reading-attribute, i.e. meter, of this schedule
+        """
+        self.__tariffs  = sorted( ( t for t in tariffs if t.meter == meter ), key=lambda t: t.valid_from )
+        self.__ordinals = [ t.valid_from.toordinal() for t in self.__tariffs ]
+    
+    def tariff_at(self, day: date) -> db.Tariff | None:
+        """
+        Args:
+            day (`date`): date to evaluate
+
+        Returns:
+            `db.Tariff | None`: tariff valid at the given date, None if no tariff is valid yet
+        """
+        i = bisect_right( self.__ordinals, day.toordinal() ) - 1
+        
+        return self.__tariffs[i] if i >= 0 else None
+    
+    def costs(self, date_range: Dates_Delta, consumption: Consumption_Rate = None) -> tariff_costs_t:
+        """
+        evaluate the costs of a date-range, measured in the same manner as `Dates_Delta.days`
+
+        - base fees are prorated by days
+        - tiered unit prices apply to the cumulative consumption since the beginning of the date-range
+        - days without any valid tariff have no costs
+
+        Args:
+            date_range (`Dates_Delta`): date-range to evaluate
+            consumption (`Consumption_Rate`, optional): consumption of the meter, None or invalid if only the base fees are to be evaluated. Defaults to None.
+
+        Returns:
+            `tariff_costs_t`: consumed units, base costs, consumption costs and total costs
+        """
+        consumption = consumption if consumption and consumption.is_valid() else None
+        
+        i_low  = bisect_right( self.__ordinals, date_range.date_low.toordinal() )
+        i_high = bisect_left ( self.__ordinals, date_range.date_high.toordinal() )
+        
+        change_points = [ t.valid_from for t in self.__tariffs[i_low:i_high] ]
+        breakpoints   = consumption.breakpoints( date_range ) if consumption else []
+        
+        units, base_costs, consumption_costs = 0.0, 0.0, 0.0
+        
+        tariff_index: int   = i_low - 1
+        seg_low     : date  = date_range.date_low
+        cum_low     : float = consumption.cumulative( seg_low ) if consumption else 0.0
+        
+        for seg_high in merge( change_points, breakpoints, [ date_range.date_high ] ):
+            if seg_high <= seg_low:
+                continue
+            
+            # advance to the tariff of this segment (change points are merged in order)
+            while tariff_index + 1 < len(self.__tariffs) and self.__ordinals[tariff_index + 1] <= seg_low.toordinal():
+                tariff_index += 1
+            
+            cum_high = consumption.cumulative( seg_high ) if consumption else 0.0
+            amount   = cum_high - cum_low
+            
+            if tariff_index >= 0:
+                tariff = self.__tariffs[tariff_index]
+                
+                base_costs        += tariff.base_fee * ( seg_high - seg_low ).days / Dates_Delta.DAYS_IN_YEAR
+                consumption_costs += self._tiered_price( tariff, units, amount )
+            
+            units  += amount
+            seg_low, cum_low = seg_high, cum_high
+        
+        return tariff_costs_t( units, base_costs, consumption_costs, base_costs + consumption_costs )
+    
+    @staticmethod
+    def _tiered_price(tariff: db.Tariff, units_before: float, amount: float) -> float:
+        """
+        price of consuming `amount` units after `units_before` units were already consumed
+
+        Args:
+            tariff (`db.Tariff`): tariff to apply
+            units_before (`float`): units consumed beforehand
+            amount (`float`): units to price
+
+        Returns:
+            `float`: price of the units
+        """
+        price     : float = 0.0
+        low       : float = units_before
+        high      : float = units_before + amount
+        unit_price: float = tariff.unit_price
+        
+        for threshold, tier_price in tariff.tiers:
+            if threshold > low:
+                price += ( min( high, threshold ) - low ) * unit_price
+                low    = min( high, threshold )
+            
+            unit_price = tier_price
+            
+            if low >= high:
+                return price
+        
+        return price + ( high - low ) * unit_price
+
+
+class Consumption_Forecast:
+    """
+    Seasonal model of the consumption per day of a single meter (reading-attribute)
+
+    The consumption per day is modeled by its mean and the first harmonic of the year:
+        `r(t) = a + b * cos(w*t) + c * sin(w*t)` with `w = 2*pi / DAYS_IN_YEAR` and `t` the ordinal of the day
+    
+    The coefficients are fitted by a (days) weighted least squares regression on the mean consumption per day between consecutive readings,
+    where each regressor is averaged exactly over its reading interval. The normal equations are accumulated incrementally,
+    thus each new reading updates the model in `O(1)` without refitting the history.
+    
+    Same as in `Analyze_Reading` missing values (None or 0.0) are bridged and negative deltas (i.e. meter resets) are rejected.
+    Histories shorter than a year can not determine the seasonality and are modeled by their mean consumption per day only.
+    """
+    
+    OMEGA: Final[float] = 2 * pi / Dates_Delta.DAYS_IN_YEAR
+    
+    __meter      : int
+    __first      : int | None
+    __last       : tuple[int, float] | None
+    __xtx        : list[list[float]]
+    __xty        : list[float]
+    __total_delta: float
+    __total_days : int
+    __coefficients: tuple[float, float, float] | None
+    
+    def __init__(self, readings: list[db.Reading], meter: int) -> None:
+        """
+        Args:
+            readings (`list[ db.Reading ]`): raw data directly from database
+            meter (`int`): index of the reading-attribute, i.e. meter, to model
+        """
+        self.__meter = meter
+        self.__first = None
+        self.__last  = None
+        
+        self.__xtx = [ [0.0]*3 for _ in range(3) ]
+        self.__xty = [ 0.0 ]*3
+        self.__total_delta, self.__total_days = 0.0, 0
+        
+        self.__coefficients = None
+        
+        for r in sorted( readings, key=lambda r: r.date ):
+            self.add_reading( r )
+    
+    def add_reading(self, reading: db.Reading) -> Self:
+        """
+        update the model by a new reading in `O(1)`
+
+        Args:
+            reading (`db.Reading`): reading later than all previously added readings
+
+        Returns:
+            `Self`: monad architecture
+        """
+        value = reading.attributes[self.__meter]
+        
+        if not value:
+            return self
+        
+        o = reading.date.toordinal()
+        
+        if self.__last is None:
+            self.__first, self.__last = o, (o, value)
+            return self
+        
+        o0, v0 = self.__last
+        assert o > o0, "readings must be added in chronological order"
+        
+        self.__last = (o, value)
+        
+        delta, days = value - v0, o - o0
+        
+        if delta < 0:
+            return self
+        
+        x = self._interval_regressors( o0, o )
+        y = delta / days
+        
+        for i in range(3):
+            self.__xty[i] += days * x[i] * y
+            for j in range(3):
+                self.__xtx[i][j] += days * x[i] * x[j]
+        
+        self.__total_delta += delta
+        self.__total_days  += days
+        
+        self.__coefficients = None
+        
+        return self
+    
+    def is_valid(self) -> bool:
+        """
+        Returns:
+            `bool`: True iff the readings allowed to determine any consumption rate
+        """
+        return self.__total_days > 0
+    
+    def last_reading(self) -> tuple[date, float] | None:
+        """
+        Returns:
+            `tuple[date, float] | None`: date and value of the latest reading of the meter, None if there is none
+        """
+        return ( date.fromordinal( self.__last[0] ), self.__last[1] ) if self.__last else None
+    
+    def coefficients(self) -> tuple[float, float, float]:
+        """
+        Returns:
+            `tuple[float, float, float]`: fitted coefficients `(a, b, c)` of `r(t) = a + b * cos(w*t) + c * sin(w*t)`
+        """
+        assert self.is_valid(), "consumption forecast is undetermined, at least two valid readings are required"
+        
+        if self.__coefficients is None:
+            self.__coefficients = self.__solve()
+        
+        return self.__coefficients
+    
+    def rate(self, day: date) -> float:
+        """
+        Args:
+            day (`date`): date to evaluate
+
+        Returns:
+            `float`: modeled consumption per day
+        """
+        a, b, c = self.coefficients()
+        t = day.toordinal()
+        
+        return a + b * cos( self.OMEGA * t ) + c * sin( self.OMEGA * t )
+    
+    def consumption(self, date_range: Dates_Delta) -> float:
+        """
+        modeled consumption in a date-range, measured in the same manner as `Dates_Delta.days`
+
+        Args:
+            date_range (`Dates_Delta`): date-range to evaluate
+
+        Returns:
+            `float`: modeled consumption in the date-range
+        """
+        o0, o1 = date_range.date_low.toordinal(), date_range.date_high.toordinal()
+        
+        if o1 == o0:
+            return 0.0
+        
+        return ( o1 - o0 ) * sum( k * x for k, x in zip( self.coefficients(), self._interval_regressors( o0, o1 ) ) )
+    
+    def project(self, day: date) -> float | None:
+        """
+        project the meter value to a date later than the latest reading
+
+        Args:
+            day (`date`): date to project to
+
+        Returns:
+            `float | None`: projected meter value, None if the model is undetermined
+        """
+        if not self.is_valid():
+            return None
+        
+        last_day, last_value = self.last_reading()
+        
+        return last_value + self.consumption( Dates_Delta( last_day, max( day, last_day ) ) )
+    
+    @classmethod
+    def _interval_regressors(cls, o0: int, o1: int) -> tuple[float, float, float]:
+        """
+        regressors `( 1, cos(w*t), sin(w*t) )` averaged over the days `[o0; o1]`
+
+        Args:
+            o0 (`int`): ordinal of the first day
+            o1 (`int`): ordinal of the last day, must be larger than `o0`
+
+        Returns:
+            `tuple[float, float, float]`: averaged regressors
+        """
+        w_d = cls.OMEGA * ( o1 - o0 )
+        
+        return (
+            1.0,
+            ( sin( cls.OMEGA * o1 ) - sin( cls.OMEGA * o0 ) ) / w_d,
+            ( cos( cls.OMEGA * o0 ) - cos( cls.OMEGA * o1 ) ) / w_d,
+        )
+    
+    def __solve(self) -> tuple[float, float, float]:
+        mean_rate = self.__total_delta / self.__total_days
+        
+        if self.__last[0] - self.__first < Dates_Delta.DAYS_IN_YEAR:
+            return ( mean_rate, 0.0, 0.0 )
+        
+        # gaussian elimination with partial pivoting of the 3x3 normal equations
+        m = [ row[:] + [y] for row, y in zip( self.__xtx, self.__xty ) ]
+        
+        for col in range(3):
+            pivot = max( range(col, 3), key=lambda r: abs( m[r][col] ) )
+            
+            if abs( m[pivot][col] ) < 1e-12 * self.__total_days:
+                return ( mean_rate, 0.0, 0.0 )
+            
+            m[col], m[pivot] = m[pivot], m[col]
+            
+            for r in range(col+1, 3):
+                f = m[r][col] / m[col][col]
+                for k in range(col, 4):
+                    m[r][k] -= f * m[col][k]
+        
+        x = [0.0]*3
+        for r in (2, 1, 0):
+            x[r] = ( m[r][3] - sum( m[r][k] * x[k] for k in range(r+1, 3) ) ) / m[r][r]
+        
+        return tuple( x )
+
+
 class Contribution:
     _contrib: dict[db.Person, float]
     
@@ -380,6 +896,8 @@ class Contribution:
         return self
     __radd__ = __add__
 
+_tree_evaluation_t = NamedTuple("_tree_evaluation_t", [("contribution", Contribution), ("min_width_per_day", dict[int, float]), ("max_range", Dates_Delta)] )
+
 class Section_Node():
     date_range: Dates_Delta
     sub_nodes : list[Section_Node]
@@ -413,22 +931,55 @@ class Section_Person_Solver( Section_Node ):
             `Section_Person_Solver`: constructed B-tree of subdivided person sections
         """
 
-        if self.date_range.days <= 0:
-            return self
-        
+        # every node only ever receives the tail of its parents (already sorted) propagation list,
+        # so the list is sorted once and each node only remembers the index its tail starts at
         propagate_list: list[db.Person] = sorted( persons_to_sectionize, key=lambda p: p.move_out - p.move_in, reverse=True )
         
+        # explicit stack instead of recursion, deep trees (e.g. many sequential tenants) would otherwise exceed the recursion limit
+        stack: list[tuple[Section_Person_Solver, int]] = [ (self, 0) ]
         
+        while stack:
+            node, tail_index = stack.pop()
+            
+            if node.date_range.days <= 0:
+                continue
+            
+            search_index = node._sectionize( propagate_list, tail_index )
+            
+            stack.extend( (sub, search_index+1) for sub in node.sub_nodes )
+        
+        return self
+    
+    def _sectionize(self, propagate_list: list[db.Person], tail_index: int) -> int:
+        """
+        subdivide this node by the first person of `propagate_list[tail_index:]` intersecting its date-range
+        
+        single step of `solve`, does not descend into the created subnodes
+
+        Args:
+            propagate_list (`list[db.Person]`): persons sorted by their occupancy duration (descending)
+            tail_index (`int`): index of the first person in `propagate_list` to be considered by this node
+
+        Returns:
+            `int`: index of the person this node was subdivided by, the subnodes have to continue after this index
+        """
         intersect    : Intersection = Intersection.DISJOINT
         p_date_range : Dates_Delta
 
         search_person: db.Person
-        search_index : int          = -1
+        search_index : int          = tail_index-1
+        
+        date_low : date = self.date_range.date_low
+        date_high: date = self.date_range.date_high
         
         while intersect == Intersection.DISJOINT and search_index < len(propagate_list)-1:
             search_index  += 1
             search_person  = propagate_list[search_index]
             
+            # cheap rejection of disjoint persons, most persons of long histories are disjoint to any deep node
+            if search_person.move_out < date_low or search_person.move_in > date_high:
+                continue
+            
             p_date_range = Dates_Delta( search_person.move_in, search_person.move_out )
             intersect    = self.date_range.intersect( p_date_range )
         
@@ -498,20 +1049,44 @@ class Section_Person_Solver( Section_Node ):
                         Section_Person_Solver( Dates_Delta( search_person.move_in, self.date_range.date_high ), search_person )
                     ]
         
+        return search_index
+    
+    def simplify(self) -> Self | None:
+        """
+        ### simplify and prepare the tree structure to be used for the distribution calculation
+
+        transforming following aspects:
+            - identifying and structurally removing children-less and non person managing leaf nodes
+            - propagating subnodes upwards for unnamed nodes (meaning nodes not responsible for any person)
+        
+
+        Returns:
+            `Self | None`: simplified sub-tree structure none if children-less leave nodes 
+        """
+        
+        # pre-order listing of the tree, walking it in reverse simplifies all subnodes before their parents
+        order: list[Section_Person_Solver] = []
+        stack: list[Section_Person_Solver] = [self]
         
-        self.sub_nodes = [ n.solve( propagate_list[search_index+1::] ) for n in self.sub_nodes ]
+        while stack:
+            node = stack.pop()
+            order.append( node )
+            
+            if node.date_range.days > 0:
+                stack.extend( node.sub_nodes )
         
+        simplified: dict[int, Section_Person_Solver | None] = {}
+        for node in reversed( order ):
+            simplified[ id(node) ] = node._simplify_node( simplified )
         
-        return self
+        return simplified[ id(self) ]
     
-    def simplify(self) -> Self | None:
+    def _simplify_node(self, simplified: dict[int, Section_Person_Solver | None]) -> Self | None:
         """
-        ### simplify and prepare the tree structure to be used for the distribution calculation
+        single step of `simplify`, all subnodes of this node must already be simplified
 
-        transforming following aspects:
-            - identifying and structurally removing children-less and non person managing leaf nodes
-            - propagating subnodes upwards for unnamed nodes (meaning nodes not responsible for any person)
-        
+        Args:
+            simplified (`dict[int, Section_Person_Solver | None]`): simplified subtrees keyed by the `id` of their original node
 
         Returns:
             `Self | None`: simplified sub-tree structure none if children-less leave nodes 
@@ -520,7 +1095,7 @@ class Section_Person_Solver( Section_Node ):
         if self.date_range.days <= 0:
             return None
         
-        self.sub_nodes = list( filter( None, (sub.simplify() for sub in self.sub_nodes) ) )
+        self.sub_nodes = [ s for sub in self.sub_nodes if ( s := simplified[ id(sub) ] ) ]
 
         if not self.manages_person:
             sub_count = len(self.sub_nodes)
@@ -571,7 +1146,7 @@ class Section_Person_Solver( Section_Node ):
                     # subtrees must not overlap more than the local root
                     raise ValueError( f"Intersection of the parents date-range and a subtrees is {intersect}, but must only be either Intersection.EQUAL or Intersection.SUPER_SET" )
     
-    def calculate_contributions(self) -> Contribution:
+    def calculate_contributions(self, consumption: Consumption_Rate = None) -> Contribution:
         """
         ### calculate the correct distribution of a valid sectionized B-tree
         
@@ -594,20 +1169,25 @@ class Section_Person_Solver( Section_Node ):
         2. All States `X` must be normalized! A Node `i` is normalized if `sum[1 <= j <= p]( X[i][j] ) == 1`
         3. A local State `X0[i]` of a Node `i` must be of the form: `X0[i] := { delta[q,0], delta[q,1], ... delta[q,q], ... delta[q,p] }` where `delta[n,m] := {  1   if n==m,  0   if n!=m`
         4. Leaf Nodes are Nodes with weights `w[k] = 0 for all k in [1; b]` and therefore satisfy as a break condition for recursive equations
-        """
         
-        contrib : Contribution = Contribution()
-        coverage: float        = 0.0
-        for sub in self.sub_nodes:
-            scale = sub.date_range.days / self.date_range.days
-            coverage += scale
-            
-            contrib += scale * sub.calculate_contributions()
+        #### Evaluation:
         
-        contrib[self.manages_person] += 1 + ( 1 - coverage )
-        contrib *= 0.5
+        Unrolling the recursion, the local State `X0[i]` of each Node contributes to the State of the root with the product of all
+        `0.5 * w[k]` factors along its path from the root. These path weights are propagated top-down (see `_evaluate_tree`),
+        therefore each Node is only visited once.
         
-        return contrib
+        #### Consumption weighting:
+        
+        By default the weights `w[k]` are the ratios of the days of the children Nodes to the days of their parent Node.
+        If a `consumption` is supplied the weights are the ratios of their consumptions instead,
+        i.e. each person pays for the share of the consumption during their residence.
+        Nodes without any consumption fall back to the ratio of days.
+
+        Args:
+            consumption (`Consumption_Rate`, optional): consumption to weight the Nodes by. Defaults to None, i.e. weighting by days.
+        """
+        
+        return self._evaluate_tree( contributions=True, widths=False, consumption=consumption ).contribution
     
     
     @classmethod
@@ -646,23 +1226,24 @@ class Section_Person_Solver( Section_Node ):
         PARENTHESES_CLOSE: Final[str] = ']'
         PADDING          : Final[str] = '-'
         
-        output: str = ""
+        rows : list[str] = []
         queue: list[Section_Person_Solver] = [section_to_visualize]
         
         # -------------------------------------- #
         # configure width and right shift offset #
         # -------------------------------------- #
         
-        total_range  : Final[Dates_Delta] = section_to_visualize._determine_max_range()
+        evaluation   : Final[_tree_evaluation_t] = section_to_visualize._evaluate_tree( contributions=False, widths=True )
+        total_range  : Final[Dates_Delta]        = evaluation.max_range
         
         # if this limit still is to small for you then you definitely are going to have even bigger problems other than here
         max_string_width = max_string_width / total_range.days if max_string_width else 10e+69
         min_string_width = min_string_width / total_range.days if min_string_width else 0
         
-        width_per_day: Final[float] = min( max( min_string_width, section_to_visualize._determine_min_width_per_range() ), max_string_width )
+        width_per_day: Final[float] = min( max( min_string_width, evaluation.min_width_per_day[ id(section_to_visualize) ] ), max_string_width )
         
         DBG_PRINT( f"{width_per_day = }")
-        DBG_PRINT( f"det width = {section_to_visualize._determine_min_width_per_range()}")
+        DBG_PRINT( f"det width = {evaluation.min_width_per_day[ id(section_to_visualize) ]}")
         DBG_PRINT( f"min width = {min_string_width}")
         DBG_PRINT( f"max width = {max_string_width}")
         
@@ -670,8 +1251,10 @@ class Section_Person_Solver( Section_Node ):
         # visualization step #
         # ------------------ #
         while queue:
-            cursor: date = total_range.date_low
-            for i, section in enumerate(queue):
+            # each row is gathered in a buffer of segments and emitted once
+            row   : list[str] = []
+            cursor: date      = total_range.date_low
+            for section in queue:
                 # Layout:
                 # [-----{p.name?}------]
                 
@@ -685,18 +1268,16 @@ class Section_Person_Solver( Section_Node ):
                 width_raw    = ( section.date_range.date_high - cursor ).days * width_per_day
                 width_avail  = round(width_raw) - 2 # -2 parentheses at minimum
                 
-                output += ' '*offset_space + PARENTHESES_OPEN + name.center( width_avail, PADDING )[:width_avail] + PARENTHESES_CLOSE
+                row.append( ' '*offset_space )
+                row.append( PARENTHESES_OPEN )
+                row.append( name.center( width_avail, PADDING )[:width_avail] )
+                row.append( PARENTHESES_CLOSE )
                 
                 cursor += timedelta( days=round(width_raw)/width_per_day )
             
-            output += '\n'
+            rows.append( ''.join( row ) )
             
-            queue = sorted(
-                (sub
-                for node in queue
-                for sub in node.sub_nodes),
-                key=lambda s: s.date_range.date_low,
-            )
+            queue = cls._next_level( queue )
         
         # ------------------ #
         # handling time line #
@@ -719,12 +1300,13 @@ class Section_Person_Solver( Section_Node ):
             days_per_mark  : Final[int] = ceil( SIZE_DAY_TOTAL   / width_per_day   )
             
             
-            _, string_width = max_width_of_strings( output.splitlines() )
+            string_width: int = max( map( len, rows ), default=0 )
             
             months_in_string: Final[int] = floor( string_width / width_per_month )
             
-            v_line    = " " * string_width
-            date_line = " " * string_width
+            # preallocated character buffers, each mark is written in place
+            v_line   : list[str] = [" "] * string_width
+            date_line: list[str] = [" "] * string_width
             
             size_total   : int
             format_string: str
@@ -748,7 +1330,7 @@ class Section_Person_Solver( Section_Node ):
             # ------------------ #
             # strategy execution #
             # ------------------ #
-            date_line += " " * size_total
+            date_line += [" "] * size_total
             for i in range( ceil( string_width / size_total ) ):
                 mark: date = mark_callback( i )
                 
@@ -762,17 +1344,48 @@ class Section_Person_Solver( Section_Node ):
                 if write_index >= string_width-1:
                     break
                 
-                v_line    = replace_substring( v_line, write_index, '|' )
-                date_line = replace_substring( date_line, write_index, mark.strftime( format_string ) )
+                mark_str = mark.strftime( format_string )
+                
+                v_line[write_index] = '|'
+                date_line[write_index:write_index+len(mark_str)] = mark_str
+            
+            
+            rows.append( ''.join( v_line ) )
+            rows.append( ''.join( date_line ) )
             
+        
+        return ''.join( row + '\n' for row in rows )
+    
+    @staticmethod
+    def _next_level(queue: list[Section_Person_Solver]) -> list[Section_Person_Solver]:
+        """
+        subnodes of all nodes of a level ordered by their start date
+
+        sections of a level usually are disjoint and ordered, thus the concatenation of the (ordered) subnodes is already ordered
+        and only has to be verified in linear time. Otherwise falls back to sorting the complete level.
+
+        Args:
+            queue (`list[Section_Person_Solver]`): nodes of a level ordered by their start date
+
+        Returns:
+            `list[Section_Person_Solver]`: nodes of the next level ordered by their start date
+        """
+        level: list[Section_Person_Solver] = []
+        for node in queue:
+            subs = node.sub_nodes
             
-            output += v_line + "\n" + date_line + "\n"
+            if any( subs[i].date_range.date_low > subs[i+1].date_range.date_low for i in range( len(subs) - 1 ) ):
+                subs = sorted( subs, key=lambda s: s.date_range.date_low )
             
+            level.extend( subs )
         
-        return output
+        if any( level[i].date_range.date_low > level[i+1].date_range.date_low for i in range( len(level) - 1 ) ):
+            level.sort( key=lambda s: s.date_range.date_low )
+        
+        return level
 
     
-    def print_as_tree(self, *, _depth:int=0) -> None:
+    def print_as_tree(self) -> None:
         """
         prints out the structure/hierarchy of a tree/node
 
@@ -784,13 +1397,80 @@ class Section_Person_Solver( Section_Node ):
         >>> | "sub-tree-B"
         >>> | ...
         """
-        print( '|  '*_depth, self.date_range, '\t', f"{self._determine_min_width_per_range():8.5f}", '\t', self.manages_person.name if self.manages_person else "---", sep='', flush=True )
-        for sub in self.sub_nodes:
-            sub.print_as_tree( _depth=_depth+1 )
+        min_widths: dict[int, float] = self._evaluate_tree( contributions=False, widths=True ).min_width_per_day
+        
+        stack: list[tuple[Section_Person_Solver, int]] = [ (self, 0) ]
+        while stack:
+            node, depth = stack.pop()
+            
+            print( '|  '*depth, node.date_range, '\t', f"{min_widths[ id(node) ]:8.5f}", '\t', node.manages_person.name if node.manages_person else "---", sep='', flush=True )
+            
+            # reversed to pop the subnodes in their original order
+            stack.extend( (sub, depth+1) for sub in reversed( node.sub_nodes ) )
     
     #------------------------#
     #  local/private helper  #
     #------------------------#
+    def _evaluate_tree(self, *, contributions:bool=True, widths:bool=True, consumption:Consumption_Rate=None) -> _tree_evaluation_t:
+        """
+        evaluates the contributions, the minimum widths per day and the total range of this tree in a single traversal
+
+        the tree is traversed with an explicit stack (no recursion), each node is visited twice:
+            - pre-visit:  propagates the weights of the contributions top-down and accumulates the covered date-range
+            - post-visit: determines the minimum width per day from the (already visited) subnodes bottom-up
+
+        Args:
+            contributions (`bool`, optional): iff True calculates the contributions, the tree must be valid (see `assert_valid_solver_tree_structure`). Defaults to True.
+            widths (`bool`, optional): iff True determines the minimum width per day of each node. Defaults to True.
+            consumption (`Consumption_Rate`, optional): iff not None weights the contributions by consumption instead of days. Defaults to None.
+
+        Returns:
+            `_tree_evaluation_t`: contributions (empty if not calculated), minimum widths per day keyed by the `id` of each node (empty if not determined) and total range of this tree
+        """
+        
+        contrib   : dict[db.Person, float] = {}
+        min_widths: dict[int, float]       = {}
+        
+        d_min: date = self.date_range.date_low
+        d_max: date = self.date_range.date_high
+        
+        # entries: (node, weight of the nodes local state, is post-visit)
+        stack: list[tuple[Section_Person_Solver, float, bool]] = [ (self, 1.0, False) ]
+        
+        while stack:
+            node, weight, is_post_visit = stack.pop()
+            
+            if is_post_visit:
+                min_widths[ id(node) ] = node._min_width_per_range( min_widths )
+                continue
+            
+            d_min = min( d_min, node.date_range.date_low )
+            d_max = max( d_max, node.date_range.date_high )
+            
+            if widths:
+                stack.append( (node, weight, True) )
+            
+            if not contributions:
+                stack.extend( (sub, 0.0, False) for sub in node.sub_nodes )
+                continue
+            
+            # X[i] := 0.5 * ( X0[i] * (2 - coverage) + sum[k]( w[k] * X[b*i + k] ) )
+            node_consumption: float = consumption.consumption( node.date_range ) if consumption and node.sub_nodes else 0.0
+            
+            coverage: float = 0.0
+            for sub in node.sub_nodes:
+                if node_consumption > 0:
+                    scale = consumption.consumption( sub.date_range ) / node_consumption
+                else:
+                    scale = sub.date_range.days / node.date_range.days
+                coverage += scale
+                
+                stack.append( (sub, 0.5 * weight * scale, False) )
+            
+            contrib[node.manages_person] = contrib.get( node.manages_person, 0.0 ) + 0.5 * weight * ( 2 - coverage )
+        
+        return _tree_evaluation_t( Contribution( *contrib.items() ), min_widths, Dates_Delta( d_min, d_max ) )
+    
     def _determine_min_width_per_range(self) -> float:
         """
         determines the minimum width per day required to "accurately" visualize this tree
@@ -801,15 +1481,22 @@ class Section_Person_Solver( Section_Node ):
             `float`: minimum width in characters per day required to visualize this tree
         """
         
+        return self._evaluate_tree( contributions=False, widths=True ).min_width_per_day[ id(self) ]
+    
+    def _min_width_per_range(self, min_widths: dict[int, float]) -> float:
+        """
+        single step of `_determine_min_width_per_range`, the minimum widths of all subnodes must already be determined
+
+        Args:
+            min_widths (`dict[int, float]`): minimum widths per day of the subnodes keyed by the `id` of each node
+
+        Returns:
+            `float`: minimum width in characters per day required to visualize this tree
+        """
+        
         # minimum layout:
         # [{name}] ==> width_avail >= 2 + len(name)
         
-        
-        # filter can be tuned via the `FILTER_MAGNITUDE_THRESHOLD` value.
-        # This filters out each width-value 'w' whose ratio between the base variance and the variance w/o 'w' exceeds this threshold.
-        FILTER_MAGNITUDE_THRESHOLD: Final[float] = 100.0
-        
-        
         if self.date_range.days <= 0:
             return 0
         
@@ -817,14 +1504,43 @@ class Section_Person_Solver( Section_Node ):
         
         req_width: float = (2.0 + len_name) / self.date_range.days
         
-        sub_widths = sorted( [req_width] + [ s._determine_min_width_per_range() for s in self.sub_nodes ] )
+        sub_widths = sorted( [req_width] + [ min_widths[ id(s) ] for s in self.sub_nodes ] )
         
         if len(sub_widths) == 1:
             DBG_PRINT( "-", self.date_range, req_width, sub_widths, sep='\t', flush=True )
             return req_width
         
+        return max( self._filter_min_widths( sub_widths ) or [req_width] )
+    
+    @staticmethod
+    def _filter_min_widths(sub_widths: list[float]) -> list[float]:
+        """
+        statistically filters out excessive width values
+
+        Args:
+            sub_widths (`list[float]`): sorted width values
+
+        Returns:
+            `list[float]`: remaining width values
+        """
+        
+        # filter can be tuned via the `FILTER_MAGNITUDE_THRESHOLD` value.
+        # This filters out each width-value 'w' whose ratio between the base variance and the variance w/o 'w' exceeds this threshold.
+        FILTER_MAGNITUDE_THRESHOLD: Final[float] = 100.0
+        
         DBG_PRINT( f"\nstarted filter => {sub_widths = }" )
         
+        # ( count, mean, sum of squared deviations from the mean )
+        running_stats_t: TypeAlias = tuple[int, float, float]
+        
+        def push( stats:running_stats_t, x:float ) -> running_stats_t:
+            # Welford's update, which does not suffer from cancellation
+            count, mean, m2 = stats
+            count += 1
+            delta  = x - mean
+            mean  += delta / count
+            return count, mean, m2 + delta * ( x - mean )
+        
         
         #------------------------------------------------#
         #  statistically filtering out excessive values  #
@@ -837,9 +1553,32 @@ class Section_Person_Solver( Section_Node ):
             DBG_PRINT( f"\n=> {sub_widths = }" )
             DBG_PRINT( f"=> {base_mean = }\t{base_median = }\t{base_var = }" )
             
+            # running statistics of the values before resp. after each index, combined per value,
+            # give the leave-one-out mean and variance of each value in O(1) instead of rescanning the list
+            n: int = len(sub_widths)
+            
+            prefix: list[running_stats_t] = list( accumulate( sub_widths, push, initial=( 0, 0.0, 0.0 ) ) )
+            suffix: list[running_stats_t] = list( accumulate( reversed( sub_widths ), push, initial=( 0, 0.0, 0.0 ) ) )[::-1]
+            
             exclusion_indices: list[int] = []
-            for i in range(len(sub_widths)):
-                new_mean, new_median, new_var = simple_statistics( sub_widths[:i] + sub_widths[i+1:] )
+            for i in range(n):
+                if n <= 1:
+                    # leaving out the only value => variance of the empty list is 0
+                    continue
+                
+                count_a, mean_a, m2_a = prefix[i]
+                count_b, mean_b, m2_b = suffix[i+1]
+                
+                delta    = mean_b - mean_a
+                new_mean = mean_a + delta * count_b / ( n - 1 )
+                new_var  = ( m2_a + m2_b + delta**2 * count_a * count_b / ( n - 1 ) ) / ( n - 1 )
+                
+                # the values are sorted, leaving out the i-th value shifts the following values one index down
+                m = n - 1
+                k = m // 2
+                new_median = sub_widths[ k if k < i else k+1 ]
+                if m % 2 == 0:
+                    new_median = 0.5*( sub_widths[ k-1 if k-1 < i else k ] + new_median )
 
                 mag = 0
                 if new_var != 0 and (mag:=base_var / new_var) > FILTER_MAGNITUDE_THRESHOLD:
@@ -857,10 +1596,11 @@ class Section_Person_Solver( Section_Node ):
                     sep='\n'
                 )
             
-            sub_widths = [ x for i, x in enumerate(sub_widths) if i not in exclusion_indices ]
+            excluded = set( exclusion_indices )
+            sub_widths = [ x for i, x in enumerate(sub_widths) if i not in excluded ]
         DBG_PRINT( f"finished filter => {sub_widths = }\n" )
         
-        return max( sub_widths or [req_width] )
+        return sub_widths
     
     def _determine_max_range(self) -> Dates_Delta:
         """
@@ -869,13 +1609,9 @@ class Section_Person_Solver( Section_Node ):
         Returns:
             `Dates_Delta`: total range this tree and its subtrees covers
         """
-        ranges: list[Dates_Delta] = [self.date_range] + [ s._determine_max_range() for s in self.sub_nodes ]
-        
-        d_min = min( map( lambda r: r.date_low, ranges ) )
-        d_max = max( map( lambda r: r.date_high, ranges ) )
         
-        return Dates_Delta( d_min, d_max )
-    
+        return self._evaluate_tree( contributions=False, widths=False ).max_range
+
 
 db_callback_t: TypeAlias = Callable[[date, date], tuple[list[db.Reading], list[db.Person]]]
 invoice_t = NamedTuple("invoice_t", [("person", db.Person), ("payment", float)] )
@@ -892,6 +1628,9 @@ class Invoice:
     
     __solver_tree: Section_Person_Solver
     
+    __data: dict[db_callback_t, tuple[list[db.Reading], list[db.Person]]]
+    __consumptions: dict[tuple[db_callback_t, int], Consumption_Rate]
+    
     def __init__(self, date_start: date, date_end: date, payment: float ):
         assert date_start < date_end, "the supplied date end must be larger(later) then the supplied start date"
         
@@ -900,12 +1639,16 @@ class Invoice:
         self.__costs      = payment
         
         self.__solver_tree = None
+        
+        self.__data         = {}
+        self.__consumptions = {}
     
     def get_invoice(
         self,
         exclude_names:list[str]     = None,
         db_callback  :db_callback_t = db.get_data_between,
-        normalize_distribution:bool = True
+        normalize_distribution:bool = True,
+        weight_by_meter:int         = None
         ) -> list[invoice_t]:
         """
         ### Generate the invoice
@@ -983,17 +1726,33 @@ class Invoice:
         with their associate payments being correctly distributed amongst the overlying persons.
         See the examples above for more information
         
+        ---
+        #### Weighting by consumption
+        
+        By default the costs are distributed by the days of occupancy. For metered sub-units the costs can instead be
+        distributed by the actual consumption of a meter (see `weight_by_meter`) during each occupancy,
+        derived from the readings in the `Invoice-Range`. If the readings do not suffice to determine any consumption,
+        the costs are distributed by the days of occupancy.
+        
+        The data of each `db_callback` is only fetched once per invoice, thus invoices of several meters
+        or several sets of excluded persons can be generated without repeated database queries.
 
         Args:
             exclude_names (`list[str]`, optional): names of persons to exclude from the distribution. Defaults to None.
             db_callback (`db_callback_t`, optional): database callback to get persons in between a date-range. Defaults to db.get_data_between.
             normalize_distribution (`bool`, optional): if set to True will assure that the calculated distribution adds up to 100% and will adjust each distribution to satisfy this criteria, otherwise will simply return the calculated distribution
+            weight_by_meter (`int`, optional): index of the reading-attribute (meter) to weight the distribution by. Defaults to None, i.e. weighting by days.
 
         Returns:
             `list[invoice_t]`: invoice tuples of the calculated distribution costs sorted by person::name
         """
         
-        _, persons = db_callback( self.__date_start, self.__date_end )
+        _, persons = self.__get_data( db_callback )
+        
+        consumption: Consumption_Rate = None
+        if weight_by_meter is not None:
+            consumption = self.__get_consumption( db_callback, weight_by_meter )
+            consumption = consumption if consumption.is_valid() else None
         
         accountable_persons: list[db.Person] = [
             db.Person( p.name, p.move_in, p.move_out if p.move_out else date.today() )
@@ -1011,7 +1770,7 @@ class Invoice:
 
         self.__solver_tree.assert_valid_solver_tree_structure()
         
-        contributions = self.__solver_tree.calculate_contributions()
+        contributions = self.__solver_tree.calculate_contributions( consumption )
         
         # => normalize the contribution vector to compensate for open payments and floating point rounding errors
         if normalize_distribution:
@@ -1022,6 +1781,30 @@ class Invoice:
         return sorted( (invoice_t(p, c) for p, c in contributions), key=lambda inv: inv.person.name )
     
     
+    def get_tariff_costs(
+        self,
+        meter      :int,
+        tariffs    :list[db.Tariff] = None,
+        db_callback:db_callback_t   = db.get_data_between
+        ) -> tariff_costs_t:
+        """
+        ### Evaluate the costs of a meter in the `Invoice-Range` by its tariffs
+        
+        the evaluated total costs can be used as the payment of a (consumption weighted) invoice of that meter.
+        Same as `get_invoice` the data of each `db_callback` is only fetched once per invoice.
+
+        Args:
+            meter (`int`): index of the reading-attribute (meter)
+            tariffs (`list[db.Tariff]`, optional): tariffs to apply. Defaults to None, i.e. the tariffs of the meter stored in the database.
+            db_callback (`db_callback_t`, optional): database callback to get readings in between a date-range. Defaults to db.get_data_between.
+
+        Returns:
+            `tariff_costs_t`: consumed units, base costs, consumption costs and total costs
+        """
+        schedule = Tariff_Schedule( tariffs if tariffs is not None else db.get_tariffs( meter ), meter )
+        
+        return schedule.costs( Dates_Delta( self.__date_start, self.__date_end ), self.__get_consumption( db_callback, meter ) )
+    
     def get_visualization(self, min_string_width:int=0, max_string_width:int=None) -> str:
         """
         ### visualize a Section tree as a bar like graph
@@ -1057,9 +1840,144 @@ class Invoice:
     
     def _get_solver_tree(self) -> Section_Person_Solver:
         return self.__solver_tree
+    
+    def __get_data(self, db_callback: db_callback_t) -> tuple[list[db.Reading], list[db.Person]]:
+        # fetch the data of each callback only once per invoice
+        if not db_callback in self.__data:
+            self.__data[db_callback] = db_callback( self.__date_start, self.__date_end )
+        
+        return self.__data[db_callback]
+    
+    def __get_consumption(self, db_callback: db_callback_t, meter: int) -> Consumption_Rate:
+        assert 0 <= meter < COUNT_READING_ATTRIBUTES, f"meter index must be in [0; {COUNT_READING_ATTRIBUTES}) but is {meter}"
+        
+        if not (db_callback, meter) in self.__consumptions:
+            self.__consumptions[(db_callback, meter)] = Consumption_Rate( self.__get_data( db_callback )[0], meter )
+        
+        return self.__consumptions[(db_callback, meter)]
+
+
+forecast_t = NamedTuple("forecast_t", [("units", float), ("costs", tariff_costs_t), ("payments", list[invoice_t])] )
+class Forecast:
+    """
+    Forecast of the upcoming invoices based on the complete history of readings
+
+    Each meter is modeled by a `Consumption_Forecast`, the readings of the invoice range are extended
+    by projected readings up to the end of the invoice range, which then are evaluated by the tariffs
+    and distributed to the occupants (weighted by consumption) same as an actual `Invoice`.
+    """
+    
+    PROJECTION_STEP_DAYS: Final[int] = 7
+    
+    __readings: list[db.Reading]
+    __models  : list[Consumption_Forecast]
+    
+    def __init__(self, readings: list[db.Reading]) -> None:
+        """
+        Args:
+            readings (`list[ db.Reading ]`): raw data directly from database, usually the complete history
+        """
+        self.__readings = sorted( readings, key=lambda r: r.date )
+        self.__models   = [ Consumption_Forecast( self.__readings, k ) for k in range( COUNT_READING_ATTRIBUTES ) ]
+    
+    def add_reading(self, reading: db.Reading) -> Self:
+        """
+        update all models by a new reading in `O(1)`
+
+        Args:
+            reading (`db.Reading`): reading later than all previously added readings
+
+        Returns:
+            `Self`: monad architecture
+        """
+        assert not self.__readings or reading.date > self.__readings[-1].date, "readings must be added in chronological order"
+        
+        self.__readings.append( reading )
+        for model in self.__models:
+            model.add_reading( reading )
+        
+        return self
+    
+    def model(self, meter: int) -> Consumption_Forecast:
+        return self.__models[meter]
+    
+    def projected_readings(self, meter: int, date_start: date, date_end: date) -> list[db.Reading]:
+        """
+        readings of a meter in a date-range extended by projected readings up to the end of the date-range
+
+        Args:
+            meter (`int`): index of the reading-attribute, i.e. meter
+            date_start (`date`): start of the date-range
+            date_end (`date`): end of the date-range
+
+        Returns:
+            `list[db.Reading]`: actual and projected readings, only the attribute of the meter is set
+        """
+        model = self.__models[meter]
+        
+        def reading_of( day: date, value: float ) -> db.Reading:
+            attributes = [ None ] * COUNT_READING_ATTRIBUTES
+            attributes[meter] = value
+            return db.Reading( day, attributes )
+        
+        # include the readings next to the date-range for the interpolation at its bounds
+        dates   = [ r.date for r in self.__readings ]
+        i_low   = max( 0, bisect_left( dates, date_start ) - 1 )
+        i_high  = bisect_right( dates, date_end ) + 1
+        
+        readings = [ reading_of( r.date, r.attributes[meter] ) for r in self.__readings[i_low:i_high] if r.attributes[meter] is not None ]
+        
+        if not model.is_valid():
+            return readings
+        
+        last_day, _ = model.last_reading()
+        
+        day = max( last_day, date_start - timedelta( 1 ) )
+        while day < date_end:
+            day = min( day + timedelta( self.PROJECTION_STEP_DAYS ), date_end )
+            readings.append( reading_of( day, model.project( day ) ) )
+        
+        return readings
+    
+    def project_invoice(
+        self,
+        date_start   :date,
+        date_end     :date,
+        meter        :int,
+        tariffs      :list[db.Tariff] = None,
+        exclude_names:list[str]       = None,
+        db_callback  :db_callback_t   = db.get_data_between
+        ) -> forecast_t:
+        """
+        ### project the invoice of a meter
+        
+        projects the consumption and the costs of a meter to the end of the invoice range and distributes the costs to the occupants
+
+        Args:
+            date_start (`date`): start of the invoice range
+            date_end (`date`): end of the invoice range
+            meter (`int`): index of the reading-attribute (meter)
+            tariffs (`list[db.Tariff]`, optional): tariffs to apply. Defaults to None, i.e. the tariffs of the meter stored in the database.
+            exclude_names (`list[str]`, optional): names of persons to exclude from the distribution. Defaults to None.
+            db_callback (`db_callback_t`, optional): database callback to get persons in between a date-range. Defaults to db.get_data_between.
+
+        Returns:
+            `forecast_t`: projected consumed units, costs and payments per occupant
+        """
+        _, persons = db_callback( date_start, date_end )
+        readings   = self.projected_readings( meter, date_start, date_end )
+        
+        projected_callback: db_callback_t = lambda dlow, dhigh: ( readings, persons )
+        
+        costs    = Invoice( date_start, date_end, 0.0 ).get_tariff_costs( meter, tariffs, projected_callback )
+        payments = Invoice( date_start, date_end, costs.total ).get_invoice( exclude_names, projected_callback, weight_by_meter=meter )
+        
+        return forecast_t( costs.units, costs, payments )
 
 
 if __name__ == "__main__":
+    from time import perf_counter
+    
     s0  = Section_Person_Solver( Dates_Delta(date(2024, 2, 1), date(2024, 12, 31)) )
     s01 = Section_Person_Solver( Dates_Delta(date(2024, 1, 1), date(2024, 5,   1))  , db.Person( "Marie" ) )
     s11 = Section_Person_Solver( Dates_Delta(date(2024, 1, 1), date(2024, 2,   1))  , db.Person( "Herbert" ) )
@@ -1165,4 +2083,236 @@ if __name__ == "__main__":
         (round( payB_Person_A, 3 ) ==  64.114, f"payment for Person A must be  64.114 % but actually is {round(payA_Person_A, 3):7.3f} %"), 
         (round( payB_Person_C, 3 ) ==  35.886, f"payment for Person C must be  35.886 % but actually is {round(payA_Person_C, 3):7.3f} %"), 
         (round( payB_sum     , 3 ) == 100.000, f"sum of all payments  must be 100.000 % but actually is {payA_sum:7.3f} %"), 
-    )
\ No newline at end of file
+    )    
+    
+    # ---------------------------------------------------------------------------------------------
+    # consumption weighted invoices
+    
+    # a constant consumption per day must result in the same distribution as weighting by days
+    readings_constant = [ db.Reading( INV_START + timedelta(30*i), [ 2.5*30*i, None, None ] ) for i in range(12) ]
+    
+    db_callback_C: db_callback_t = lambda dlow, dhigh: [ readings_constant, db_callback( dlow, dhigh )[1] ]
+    
+    inv_C  = Invoice( INV_START, INV_END, 100.0 )
+    pays_C = inv_C.get_invoice( None, db_callback_C, weight_by_meter=0 )
+    
+    # Person A is present the complete year, Person B only in the first half of the year but consumes 3/4 of the years consumption
+    # => Person B = 0.5 * 3/4 = 37.5 %
+    readings_uneven = [
+        db.Reading( date(2023, 1,  1), [ 1000.0, 0.0, None ] ),
+        db.Reading( date(2023, 6, 30), [ 1300.0, 0.0, None ] ),
+        db.Reading( date(2023,12, 31), [ 1400.0, 0.0, None ] ),
+    ]
+    persons_uneven = [ db.Person("Person A", date(2023, 1, 1), None), db.Person("Person B", date(2023, 1, 1), date(2023, 6, 30)) ]
+    
+    db_callback_U: db_callback_t = lambda dlow, dhigh: [ readings_uneven, persons_uneven ]
+    
+    inv_U = Invoice( date(2023, 1, 1), date(2023, 12, 31), 100.0 )
+    pays_U_days  = inv_U.get_invoice( None, db_callback_U )
+    pays_U_meter = inv_U.get_invoice( None, db_callback_U, weight_by_meter=0 )
+    pays_U_none  = inv_U.get_invoice( None, db_callback_U, weight_by_meter=1 ) # no consumption => weighting by days
+    
+    print( "\n", flush=True )
+    print( f"=== Payments Consumption ===" )
+    print( *[ f"{p.person.name}: {p.payment:>7.3f} %" for p in pays_C ], sep="\n" )
+    print( *[ f"{p.person.name}: {p.payment:>7.3f} %" for p in pays_U_meter ], sep="\n" )
+    
+    printout_validation( 
+        *[ (round( c.payment, 3 ) == round( a.payment, 3 ), f"payment for {a.person.name} must be {a.payment:7.3f} % but actually is {c.payment:7.3f} %") for a, c in zip( pays_A, pays_C ) ],
+        (round( pays_U_meter[0].payment, 3 ) == 62.500, f"payment for Person A must be  62.500 % but actually is {pays_U_meter[0].payment:7.3f} %"), 
+        (round( pays_U_meter[1].payment, 3 ) == 37.500, f"payment for Person B must be  37.500 % but actually is {pays_U_meter[1].payment:7.3f} %"), 
+        (pays_U_none == pays_U_days, "distribution without consumption must equal the distribution by days"), 
+    )
+    
+    
+    # ---------------------------------------------------------------------------------------------
+    # tariffs
+    
+    tariffs_uneven = [
+        # base fee of 1.0 per day, price drops above 350 units
+        db.Tariff( 0, date(2023, 1, 1), Dates_Delta.DAYS_IN_YEAR, 0.30, ((350.0, 0.20),) ),
+        db.Tariff( 0, date(2023, 7, 1),                      0.0, 0.40, ((350.0, 0.25),) ),
+        db.Tariff( 1, date(2023, 1, 1),                   1000.0, 9.99 ),
+    ]
+    
+    costs_U = inv_U.get_tariff_costs( 0, tariffs_uneven, db_callback_U )
+    
+    # 2023-01-01 ... 2023-06-30: 180 days, 300 units with 0.30
+    # 2023-06-30 ... 2023-07-01:   1 day,  r   units with 0.30
+    # 2023-07-01 ... 2023-12-31: 183 days, 100 - r units, 50 - r units with 0.40 and 50 units with 0.25
+    rate_2nd_half = 100.0 / 184
+    expected_consumption_costs = 300*0.30 + rate_2nd_half*0.30 + (50 - rate_2nd_half)*0.40 + 50*0.25
+    
+    print( "\n", flush=True )
+    print( f"=== Tariff costs ===" )
+    print( f"units:       {costs_U.units:>9.3f}" )
+    print( f"base:        {costs_U.base_costs:>9.3f} {LOCAL_CURRENCY}" )
+    print( f"consumption: {costs_U.consumption_costs:>9.3f} {LOCAL_CURRENCY}" )
+    print( f"total:       {costs_U.total:>9.3f} {LOCAL_CURRENCY}" )
+    
+    printout_validation( 
+        (round( costs_U.units, 3 ) == 400.000, f"consumed units must be 400.000 but actually are {costs_U.units:9.3f}"), 
+        (round( costs_U.base_costs, 3 ) == 181.000, f"base costs must be 181.000 but actually are {costs_U.base_costs:9.3f}"), 
+        (round( costs_U.consumption_costs, 6 ) == round( expected_consumption_costs, 6 ), f"consumption costs must be {expected_consumption_costs:9.3f} but actually are {costs_U.consumption_costs:9.3f}"), 
+    )
+    
+    # zero values are missing values, same as in `Reading_Deltas`
+    readings_Z = [
+        db.Reading( date(2024, 1, 1), [ 100.0, None, None ] ),
+        db.Reading( date(2024, 2, 1), [   0.0, None, None ] ),
+        db.Reading( date(2024, 3, 1), [ 110.0, None, None ] ),
+    ]
+    consumption_Z = Consumption_Rate( readings_Z, 0 ).consumption( Dates_Delta( date(2024, 1, 1), date(2024, 3, 1) ) )
+    
+    printout_validation( 
+        (round( consumption_Z, 6 ) == 10.0, f"zero values must be bridged, consumption must be 10.000 but actually is {consumption_Z:9.3f}"), 
+    )
+    
+    
+    # ---------------------------------------------------------------------------------------------
+    # forecasts
+    
+    # weekly readings of a seasonal consumption per day: r(t) = 10 + 5 * cos(w*t) + 2 * sin(w*t)
+    OMEGA = Consumption_Forecast.OMEGA
+    seasonal_cumulative = lambda d: 10*d.toordinal() + 5*sin( OMEGA*d.toordinal() )/OMEGA - 2*cos( OMEGA*d.toordinal() )/OMEGA
+    
+    FORECAST_START: Final[date] = date( 2020, 1, 3 )
+    readings_seasonal = [
+        db.Reading( d, [ seasonal_cumulative( d ) - seasonal_cumulative( FORECAST_START ), None, None ] )
+        for d in ( FORECAST_START + timedelta( 7*i ) for i in range( 160 ) )
+    ]
+    
+    forecast_full = Forecast( readings_seasonal )
+    forecast_incr = Forecast( readings_seasonal[:100] )
+    for r in readings_seasonal[100:]:
+        forecast_incr.add_reading( r )
+    
+    coefficients = forecast_incr.model( 0 ).coefficients()
+    rate_Z = Consumption_Forecast( readings_Z, 0 ).rate( date(2024, 3, 1) ) # zero values are missing values
+    
+    FORECAST_END: Final[date] = readings_seasonal[-1].date + timedelta( 200 )
+    projection_error = forecast_incr.model( 0 ).project( FORECAST_END ) - ( seasonal_cumulative( FORECAST_END ) - seasonal_cumulative( FORECAST_START ) )
+    
+    forecast_invoice = forecast_incr.project_invoice(
+        date( 2023, 1, 1 ), date( 2023, 12, 31 ), 0,
+        [ db.Tariff( 0, date( 2000, 1, 1 ), 100.0, 0.5 ) ],
+        None,
+        lambda dlow, dhigh: [ [], [ db.Person( "Person A", date(2022, 1, 1), None ), db.Person( "Person B", date(2023, 1, 1), date(2023, 6, 30) ) ] ]
+    )
+    
+    print( "\n", flush=True )
+    print( f"=== Forecast ===" )
+    print( f"coefficients: {coefficients[0]:.3f} {coefficients[1]:.3f} {coefficients[2]:.3f}" )
+    print( f"units:        {forecast_invoice.units:>9.3f}" )
+    print( f"total:        {forecast_invoice.costs.total:>9.3f} {LOCAL_CURRENCY}" )
+    print( *[ f"{p.person.name}:     {p.payment:>9.3f} {LOCAL_CURRENCY}" for p in forecast_invoice.payments ], sep="\n" )
+    
+    printout_validation( 
+        (tuple( round( k, 6 ) for k in coefficients ) == (10.0, 5.0, 2.0), f"coefficients must be (10, 5, 2) but actually are {coefficients}"), 
+        (forecast_full.model( 0 ).coefficients() == coefficients, "incrementally fitted coefficients must equal the coefficients fitted at once"), 
+        (abs( projection_error ) < 1e-6, f"projection must be exact for a seasonal consumption but deviates by {projection_error}"), 
+        (not forecast_incr.model( 1 ).is_valid(), "forecast of a meter without readings must be undetermined"), 
+        (round( rate_Z, 6 ) == round( 10.0 / 60, 6 ), f"zero values must be bridged, rate must be {10.0 / 60:.3f} per day but actually is {rate_Z:.3f}"), 
+        (round( sum( p.payment for p in forecast_invoice.payments ), 6 ) == round( forecast_invoice.costs.total, 6 ), "projected payments must add up to the projected costs"), 
+    )
+    
+    
+    # ---------------------------------------------------------------------------------------------
+    # benchmark: minimum width of nodes with hundreds of children
+    
+    print( "\n", flush=True )
+    print( f"=== Benchmark minimum width ===" )
+    
+    widths_valid: list[tuple[bool, str]] = []
+    for children in ( 100, 200, 400, 800 ):
+        bench_start = date( 2000, 1, 1 )
+        bench_root  = Section_Person_Solver( Dates_Delta( bench_start, bench_start + timedelta( 30*children ) ), db.Person( "Main tenant" ) )
+        
+        bench_root.sub_nodes = [
+            Section_Person_Solver( Dates_Delta( bench_start + timedelta( 30*i ), bench_start + timedelta( 30*i + 29 ) ), db.Person( f"Tenant {i:04d}" ) )
+            for i in range( children )
+        ] + [
+            # excessive width: long name for a single day
+            Section_Person_Solver( Dates_Delta( bench_start, bench_start + timedelta( 1 ) ), db.Person( "Tenant with an excessively long name" ) )
+        ]
+        
+        time_width = perf_counter()
+        bench_width = bench_root._determine_min_width_per_range()
+        time_width = perf_counter() - time_width
+        
+        print( f"{children:>4d} children: {bench_width:8.5f} in {time_width*1000:8.3f} ms" )
+        
+        widths_valid.append( (bench_width == (2 + len("Tenant 0000")) / 29, f"minimum width of {children} children must be {(2 + len('Tenant 0000')) / 29:8.5f} but actually is {bench_width:8.5f}") )
+    
+    printout_validation( *widths_valid )
+    
+    
+    # ---------------------------------------------------------------------------------------------
+    # stress test: deep trees of many sequential tenants must not exceed the recursion limit
+    
+    STRESS_TENANTS: Final[int]  = 5000
+    STRESS_START  : Final[date] = date( 2000, 1, 1 )
+    STRESS_END    : Final[date] = STRESS_START + timedelta( 30*STRESS_TENANTS - 1 )
+    
+    stress_persons = [ db.Person( "Main tenant", STRESS_START, STRESS_END ) ] + [
+        db.Person( f"Tenant {i:04d}", STRESS_START + timedelta( 30*i ), STRESS_START + timedelta( 30*i + 29 ) )
+        for i in range( STRESS_TENANTS )
+    ]
+    
+    inv_S  = Invoice( STRESS_START, STRESS_END, 100.0 )
+    pays_S = inv_S.get_invoice( None, lambda dlow, dhigh: [[], stress_persons] )
+    
+    payS_sum = sum( p.payment for p in pays_S )
+    
+    print( "\n", flush=True )
+    print( f"=== Payments Stress ({STRESS_TENANTS} sequential tenants) ===" )
+    print( f"sum:      {payS_sum:7.3f} %" )
+    
+    printout_validation( 
+        (len( pays_S ) == STRESS_TENANTS + 1, f"count of payments must be {STRESS_TENANTS + 1} but actually is {len( pays_S )}"), 
+        (round( payS_sum, 3 ) == 100.000,     f"sum of all payments  must be 100.000 % but actually is {payS_sum:7.3f} %"), 
+    )
+    
+    # rendering thousands of sections for very wide outputs must scale linearly
+    STRESS_WIDTH: Final[int] = 200_000
+    
+    time_viz  = perf_counter()
+    viz_S     = inv_S.get_visualization( STRESS_WIDTH, STRESS_WIDTH )
+    time_viz  = perf_counter() - time_viz
+    
+    viz_S_width = max( map( len, viz_S.splitlines() ) )
+    
+    print( f"visualization: {viz_S_width} characters wide in {time_viz:.3f} s" )
+    
+    printout_validation( 
+        (viz_S_width >= STRESS_WIDTH, f"visualization must cover at least {STRESS_WIDTH} characters but actually is {viz_S_width} characters wide"), 
+        (viz_S.count( '[' ) == viz_S.count( ']' ) > STRESS_TENANTS, "visualization must contain all sections"), 
+    )
+    
+    
+    # shared delta stage: bridging of missing values, meter resets and frame boundaries
+    readings_D = [
+        db.Reading( date( 2023, 1, 30 ), [ 100.0, None, 10.0 ] ),
+        db.Reading( date( 2023, 2,  1 ), [ 200.0, 50.0, None ] ),
+        db.Reading( date( 2023, 2,  5 ), [   0.0, None, None ] ),
+        db.Reading( date( 2023, 2,  9 ), [ 300.0, 70.0, 30.0 ] ),
+    ]
+    deltas_D = Reading_Deltas( readings_D )
+    
+    stats_D = Analyze_Reading( readings_D ).monthly()[0].months[0].points.reading_attributes_stats
+    
+    print( "\n", flush=True )
+    print( "=== Reading Deltas ===" )
+    for i in range( len(deltas_D) ):
+        print( deltas_D.readings[i].date, *[ deltas_D[i, k] for k in range(COUNT_READING_ATTRIBUTES) ] )
+    
+    printout_validation( 
+        (deltas_D[0, 0] is None,                                  "first reading must not have a delta"), 
+        (deltas_D[1, 0] == reading_delta_t( 100.0, 2, 50.0, False ), f"delta of 2nd reading must be (100, 2 days) but actually is {deltas_D[1, 0]}"), 
+        (deltas_D[2, 0].reset and deltas_D[2, 0].ddays == 4,      "zero value must be flagged as reset"), 
+        (deltas_D[3, 0] == reading_delta_t( 100.0, 8, 12.5, False ), f"zero values must be bridged but delta is {deltas_D[3, 0]}"), 
+        (deltas_D[3, 2] == reading_delta_t( 20.0, 10, 2.0, False ),  f"missing values must be bridged but delta is {deltas_D[3, 2]}"), 
+        (deltas_D[2, 1] is None,                                  "missing value must not have a delta"), 
+        (stats_D[1].mean == 20.0 / 8,                             f"february frame must only use deltas within february but mean is {stats_D[1].mean}"), 
+        (stats_D[2].mean is None,                                 "deltas reaching into january must be excluded from the february frame"), 
+    )
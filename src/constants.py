@@ -103,9 +103,12 @@ PDF_FONT_TABLE = "Courier"
 PDF_FONT_TITLE = "Courier-Bold"
 PDF_FONTSIZE_NOTES = 7
 
+EXPORT_PROGRESS_INTERVAL = 0.1 # seconds between redraws of the progress of a pdf export
+
 SIZE_TAB  = 4
 SIZE_NAME = 32
 SIZE_DATE = 10
+SIZE_DROPDOWN = 5 # count of names listed below a name input
 
 NL = '\n'
 
@@ -1,7 +1,7 @@
 
 from datetime import date
 
-from generic_lib.dbHandler import DBSession, Reading, Person
+from generic_lib.dbHandler import DBSession, Reading, Person, Tariff
 from constants import PATH_DB, COUNT_READING_ATTRIBUTES
 
 
@@ -12,11 +12,18 @@ __SESSION = DBSession( PATH_DB, COUNT_READING_ATTRIBUTES )
 def get_DB_handle() -> DBSession:
     return __SESSION
 
+def get_revision() -> int:
+    return __SESSION.get_revision()
+def get_count_hits() -> int:
+    return __SESSION.get_count_hits()
+
 
 def add_reading( data:Reading ) -> None:
     __SESSION.add_reading( data )
 def add_person( data:Person ) -> None:
     __SESSION.add_person( data )
+def add_tariff( data:Tariff ) -> None:
+    __SESSION.add_tariff( data )
 
 def remove_reading( date: date ) -> None: 
     __SESSION.remove_readings( date, date )
@@ -24,11 +31,18 @@ def remove_readings( date_low: date, date_high:date ) -> None:
     __SESSION.remove_readings( date_low, date_high )
 def remove_person( name:str ) -> None: 
     __SESSION.remove_person( name )
+def remove_tariff( meter:int, valid_from:date ) -> None: 
+    __SESSION.remove_tariff( meter, valid_from )
 
 def get_all_readings() -> list[Reading]:
     return __SESSION.get_reading_all()
 def get_all_persons() -> list[Person]: 
     return __SESSION.get_person_all()
+def get_all_tariffs() -> list[Tariff]: 
+    return __SESSION.get_tariff_all()
+
+def get_tariffs( meter:int ) -> list[Tariff]:
+    return __SESSION.get_tariff_of( meter )
 
 def get_data_between( date_low: date, date_high: date ) -> tuple[list[Reading], list[Person]]:
     readings = __SESSION.get_reading_between( date_low, date_high )
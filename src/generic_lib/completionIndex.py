@@ -0,0 +1,442 @@
+from bisect          import bisect_left
+from heapq           import nsmallest
+from collections     import defaultdict
+from collections.abc import Sequence
+from itertools       import compress, repeat
+from operator        import contains
+from typing          import Callable, Iterable, TypeVar, Final
+
+
+T = TypeVar("T")
+U = TypeVar("U")
+
+
+#-----------#
+#   views   #
+#-----------#
+
+class Sequence_View( Sequence ):
+    """
+    read only concatenation of slices of sequences, each item is mapped by `func` when it is accessed
+    
+    nothing is copied, hence creating a view costs the same no matter how many items it spans
+    """
+    __slots__ = ( "__func", "__parts", "__len" )
+    
+    def __init__(self, func:Callable[[T], U], *parts:tuple[Sequence[T], int, int]) -> None:
+        """
+        Args:
+            func (`(T) -> U`): maps an item of the parts to the item of the view
+            parts (`tuple[Sequence[T], int, int]`): `( sequence, start, stop )` slices which are concatenated in order
+        """
+        self.__func  = func
+        self.__parts = [ ( seq, start, stop ) for seq, start, stop in parts if start < stop ]
+        self.__len   = sum( stop - start for _, start, stop in self.__parts )
+    
+    def __len__(self) -> int:
+        return self.__len
+    
+    def __getitem__(self, index:int) -> U:
+        if index < 0:
+            index += self.__len
+        
+        if not 0 <= index < self.__len:
+            raise IndexError( "Sequence_View index out of range" )
+        
+        for seq, start, stop in self.__parts:
+            if index < stop - start:
+                return self.__func( seq[ start + index ] )
+            
+            index -= stop - start
+
+class Bitmask_View( Sequence ):
+    """
+    read only view of the items of `values` whose bit is set in `mask`, in the order of `values`
+    
+    The view remembers the last accessed item, stepping to a neighboring item only searches the next set bit.
+    Other items are reached by stepping from the nearest of the remembered, the first and the last item.
+    """
+    __slots__ = ( "__values", "__mask", "__len", "__cursor" )
+    
+    def __init__(self, values:Sequence[T], mask:int) -> None:
+        """
+        Args:
+            values (`Sequence[T]`): all items, bit `i` of `mask` selects `values[i]`
+            mask (`int`): bitmask of the selected items
+        """
+        self.__values = values
+        self.__mask   = mask
+        self.__len    = mask.bit_count()
+        self.__cursor = ( 0, ( mask & -mask ).bit_length() - 1 )
+        '''( index in the view, index in values ) of the last accessed item'''
+    
+    def __len__(self) -> int:
+        return self.__len
+    
+    def __getitem__(self, index:int) -> T:
+        if index < 0:
+            index += self.__len
+        
+        if not 0 <= index < self.__len:
+            raise IndexError( "Bitmask_View index out of range" )
+        
+        i, bit = min(
+            self.__cursor,
+            ( 0, ( self.__mask & -self.__mask ).bit_length() - 1 ),
+            ( self.__len - 1, self.__mask.bit_length() - 1 ),
+            key=lambda c: abs( c[0] - index )
+        )
+        
+        for _ in range( index - i ):
+            rest = self.__mask >> ( bit + 1 )
+            bit += ( rest & -rest ).bit_length()
+        
+        for _ in range( i - index ):
+            bit = ( self.__mask & ( ( 1 << bit ) - 1 ) ).bit_length() - 1
+        
+        self.__cursor = ( index, bit )
+        return self.__values[ bit ]
+
+
+#-----------#
+#  indices  #
+#-----------#
+
+class Name_Index():
+    """
+    completion index of names, matched by their canonical form, e.g. in lower case
+    
+    The names are sorted by their canonical form, hence the names starting with a prefix are one slice found by bisection.
+    Names containing the prefix elsewhere are found via the posting lists of the n-grams of the canonical names.
+    """
+    NGRAM: Final[int] = 3
+    '''length of the longest indexed substrings, longer infixes are matched against the candidates of their rarest n-gram'''
+    
+    __canonicalize: Callable[[str], str]
+    
+    __keys : list[str]
+    '''canonical names in sorted order'''
+    __names: list[str]
+    '''names in the order of `__keys`'''
+    
+    __grams: dict[str, list[int]]
+    '''dict[ substring of at most `NGRAM` characters: ascending indices of the names containing it ]'''
+    
+    def __init__(self, names:Iterable[str], canonicalize:Callable[[str], str] = str.lower) -> None:
+        """
+        Args:
+            names (`Iterable[str]`): names to be completed, duplicates are kept
+            canonicalize (`(str) -> str`, optional): canonical form names and prefixes are matched by. Defaults to str.lower.
+        """
+        pairs = sorted( ( canonicalize( n ), n ) for n in names )
+        
+        self.__canonicalize = canonicalize
+        self.__keys  = [ k for k, _ in pairs ]
+        self.__names = [ n for _, n in pairs ]
+        
+        grams = defaultdict( list )
+        
+        for i, key in enumerate( self.__keys ):
+            for gram in { key[j:j+n] for n in range( 1, self.NGRAM+1 ) for j in range( len(key)-n+1 ) }:
+                grams[gram].append( i )
+        
+        self.__grams = dict( grams )
+    
+    def __len__(self) -> int:
+        return len( self.__names )
+    
+    def complete(self, prefix:str) -> Sequence[str]:
+        """
+        names starting with the canonical `prefix`, followed by the names containing it elsewhere,
+        both groups are sorted by the canonical names
+        
+        Args:
+            prefix (`str`): typed part of a name
+        
+        Returns:
+            `Sequence[str]`: lazy view of the matching names
+        """
+        key = self.__canonicalize( prefix )
+        
+        if not key:
+            return Sequence_View( self.__names.__getitem__, ( range( len(self.__names) ), 0, len(self.__names) ) )
+        
+        lo = bisect_left( self.__keys, key )
+        hi = bisect_left( self.__keys, key[:-1] + chr( ord(key[-1]) + 1 ), lo )
+        
+        if len( key ) <= self.NGRAM:
+            # every name containing the key is listed, the ones starting with it are one block of the ascending indices
+            posting = self.__grams.get( key, [] )
+            a = bisect_left( posting, lo )
+            b = bisect_left( posting, hi, a )
+            
+            infix = [ ( posting, 0, a ), ( posting, b, len(posting) ) ]
+        
+        else:
+            # the candidates are verified without a python level loop
+            rarest  = min( ( self.__grams.get( key[j:j+self.NGRAM], [] ) for j in range( len(key)-self.NGRAM+1 ) ), key=len )
+            posting = list( compress( rarest, map( contains, map( self.__keys.__getitem__, rarest ), repeat( key ) ) ) )
+            a = bisect_left( posting, lo )
+            b = bisect_left( posting, hi, a )
+            
+            infix = [ ( posting, 0, a ), ( posting, b, len(posting) ) ]
+        
+        return Sequence_View( self.__names.__getitem__, ( range( len(self.__names) ), lo, hi ), *infix )
+
+class Position_Index():
+    """
+    index of strings of the same length, e.g. formatted dates, by the character at each position
+    
+    For each position and character a bitmask marks the strings having that character there,
+    hence matching a partially typed pattern takes one `&` per typed character.
+    """
+    __strings: list[str]
+    __masks  : list[dict[str, int]]
+    '''per position: dict[ character: bitmask of the strings with that character at the position ]'''
+    
+    def __init__(self, strings:Iterable[str]) -> None:
+        """
+        Args:
+            strings (`Iterable[str]`): strings of the same length, their order is kept by `matching(...)`
+        """
+        self.__strings = list( strings )
+        self.__masks   = []
+        
+        width = min( map( len, self.__strings ), default=0 )
+        
+        for p in range( width ):
+            # bit i belongs to the i-th string, hence the column is read in reverse
+            column = ''.join( s[p] for s in reversed( self.__strings ) )
+            chars  = set( column )
+            
+            self.__masks.append( {
+                ch: int( column.translate( { ord(c): '1' if c == ch else '0' for c in chars } ), 2 )
+                for ch in chars
+            } )
+    
+    def __len__(self) -> int:
+        return len( self.__strings )
+    
+    def matching(self, pattern:Sequence[str]) -> Sequence[str]:
+        """
+        strings which have the same character as `pattern` at every position where `pattern` is not empty
+        
+        Args:
+            pattern (`Sequence[str]`): one character or `''` per position, surplus positions are ignored
+        
+        Returns:
+            `Sequence[str]`: lazy view of the matching strings in their original order
+        """
+        mask = ( 1 << len( self.__strings ) ) - 1
+        
+        for masks, ch in zip( self.__masks, pattern ):
+            if ch:
+                mask &= masks.get( ch, 0 )
+        
+        return Bitmask_View( self.__strings, mask )
+
+class Fuzzy_Index():
+    """
+    ranks names by their trigram similarity to a typed query, i.e. the Jaccard index of both sets of trigrams
+    
+    Every word is padded like `"  word "` before it is split into trigrams, hence the beginnings of words weigh more.
+    The last word of the query is not padded at its end, since it is usually still being typed.
+    
+    The shared trigrams of each name with the previous query are kept,
+    so typing a character only walks the posting lists of the few trigrams which changed.
+    """
+    __canonicalize: Callable[[str], str]
+    
+    __names: list[str]
+    __sizes: list[int]
+    '''count of trigrams of each name'''
+    
+    __grams: dict[str, list[int]]
+    '''dict[ trigram: indices of the names containing it ]'''
+    
+    __query : set[str]
+    '''trigrams of the previous query'''
+    __shared: dict[int, int]
+    '''dict[ index of a name: count of trigrams shared with the previous query ]'''
+    
+    def __init__(self, names:Iterable[str], canonicalize:Callable[[str], str] = str.lower) -> None:
+        """
+        Args:
+            names (`Iterable[str]`): names to be ranked, duplicates are kept
+            canonicalize (`(str) -> str`, optional): canonical form names and queries are compared by. Defaults to str.lower.
+        """
+        self.__canonicalize = canonicalize
+        self.__names  = list( names )
+        self.__sizes  = []
+        self.__grams  = defaultdict( list )
+        self.__query  = set()
+        self.__shared = dict()
+        
+        for i, name in enumerate( self.__names ):
+            grams = self.trigrams( canonicalize( name ) )
+            self.__sizes.append( len( grams ) )
+            
+            for gram in grams:
+                self.__grams[gram].append( i )
+        
+        self.__grams = dict( self.__grams )
+    
+    def __len__(self) -> int:
+        return len( self.__names )
+    
+    @staticmethod
+    def trigrams(text:str, complete:bool=True) -> set[str]:
+        """
+        Args:
+            text (`str`): canonical text
+            complete (`bool`, optional): whether the last word is complete and is padded at its end as well. Defaults to True.
+        
+        Returns:
+            `set[str]`: trigrams of the padded words of `text`
+        """
+        words = text.split()
+        grams = set()
+        
+        for k, word in enumerate( words ):
+            padded = "  " + word + ( ' ' if complete or k < len(words)-1 else '' )
+            grams.update( padded[j:j+3] for j in range( len(padded)-2 ) )
+        
+        return grams
+    
+    def rank(self, query:str, k:int) -> list[str]:
+        """
+        the `k` names most similar to `query`, the most similar first, equally similar names are sorted alphabetically
+        
+        names without any trigram in common with the query are not listed, an empty query lists the first `k` names alphabetically
+        
+        Args:
+            query (`str`): typed, possibly incomplete name
+            k (`int`): count of names to be returned at most
+        
+        Returns:
+            `list[str]`: ranked names
+        """
+        grams = self.trigrams( self.__canonicalize( query ), complete=False )
+        
+        added   = grams - self.__query
+        removed = self.__query - grams
+        
+        # a query which changed completely is counted from scratch
+        if len( added ) + len( removed ) > len( grams ):
+            self.__shared.clear()
+            added, removed = grams, set()
+        
+        for gram in added:
+            for i in self.__grams.get( gram, () ):
+                self.__shared[i] = self.__shared.get( i, 0 ) + 1
+        
+        for gram in removed:
+            for i in self.__grams.get( gram, () ):
+                if self.__shared[i] == 1:
+                    del self.__shared[i]
+                else:
+                    self.__shared[i] -= 1
+        
+        self.__query = grams
+        
+        if not grams:
+            return nsmallest( k, self.__names )
+        
+        size = len( grams )
+        best = nsmallest(
+            k,
+            self.__shared.items(),
+            key=lambda item: ( -item[1] / ( size + self.__sizes[item[0]] - item[1] ), self.__names[item[0]] )
+        )
+        
+        return [ self.__names[i] for i, _ in best ]
+
+if __name__ == "__main__":
+    # self-check against the former linear scans and benchmark of 100k names and dates
+    from datetime   import date, timedelta
+    from random     import Random
+    from statistics import median
+    from time       import perf_counter
+    
+    rng = Random( 7 )
+    
+    def timed( func:Callable[[], Sequence[str]] ) -> tuple[Sequence[str], float]:
+        # a completion has to report its length and the first and the last item, i.e. Tab and Shift+Tab
+        t = perf_counter()
+        view = func()
+        if view:
+            view[0], view[-1]
+        return view, perf_counter() - t
+    
+    syllables = [ "mül", "ler", "schmi", "dt", "fuc", "hs", "ma", "ier", "van", "der", "lin", "den", "gün", "ther", "pe", "ter", "horst", "a", "e", "o" ]
+    names = [
+        ' '.join( ''.join( rng.choice( syllables ) for _ in range( rng.randint( 1, 3 ) ) ).capitalize() for _ in range( rng.randint( 1, 3 ) ) )
+        for _ in range( 100_000 )
+    ]
+    
+    t = perf_counter()
+    index = Name_Index( names )
+    print( f"Name_Index    : built in {perf_counter()-t:6.2f}s" )
+    
+    prefixes = [ "", "m", "Mü", "ler", "er s", "schmidt", "horst gün", "xyz", *( rng.choice( names )[1:rng.randint( 2, 9 )] for _ in range( 500 ) ) ]
+    durations = []
+    
+    for k, prefix in enumerate( prefixes ):
+        view, duration = timed( lambda: index.complete( prefix ) )
+        durations.append( duration )
+        
+        if k < 20:
+            key = prefix.lower()
+            leading = sorted( ( n.lower(), n ) for n in names if n.lower().startswith( key ) )
+            infix   = sorted( ( n.lower(), n ) for n in names if key in n.lower() and not n.lower().startswith( key ) )
+            assert list( view ) == [ n for _, n in leading + infix ], f"completion of '{prefix}' differs"
+    
+    print( f"Name_Index    : completion median {median(durations)*1e3:6.3f}ms, slowest {max(durations)*1e3:6.3f}ms" )
+    
+    dates = [ date( 2000, 1, 1 ) + timedelta( days=rng.randrange( 40_000 ) ) for _ in range( 100_000 ) ]
+    
+    t = perf_counter()
+    index = Position_Index( d.strftime( "%d%m%Y" ) for d in dates )
+    print( f"Position_Index: built in {perf_counter()-t:6.2f}s" )
+    
+    durations = []
+    
+    for k in range( 500 ):
+        typed   = rng.choice( dates ).strftime( "%d%m%Y" )
+        pattern = [ ch if rng.random() < 0.4 else '' for ch in typed ]
+        
+        view, duration = timed( lambda: index.matching( pattern ) )
+        durations.append( duration )
+        
+        if k < 20:
+            expected = [ s for s in ( d.strftime( "%d%m%Y" ) for d in dates ) if all( a == b or not b for a, b in zip( s, pattern ) ) ]
+            assert list( view ) == expected, f"dates matching {pattern} differ"
+            assert [ view[i] for i in range( len(view)-1, -1, -1 ) ] == expected[::-1], f"dates matching {pattern} differ backwards"
+    
+    print( f"Position_Index: matching median {median(durations)*1e3:6.3f}ms, slowest {max(durations)*1e3:6.3f}ms" )
+    
+    tenants = [ ' '.join( w.capitalize() for w in name.split() ) for name in names[:5_000] ]
+    
+    t = perf_counter()
+    index = Fuzzy_Index( tenants )
+    print( f"Fuzzy_Index   : built in {perf_counter()-t:6.2f}s" )
+    
+    durations = []
+    
+    for k in range( 100 ):
+        target = rng.choice( tenants )
+        typo   = target[:3] + target[4:] if len( target ) > 4 else target
+        
+        # the name is typed character by character
+        for n in range( 1, len( typo )+1 ):
+            t = perf_counter()
+            ranked = index.rank( typo[:n], 5 )
+            durations.append( perf_counter() - t )
+            
+            if k < 10:
+                grams = Fuzzy_Index.trigrams( typo[:n].lower(), complete=False )
+                similarity = lambda name: len( grams & ( g := Fuzzy_Index.trigrams( name.lower() ) ) ) / len( grams | g )
+                expected = sorted( ( name for name in tenants if grams & Fuzzy_Index.trigrams( name.lower() ) ), key=lambda name: ( -similarity(name), name ) )[:5]
+                assert ranked == expected, f"ranking of '{typo[:n]}' differs"
+    
+    print( f"Fuzzy_Index   : ranking per key median {median(durations)*1e3:6.3f}ms, slowest {max(durations)*1e3:6.3f}ms" )
@@ -1,11 +1,16 @@
 from __future__ import annotations
-from typing     import Optional, Sequence, overload, Self, ClassVar, TypeVar
-from time       import sleep, time
+from typing     import Optional, Sequence, overload, Self, ClassVar, TypeVar, NamedTuple
+from time       import sleep, time, monotonic
 from enum       import Enum
 from contextlib import contextmanager, _GeneratorContextManager
+from itertools  import chain
+from functools  import lru_cache
+from collections import deque
 
+import io
 import re
 import sys
+import threading
 
 try:
     from colors import *
@@ -31,6 +36,8 @@ from   console.screen import sc, Screen
 
 import pynput.keyboard as keyboard
 
+from generic_lib.utils import Styled_Text, CSI_REGEX
+
 T = TypeVar("T", int, float)
 class Point():
     """ Simple 2-D Point """
@@ -133,8 +140,7 @@ class Style:
     >>> text = "normal " + blue_Black.apply( "blue, ", red_underline.apply("red, "), "blue again, " ) + "normal again"
     >>> Console.write( text )
     """
-    _colors_regex: ClassVar[re.Pattern] = re.compile( r"((\x1b|\033)\[\d{1,3}(;\d{1,3})*m)[\s\S]+?((\x1b|\033)\[0m)" )
-    _csi_regex   : ClassVar[re.Pattern] = re.compile( r"\x1b\[(K|.*?m)" )
+    _csi_regex   : ClassVar[re.Pattern] = CSI_REGEX
 
     csi_reset : ClassVar[str] = "\x1b[0m"
     csi_format: str
@@ -180,13 +186,8 @@ class Style:
         """
         text = sep.join( map( str, strings ) )
         
-        formatted_text = text
-        
-        for match in Style._colors_regex.finditer( text ):
-            # not yet optimized; necessary?
-            formatted_text = text.replace( match.group(), match.group()[:-4] + self.csi_format, 1 )
-        
-        return self.csi_format + formatted_text + Style.csi_reset
+        # every reset of an encapsulated style switches back to this style, in a single pass
+        return self.csi_format + text.replace( Style.csi_reset, self.csi_format ) + Style.csi_reset
     
     @staticmethod
     def csi_code( fg:int|str=None, bg:int|str=None, styles:STYLE_TYPE|list[STYLE_TYPE]=None, force_clean:bool=False ) -> str:
@@ -213,6 +214,12 @@ class Style:
         elif isinstance( styles, list ):  sty = '+'.join( [ s.value for s in styles ] )
         else:                             sty = styles
         
+        return Style.__csi_code( fg, bg, sty, force_clean )
+    
+    @staticmethod
+    @lru_cache( maxsize=None )
+    def __csi_code( fg:int|str, bg:int|str, sty:str, force_clean:bool ) -> str:
+        # styles are created over and over again, e.g. by `Console.stylized(...)`, but only use a handful of codes
         escaped = color( "", fg, bg, sty )
         
         # add reset code to csi code
@@ -240,23 +247,131 @@ class Style:
         Returns:
             `str`: stylized truncated string
         """
-        printable_text:str = Style._csi_regex.sub( '', color_coded_text )
+        return Styled_Text.truncate( color_coded_text, printable_width )
+
+
+key_event_t = NamedTuple( "key_event_t", [("keys", tuple["Key", ...]), ("first", float), ("last", float)] )
+'''keys pressed in one burst and the (monotonic) timestamps of the first and the last of them'''
+
+key_queue_stats_t = NamedTuple( "key_queue_stats_t", [("pressed", int), ("delivered", int), ("dropped", int), ("stale", int), ("batches", int)] )
+'''counts of keys put into resp. taken out of the queue, lost to a full queue or discarded as too old, and count of coalesced batch events'''
+
+class Key_Queue():
+    """
+    thread-safe ring buffer of immutable `key_event_t`, filled by the keyboard listener thread and drained by `Console.get_key()`
+    
+    Keys pressed in quick succession, e.g. typed by a paste tool or by holding a key down, are coalesced into a single batch event.
+    If the buffer is full, the oldest event is dropped in favour of the new one
+    """
+    __slots__ = [ "capacity", "coalesce_interval", "max_batch", "_events", "_head", "_count", "_not_empty",
+                  "_pressed", "_delivered", "_dropped", "_stale", "_batches" ]
+    
+    capacity         : int
+    coalesce_interval: float
+    '''maximum time in seconds between two keys of the same batch'''
+    max_batch        : int
+    
+    def __init__(self, capacity:int=256, coalesce_interval:float=0.005, max_batch:int=64) -> None:
+        self.capacity          = capacity
+        self.coalesce_interval = coalesce_interval
+        self.max_batch         = max_batch
         
-        if len(printable_text) <= printable_width:
-            return color_coded_text
+        self._events   : list[key_event_t|None] = [ None ] * capacity
+        self._head     : int = 0
+        self._count    : int = 0
+        self._not_empty: threading.Condition = threading.Condition()
         
-        out_str = printable_text[:printable_width]
-        matches = list( Style._csi_regex.finditer( color_coded_text ) )
+        self._pressed   = 0
+        self._delivered = 0
+        self._dropped   = 0
+        self._stale     = 0
+        self._batches   = 0
+    
+    def put(self, key:Key, timestamp:float|None=None) -> None:
+        """
+        append a key, either to the newest event if it is a batch of printable keys pressed just before or as a new event
         
-        width_add = 0
-        for m in matches:
-            if m.start() > printable_width + width_add:
-                break
+        Args:
+            key (`Key`): pressed key
+            timestamp (`float`, optional): time of the key press, see `time.monotonic()`. Defaults to now.
+        """
+        timestamp = monotonic() if timestamp is None else timestamp
+        
+        with self._not_empty:
+            self._pressed += 1
+            
+            tail_index = ( self._head + self._count - 1 ) % self.capacity
+            tail       = self._events[ tail_index ] if self._count else None
+            
+            if tail is not None\
+            and key.is_alpha_numeric() and tail.keys[-1].is_alpha_numeric()\
+            and timestamp - tail.last <= self.coalesce_interval\
+            and len( tail.keys ) < self.max_batch:
+                if len( tail.keys ) == 1:
+                    self._batches += 1
+                
+                self._events[ tail_index ] = key_event_t( tail.keys + ( key, ), tail.first, timestamp )
+                return
+            
+            if self._count == self.capacity:
+                self._dropped += len( self._events[ self._head ].keys )
+                self._head     = ( self._head + 1 ) % self.capacity
+                self._count   -= 1
             
-            out_str = out_str[:m.start()] + m.group() + out_str[m.start():]
-            width_add += len( m.group() )
+            self._events[ ( self._head + self._count ) % self.capacity ] = key_event_t( ( key, ), timestamp, timestamp )
+            self._count += 1
+            
+            self._not_empty.notify()
+    
+    def get(self, timeout:float|None=None, max_age:float|None=None) -> key_event_t|None:
+        """
+        take the oldest event out of the queue, block until there is one
+        
+        Args:
+            timeout (`float`, optional): maximum time in seconds to block, `None` blocks indefinitely. Defaults to None.
+            max_age (`float`, optional): discard events whose last key was pressed longer ago in seconds. Defaults to None.
         
-        return out_str
+        Returns:
+            `key_event_t|None`: oldest event or `None` if the timeout was exceeded
+        """
+        with self._not_empty:
+            while True:
+                if not self._not_empty.wait_for( lambda: self._count, timeout ):
+                    return None
+                
+                event = self._events[ self._head ]
+                
+                self._events[ self._head ] = None
+                self._head   = ( self._head + 1 ) % self.capacity
+                self._count -= 1
+                
+                if max_age is None or monotonic() - event.last <= max_age:
+                    self._delivered += len( event.keys )
+                    return event
+                
+                self._stale += len( event.keys )
+    
+    def clear(self) -> None:
+        """ discard all queued events, their keys are counted as stale """
+        with self._not_empty:
+            for i in range( self._count ):
+                index = ( self._head + i ) % self.capacity
+                
+                self._stale += len( self._events[ index ].keys )
+                self._events[ index ] = None
+            
+            self._count = 0
+    
+    def __len__(self) -> int:
+        return self._count
+    
+    def stats(self) -> key_queue_stats_t:
+        """
+        Returns:
+            `key_queue_stats_t`: ( pressed, delivered, dropped, stale, batches ) since the creation of the queue
+        """
+        with self._not_empty:
+            return key_queue_stats_t( self._pressed, self._delivered, self._dropped, self._stale, self._batches )
 
 
 # TODO Key: add ctrl+'alphabetic' since they are not nicely recognized
@@ -268,7 +383,7 @@ class Key():
     Handles user inputs.
     
     ---
-    - Instance objects of this `Key` class act as a snapshot of the current state of user inputs (key press events) and can be invoked/instantiated by calling `Key.dump()`
+    - Instance objects of this `Key` class are immutable snapshots of key press events, the keyboard listener queues them in `Key.queue`
     - To alter the internal state of user inputs (key press events) use the classmethods (`Key.press(...)`, `Key.release(...)`) provided as instructed
     - To get general information about a returned `Key` use the `get_char()`, `get_non_printable()`, `get_modifiers()`, `is_alpha_numeric()` instance methods as instructed ( or `info_str()` for 'debugging' )
     - To check (strictly) for a specific Key (-combination) instantiate a new `Key` object with your intended Key (-combination) and compare it with the inbuilt equal operation (`==`).
@@ -363,8 +478,10 @@ class Key():
         keyboard.Key.cmd_r
     ]
     _MODIFIERS        : set[keyboard.Key] = set()
-    _KEY_NON_PRINTABLE: keyboard.Key      = None
-    _KEY_ALPHA_NUMERIC: keyboard.KeyCode  = None
+    '''modifiers currently held down, only touched by the keyboard listener thread'''
+    
+    queue: ClassVar[ Key_Queue ] = Key_Queue()
+    '''key press events not yet taken by `Console.get_key()`'''
     
     
     # instance variables
@@ -385,23 +502,18 @@ class Key():
 
         decides if pressed key is: 
         - a modifier: adding it to the current `Key.modifiers` set
-        - not a modifier: updates its state accordingly to the Key
+        - not a modifier: queues a `Key` of it and the current modifiers in `Key.queue`
 
         Args:
             key_or_keyCode (`keyboard.Key` | `keyboard.KeyCode`): callback parameter from pynput, is either a `Key` or `KeyCode`
         """
-        is_alpha_numeric = hasattr( key_or_keyCode, "char" )
+        timestamp = monotonic()
         
-        if is_alpha_numeric:
-            cls._KEY_ALPHA_NUMERIC = key_or_keyCode
-            cls._KEY_NON_PRINTABLE = None
-        else:
-            if key_or_keyCode in cls.__MOD_LIST:
-                cls._MODIFIERS.add( key_or_keyCode )
-                return
-            
-            cls._KEY_NON_PRINTABLE = key_or_keyCode
-            cls._KEY_ALPHA_NUMERIC = None
+        if not hasattr( key_or_keyCode, "char" ) and key_or_keyCode in cls.__MOD_LIST:
+            cls._MODIFIERS.add( key_or_keyCode )
+            return
+        
+        cls.queue.put( Key( key_or_keyCode, *cls._MODIFIERS ), timestamp )
     
     @classmethod
     def release(cls, key_or_keyCode:object) -> None:
@@ -424,19 +536,6 @@ class Key():
         if key_or_keyCode in cls.__MOD_LIST:
             cls._MODIFIERS.discard( key_or_keyCode )
     
-    @classmethod
-    def dump(cls) -> Key:
-        """
-        #### DO NOT USE THIS METHOD UNLESS YOU INTENT TO ALTER THE INTERNAL STATE OF THE KEY-MANAGER
-        ---
-
-        dumps the current state of the class variables of `Key` into an immutable `Key` instance for returning to user
-
-        Returns:
-            `Key`: instance with attributes of current state
-        """
-        return Key( cls._KEY_ALPHA_NUMERIC if cls._KEY_ALPHA_NUMERIC else cls._KEY_NON_PRINTABLE, *cls._MODIFIERS )
-    
     @classmethod
     def convert(cls, _o:Key|keyboard.Key|keyboard.KeyCode|str, /) -> Key:
         """
@@ -638,9 +737,170 @@ class Key():
             and ( self._key_non_printable == k._key_non_printable )\
             and ( k._modifiers.issubset( self._modifiers ) )    # self.modifiers must contain (at least) all of k.modifiers
 
+cell_t = tuple[str, str]
+'''( character, style ) of a single screen cell, the style being the csi codes active when the character was printed'''
+
+class Screen_Buffer():
+    """
+    off-screen copy of the terminal, holding a character and a style for each cell
+    
+    While `Console.buffered()` is active all output is drawn into the `back` cells.
+    `flush()` compares them with the `front` cells, i.e. what is known to be on the terminal,
+    and emits only the runs of changed cells as cursor movements and text.
+    
+    A `back` cell of `None` has not been drawn yet, a `front` cell of `None` is unknown.
+    The buffer does not scroll, output beyond the last line is drawn onto the last line
+    """
+    __slots__ = [ "width", "height", "back", "front", "dirty" ]
+    
+    MAX_GAP: ClassVar[int] = 4
+    '''unchanged cells between two changed runs which are rewritten rather than skipped by a cursor movement'''
+    
+    width : int
+    height: int
+    back  : list[ list[ cell_t|None ] ]
+    front : list[ list[ cell_t|None ] ]
+    dirty : set[int]
+    
+    def __init__(self, width:int, height:int) -> None:
+        self.width  = width
+        self.height = height
+        self.back   = [ [ None ] * width for _ in range( height ) ]
+        self.front  = [ [ None ] * width for _ in range( height ) ]
+        self.dirty  = set()
+    
+    def draw(self, col:int, line:int, text:str, style:str) -> None:
+        """
+        draw a single line of printable characters, characters beyond the right edge are dropped
+        
+        Args:
+            col (`int`): column of the first character
+            line (`int`): line of the text
+            text (`str`): printable characters without line breaks
+            style (`str`): csi codes the text is printed with
+        """
+        if not 0 <= line < self.height:
+            return
+        
+        text = text[ :self.width - col ]
+        self.back[ line ][ col : col+len(text) ] = [ ( c, style ) for c in text ]
+        self.dirty.add( line )
+    
+    def erase(self, col:int, line:int, style:str) -> None:
+        """ blank a line from `col` to the right edge, like the csi code `K` """
+        if 0 <= line < self.height and col < self.width:
+            self.draw( col, line, ' ' * ( self.width - col ), style )
+    
+    def fill(self) -> None:
+        """ blank the whole screen in the default style """
+        for line in range( self.height ):
+            self.draw( 0, line, ' ' * self.width, '' )
+    
+    def flush(self) -> tuple[str, tuple[int, int]|None]:
+        """
+        escape code sequence which brings the terminal from the `front` to the `back` cells,
+        afterwards both are equal
+        
+        Returns:
+            `tuple[str, tuple[int, int]|None]`: ( escape code sequence, cursor position after printing it or `None` if it is empty )
+        """
+        out   : list[str] = []
+        style : str = ''
+        cursor: tuple[int, int]|None = None
+        
+        for line in sorted( self.dirty ):
+            back, front = self.back[ line ], self.front[ line ]
+            changed = [ c for c, cell in enumerate( back ) if cell is not None and cell != front[c] ]
+            
+            runs: list[list[int]] = []
+            for c in changed:
+                # bridge short gaps of unchanged cells, as long as their content is known
+                if runs and c - runs[-1][1] <= Screen_Buffer.MAX_GAP + 1\
+                and all( back[k] is not None or front[k] is not None for k in range( runs[-1][1]+1, c ) ):
+                    runs[-1][1] = c
+                else:
+                    runs.append( [ c, c ] )
+            
+            for start, end in runs:
+                if cursor != ( start, line ):
+                    out.append( sc.move_to( start, line ) )
+                
+                for c in range( start, end+1 ):
+                    cell = back[c] if back[c] is not None else front[c]
+                    char, cell_style = cell
+                    
+                    if cell_style != style:
+                        style = cell_style
+                        out.append( style if style.startswith( "\x1b[0" ) else Style.csi_reset + style )
+                    
+                    out.append( char )
+                    front[c] = cell
+                
+                cursor = ( end+1, line )
+        
+        if style:
+            out.append( Style.csi_reset )
+        
+        self.dirty.clear()
+        
+        return ''.join( out ), cursor
+
+
+cursor_stats_t = NamedTuple( "cursor_stats_t", [("reads", int), ("queries", int)] )
+'''reads: cursor positions handed out by `Console.get_cursor()`, queries: round trips to the terminal'''
+
+output_stats_t = NamedTuple( "output_stats_t", [("written", int), ("flushes", int)] )
+'''written: characters written to the terminal, including escape codes, flushes: flushes of stdout, i.e. write syscalls'''
+
 class Console():
+    KEY_EVENT_TIMEOUT: ClassVar[ float ] = 0.05
+    '''time in seconds `get_key()` waits for the keyboard listener to report a key read from the terminal'''
+    KEY_EVENT_MAX_AGE: ClassVar[ float ] = 2.0
+    '''queued keys pressed longer ago in seconds are discarded, e.g. keys typed while the terminal was not focused'''
+    
     __listener: ClassVar[ keyboard.Listener ] = None
     
+    __pending_keys: ClassVar[ deque[Key] ] = deque()
+    '''remaining keys of the last batch event'''
+    
+    __TERMINAL_CONTROL_KEYS: ClassVar[ dict[str, keyboard.Key] ] = {
+        '\r'  : keyboard.Key.enter,
+        '\n'  : keyboard.Key.enter,
+        '\t'  : keyboard.Key.tab,
+        '\x08': keyboard.Key.backspace,
+        '\x7f': keyboard.Key.backspace,
+        '\x1b': keyboard.Key.esc,
+    }
+    '''control characters read from the terminal and the keys producing them'''
+    __SILENT_KEYS: ClassVar[ set[keyboard.Key] ] = {
+        getattr( keyboard.Key, name ) for name in ( "caps_lock", "num_lock", "scroll_lock", "print_screen", "pause", "menu" ) if hasattr( keyboard.Key, name )
+    }
+    '''keys which never reach the terminal, not every platform knows all of them'''
+    
+    __cursor: ClassVar[ Point[int] ] = Point(0, 0)
+    '''cursor position in global coordinates, tracked in software. `col` equals the terminal width while a line wrap is pending'''
+    
+    __cursor_reads  : ClassVar[ int ] = 0
+    __cursor_queries: ClassVar[ int ] = 0
+    
+    __cursor_visible: ClassVar[ bool|None ] = None
+    '''visibility of the cursor symbol on the terminal, `None` if unknown'''
+    
+    __screen_buffer : ClassVar[ Screen_Buffer|None ] = None
+    '''cells drawn by the last buffered frames, dropped by any unbuffered output'''
+    
+    __buffer_depth  : ClassVar[ int ] = 0
+    __buffer_style  : ClassVar[ str ] = ''
+    __buffer_origin : ClassVar[ Point[int] ] = None
+    __buffer_visible: ClassVar[ bool|None ] = None
+    
+    __transaction_depth: ClassVar[ int ] = 0
+    __transaction      : ClassVar[ io.StringIO ] = io.StringIO()
+    '''output held back by `transaction()`'''
+    
+    __count_written : ClassVar[ int ] = 0
+    __count_flushes : ClassVar[ int ] = 0
+    
     __is_virtual   : ClassVar[ bool ] = False
     __virtual_depth: ClassVar[ int  ] = 0
     
@@ -663,6 +923,8 @@ class Console():
         
         cls.__applied_style = Style.default
         
+        cls.sync_cursor()
+        
         cls.__listener = keyboard.Listener(
             on_press=Key.press,
             on_release=Key.release
@@ -695,7 +957,7 @@ class Console():
         arg_lines = str_args.splitlines()
         
         if not cls.__is_virtual: # simply use stdout
-            cls.__stdout( str_args, True )
+            cls.__emit( str_args, True )
             return
         
         
@@ -708,21 +970,20 @@ class Console():
         
         width, height = cls.get_console_size().T
         for i, line in enumerate(arg_lines):
-            line_buffer = line
+            # tokenized once, every chunk continues where the previous one ended
+            line_buffer = Styled_Text( line )
             
             while True:
                 avail_width = width - cls.get_cursor().col
                 
-                out_str = Style.truncate_printable( line_buffer, avail_width )
+                out_str = line_buffer.take( avail_width )
                 
-                cls.__stdout( out_str )
+                cls.__emit( out_str )
 
                 if cls.get_cursor().col == width:
                     # cls.__set_cursor_no_clamp( 0, cls.get_cursor()[1]+1 ) # should be wrong
                     cls.set_cursor( 0, cls.get_cursor().line+1 )
                 
-                line_buffer = line_buffer[len(out_str):]
-                
                 if not line_buffer:
                     break
             
@@ -751,8 +1012,19 @@ class Console():
         
         col_line = cls._transform_local_2_global( Point(*col_line) + p )
         
-        with sc.location( col_line.line, col_line.col ):
-            cls.write( msg )
+        # the terminal restores the cursor afterwards, the screen buffer needs no movement at all
+        cursor = cls.__cursor
+        
+        if not cls.__buffer_depth:
+            cls.__stdout( sc.save_position + sc.move_to( *col_line.T ) )
+        
+        cls.__cursor = col_line
+        cls.write( msg )
+        
+        if not cls.__buffer_depth:
+            cls.__stdout( sc.restore_position, True )
+        
+        cls.__cursor = cursor
     
     @classmethod
     def write_in(cls, msg:str, col_line:tuple[int, int]|Point[int], end_col_line:tuple[int, int]|Point[int]=None, absolute:bool=True, clear_area:bool=True) -> None:
@@ -882,17 +1154,67 @@ class Console():
         """
         left upper corner is (0, 0)
         
+        the position is tracked by `Console` on every write, move and clear, hence the terminal is not queried.
+        Call `sync_cursor()` after output which bypassed `Console`
+        
         Returns:
-            `Point[int]`: position of the cursor if unsuccessful defaults to Point(0, 0)
+            `Point[int]`: position of the cursor
         """
-        p = Point( *console.detection.get_position() )
-        p = p - (1,1)
+        cls.__cursor_reads += 1
+        
+        # like the terminal, report the last column while a line wrap is pending
+        p = Point( min( cls.__cursor.col, cls.get_console_size( true_terminal_size=True ).col ), cls.__cursor.line )
         
         if true_cursor_pos:
             return p
         
         return cls._transform_global_2_local( p )
     
+    @classmethod
+    def sync_cursor(cls) -> None:
+        """
+        resynchronize the tracked cursor position with the terminal
+        
+        this is a blocking round trip to the terminal, which is only required if something was written to the terminal without `Console`
+        """
+        cls.__commit()
+        
+        cls.__cursor_queries += 1
+        cls.__cursor = Point( *console.detection.get_position() ) - (1,1)
+        
+        # whatever bypassed `Console` may have changed the screen as well
+        cls.__screen_buffer = None
+    
+    @classmethod
+    def get_cursor_stats(cls) -> cursor_stats_t:
+        """
+        count of cursor reads and of actual terminal queries since the start resp. since the last `reset_cursor_stats()`
+        
+        Returns:
+            `cursor_stats_t`: ( reads, queries )
+        """
+        return cursor_stats_t( cls.__cursor_reads, cls.__cursor_queries )
+    
+    @classmethod
+    def reset_cursor_stats(cls) -> None:
+        cls.__cursor_reads   = 0
+        cls.__cursor_queries = 0
+    
+    @classmethod
+    def get_output_stats(cls) -> output_stats_t:
+        """
+        amount of output written to the terminal and count of flushes since the start resp. since the last `reset_output_stats()`
+        
+        Returns:
+            `output_stats_t`: ( written, flushes )
+        """
+        return output_stats_t( cls.__count_written, cls.__count_flushes )
+    
+    @classmethod
+    def reset_output_stats(cls) -> None:
+        cls.__count_written = 0
+        cls.__count_flushes = 0
+    
     @classmethod
     def set_cursor(cls, col:int, line:int, *, absolute:bool=True) -> None:
         """
@@ -930,17 +1252,20 @@ class Console():
 
         col_line = cls._transform_local_2_global( col_line + p )
         
-        cls.__stdout( sc.move_to( *col_line.T ), True )
+        if not cls.__buffer_depth:
+            cls.__stdout( sc.move_to( *col_line.T ), True )
+        
+        cls.__cursor = col_line
     
     @classmethod
     def hide_cursor(cls) -> None:
         """ hide the cursor symbol on the screen """
-        cls.__stdout( sc.hide_cursor, True )
+        cls.__set_cursor_visible( False )
     
     @classmethod
     def show_cursor(cls) -> None:
         """ show the cursor symbol on the screen """
-        cls.__stdout( sc.show_cursor, True )
+        cls.__set_cursor_visible( True )
     
     
     #--------------#
@@ -951,17 +1276,76 @@ class Console():
         """
         Listens to the users input and recognizes different kind of inputs alpha-numeric, functional-/System Keys
 
+        every key read from the terminal is paired with the next queued key matching it, see `read_key()`,
+        the keys of a batch event are handed out one by one
+        
         Returns:
-            `Key`: static `Key` class
+            `Key`: pressed key
         """
+        cls.__commit()
         
+        return cls.read_key()
+    
+    @classmethod
+    def read_key(cls) -> Key:
+        """
+        Same as `get_key()` but without committing the output held back by `transaction()`
+        
+        Touches neither the terminal output nor the screen buffer,
+        hence it may block in a worker thread while the main thread keeps drawing and calls `commit()` itself
+        
+        Queued keys not matching the characters read from the terminal are dropped,
+        e.g. caps lock or keys typed into another window, which are seen by the keyboard listener but never reach the terminal
+        
+        Returns:
+            `Key`: pressed key
+        """
         # only return 'Key' if the user is focused on the terminal
         # this variable only fulfills the purpose to register key inputs on the terminal and to let the Key class read all strokes of e.g. an compounded Key like enter
         _k = console.utils.wait_key()
         if ord(_k) == 224 or ord(_k) == 0:
             _k += console.utils.wait_key()
-
-        return Key.dump()
+        
+        while True:
+            if not cls.__pending_keys:
+                event = Key.queue.get( cls.KEY_EVENT_TIMEOUT, cls.KEY_EVENT_MAX_AGE )
+                
+                if event is None:
+                    # the listener did not report any matching key, e.g. for text pasted by the terminal itself
+                    return Key( _k ) if len( _k ) == 1 and _k.isprintable() else Key()
+                
+                cls.__pending_keys.extend( event.keys )
+            
+            key = cls.__pending_keys.popleft()
+            
+            if cls.__is_terminal_key( key, _k ):
+                return key
+    
+    @classmethod
+    def discard_keys(cls) -> None:
+        """ discard all queued keys, e.g. after blocking work during which the terminal was not read """
+        cls.__pending_keys.clear()
+        Key.queue.clear()
+    
+    @classmethod
+    def __is_terminal_key(cls, key:Key, _k:str) -> bool:
+        """
+        Args:
+            key (`Key`): key queued by the keyboard listener
+            _k (`str`): characters read from the terminal
+        
+        Returns:
+            `bool`: whether `key` may have produced `_k`
+        """
+        # prefixed scan code of a special key like an arrow, a F-key, delete or home
+        if len( _k ) > 1:
+            return not key.is_alpha_numeric() and key.get_non_printable() not in cls.__SILENT_KEYS
+        
+        if _k.isprintable():
+            return key.is_alpha_numeric() and key.get_char() == _k
+        
+        # control character of enter, tab, backspace, escape or of ctrl + a character
+        return key.get_non_printable() == cls.__TERMINAL_CONTROL_KEYS.get( _k ) or keyboard.Key.ctrl in key.get_modifiers()
     
     @classmethod
     def get_input(cls, prompt:str="", col:int=None, line:int=None, absolute:bool=True ) -> str:
@@ -974,12 +1358,20 @@ class Console():
         cur = Console.get_cursor()
         Console.set_cursor( col if col else cur.col, line if line else cur.line, absolute=absolute )
         
+        # the terminal echoes the input behind the back of the screen buffer
+        cls.__screen_buffer = None
+        cls.__commit()
+        
+        # keys queued before and while reading the line are not meant for `get_key()`
+        cls.discard_keys()
+        
         res = ''
         try:
             res = input( prompt )
         except EOFError or KeyboardInterrupt:
             res = ''
         finally:
+            cls.discard_keys()
             Console.set_cursor( cur, absolute=True )
             return res
 
@@ -1100,6 +1492,68 @@ class Console():
         """ Context Manager that hides the cursor and restores it on exit. """
         return sc.hidden_cursor()
     
+    @classmethod
+    @contextmanager
+    def transaction(cls):
+        """
+        Context which holds back all output to the terminal and writes it with a single flush on leaving the outermost context
+        
+        Blocking for a key or an input commits the pending output beforehand,
+        hence a transaction may span several frames of user interaction and flushes once per frame
+        
+        Returns:
+            `contextmanager`: `contextmanager`
+        """
+        cls.__transaction_depth += 1
+        
+        try:
+            yield cls
+        finally:
+            cls.__transaction_depth -= 1
+            
+            if not cls.__transaction_depth:
+                cls.__commit()
+    
+    @classmethod
+    def commit(cls) -> None:
+        """ write the output held back by the current `transaction()` right away with a single flush """
+        cls.__commit()
+    
+    @classmethod
+    @contextmanager
+    def buffered(cls):
+        """
+        Context which draws all output into an off-screen `Screen_Buffer` instead of the terminal
+        
+        On leaving the outermost context only the cells which differ from the previous buffered frame are written,
+        followed by the final cursor position and visibility.
+        Writing, moving the cursor and clearing work as usual, except that the screen does not scroll.
+        
+        Any unbuffered output in between drops the buffer, hence the next frame is written completely
+        
+        Returns:
+            `contextmanager`: `contextmanager`
+        """
+        if not cls.__buffer_depth:
+            size = cls.get_console_size( true_terminal_size=True ) + (1,1)
+            
+            if cls.__screen_buffer is None or ( cls.__screen_buffer.width, cls.__screen_buffer.height ) != size.T:
+                cls.__screen_buffer = Screen_Buffer( *size )
+            
+            cls.__buffer_style   = ''
+            cls.__buffer_origin  = cls.__cursor
+            cls.__buffer_visible = cls.__cursor_visible
+        
+        cls.__buffer_depth += 1
+        
+        try:
+            yield cls
+        finally:
+            cls.__buffer_depth -= 1
+            
+            if not cls.__buffer_depth:
+                cls.__flush_buffer()
+    
     
     @classmethod
     def clear(cls) -> None:
@@ -1109,7 +1563,15 @@ class Console():
             cls.clear_rectangle( Point(0,0), cs - (1,1) )
             return
         
-        console.utils.cls()
+        if cls.__buffer_depth:
+            cls.__screen_buffer.fill()
+        else:
+            # resets the terminal, which moves the cursor to the top left corner; not necessarily via stdout
+            cls.__commit()
+            console.utils.cls()
+            cls.__screen_buffer = None
+        
+        cls.__cursor = Point(0, 0)
     
     @classmethod
     def clear_rectangle(cls, left_top:Point[int], right_bottom:Point[int]) -> None:
@@ -1260,13 +1722,154 @@ class Console():
         
         assert col_line.col >= 0 and col_line.line >= 0, f"requested cursor position of {col_line} is invalid"
         
-        cls.__stdout( sc.move_to( *col_line ), True )
+        if not cls.__buffer_depth:
+            cls.__stdout( sc.move_to( *col_line ), True )
+        
+        cls.__cursor = col_line
+
+    @classmethod
+    def __advance_cursor(cls, text:str) -> None:
+        """ move the tracked cursor like the terminal does while printing `text`, including line wraps and scrolling at the bottom """
+        width, height = ( cls.get_console_size( true_terminal_size=True ) + (1,1) ).T
+        col, line     = cls.__cursor.T
+        
+        for i, text_line in enumerate( Style._csi_regex.sub( '', text ).split( '\n' ) ):
+            if i:
+                col, line = 0, min( line+1, height-1 )
+            
+            if '\r' in text_line:
+                col, text_line = 0, text_line[ text_line.rfind( '\r' )+1: ]
+            
+            count = len( text_line )
+            
+            while count:
+                # a pending wrap is resolved by the next printable character
+                if col >= width:
+                    col, line = 0, min( line+1, height-1 )
+                
+                step   = min( count, width - col )
+                col   += step
+                count -= step
+        
+        cls.__cursor = Point( col, line )
 
+    @classmethod
+    def __emit(cls, text:str, flush:bool=False) -> None:
+        """ print `text` at the tracked cursor, into the screen buffer while `buffered()` is active """
+        if cls.__buffer_depth:
+            cls.__draw( text )
+            return
+        
+        cls.__stdout( text, flush )
+        cls.__advance_cursor( text )
+        
+        cls.__screen_buffer = None
+    
+    @classmethod
+    def __draw(cls, text:str) -> None:
+        """ draw `text` into the screen buffer like the terminal would print it, moving the tracked cursor along """
+        buffer    = cls.__screen_buffer
+        col, line = cls.__cursor.T
+        style     = cls.__buffer_style
+        pos       = 0
+        
+        for m in chain( Style._csi_regex.finditer( text ), [ None ] ):
+            for i, text_line in enumerate( text[ pos : m.start() if m else len(text) ].split( '\n' ) ):
+                if i:
+                    col, line = 0, min( line+1, buffer.height-1 )
+                
+                for k, segment in enumerate( text_line.split( '\r' ) ):
+                    if k:
+                        col = 0
+                    
+                    while segment:
+                        # a pending wrap is resolved by the next printable character
+                        if col >= buffer.width:
+                            col, line = 0, min( line+1, buffer.height-1 )
+                        
+                        step = buffer.width - col
+                        buffer.draw( col, line, segment[:step], style )
+                        
+                        col    += len( segment[:step] )
+                        segment = segment[step:]
+            
+            if m is None:
+                break
+            
+            code = m.group()
+            pos  = m.end()
+            
+            if code == "\x1b[K":
+                buffer.erase( col, line, style )
+            elif code in ( Style.csi_reset, "\x1b[m" ):
+                style = ''
+            elif code.startswith( "\x1b[0" ):
+                style = code
+            else:
+                style += code
+        
+        cls.__cursor       = Point( col, line )
+        cls.__buffer_style = style
+    
+    @classmethod
+    def __flush_buffer(cls) -> None:
+        """ write the changed cells of the screen buffer, then restore the tracked cursor position and visibility """
+        code, end = cls.__screen_buffer.flush()
+        
+        # a pending line wrap cannot be restored by a cursor movement
+        cursor = Point( min( cls.__cursor.col, cls.__screen_buffer.width-1 ), cls.__cursor.line )
+        
+        if ( end or cls.__buffer_origin.T ) != cursor.T:
+            code += sc.move_to( *cursor.T )
+        
+        cls.__cursor = cursor
+        
+        if cls.__buffer_visible is not None and cls.__buffer_visible != cls.__cursor_visible:
+            code += sc.show_cursor if cls.__buffer_visible else sc.hide_cursor
+            cls.__cursor_visible = cls.__buffer_visible
+        
+        if code:
+            cls.__stdout( code, True )
+    
+    @classmethod
+    def __set_cursor_visible(cls, visible:bool) -> None:
+        if cls.__buffer_depth:
+            cls.__buffer_visible = visible
+            return
+        
+        cls.__stdout( sc.show_cursor if visible else sc.hide_cursor, True )
+        cls.__cursor_visible = visible
+    
+    @classmethod
+    def __commit(cls) -> None:
+        """ write and flush the output held back by `transaction()` """
+        code = cls.__transaction.getvalue()
+        
+        if not code:
+            return
+        
+        cls.__transaction.seek( 0 )
+        cls.__transaction.truncate()
+        
+        sys.stdout.write( code )
+        sys.stdout.flush()
+        cls.__count_flushes += 1
+    
     @classmethod
     def __flush(cls) -> None:
+        if cls.__transaction_depth:
+            return
+        
         sys.stdout.flush()
+        cls.__count_flushes += 1
     @classmethod
     def __stdout(cls, code:str, flush:bool=False) -> None:
+        cls.__count_written += len( code )
+        
+        if cls.__transaction_depth:
+            cls.__transaction.write( code )
+            return
+        
         sys.stdout.write( code )
         
         if flush:
@@ -1274,6 +1877,53 @@ class Console():
 
 
 if __name__ == "__main__":
+    # Benchmark key queue =============================================================================================
+    # a producer thread types synthetic bursts like a paste tool would, while a consumer takes the events like `Console.get_key()`
+    def bench_key_queue( capacity:int, cost_per_event:float, bursts:int=500, burst_size:int=100 ) -> None:
+        queue    = Key_Queue( capacity )
+        keys     = [ Key( c ) for c in "abcdefghijklmnopqrstuvwxyz0123456789" ]
+        received = 0
+        
+        def produce() -> None:
+            for b in range( bursts ):
+                for i in range( burst_size ):
+                    queue.put( keys[ (b+i) % len(keys) ] )
+                sleep( 0.002 )
+        
+        producer = threading.Thread( target=produce )
+        
+        t0 = monotonic()
+        producer.start()
+        
+        while producer.is_alive() or len( queue ):
+            event = queue.get( timeout=0.05 )
+            if event:
+                received += len( event.keys )
+                sleep( cost_per_event )
+        
+        t = monotonic() - t0
+        pressed, delivered, dropped, stale, batches = queue.stats()
+        
+        assert received == delivered and pressed == delivered + dropped + stale
+        print( f"capacity {capacity:4d}, {cost_per_event*1e3:4.1f} ms per event: {delivered/t:9.0f} keys/s, {batches:5d} batches, drop rate {dropped/pressed:6.2%}" )
+    
+    for capacity, cost in [ (256, 0.0), (256, 0.001), (16, 0.001), (16, 0.005) ]:
+        bench_key_queue( capacity, cost )
+    
+    # Self-check key matching ========================================================================================
+    # keys which never reach the terminal are dropped instead of shifting every following key by one
+    terminal = iter( "ab\rc" )
+    wait_key = console.utils.wait_key
+    console.utils.wait_key = lambda: next( terminal )
+    
+    for key in [ Key( keyboard.Key.caps_lock ), Key( "a" ), Key( "x" ), Key( "b" ), Key( keyboard.Key.num_lock ), Key( keyboard.Key.enter ), Key( "c" ) ]:
+        Key.queue.put( key )
+    
+    assert [ Console.read_key().info_str() for _ in range( 4 ) ] == [ "'a'", "'b'", "'enter'", "'c'" ]
+    
+    console.utils.wait_key = wait_key
+    Key.queue.clear()
+    
     Console.setup( "GUI Test" )
     Console.clear()
     Console.set_cursor( 0, 0 )
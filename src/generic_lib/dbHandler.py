@@ -10,10 +10,13 @@ import datetime
 # todo: sanitize parameters of DB altering methods
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Reading():
     date: datetime.date
-    attributes: list[ float | int | None ]
+    attributes: tuple[ float | int | None, ... ]
+    
+    def __post_init__(self) -> None:
+        object.__setattr__( self, "attributes", tuple( self.attributes ) )
     
     def assert_validity(self, attribute_count:int) -> Optional[AssertionError]:
         assert isinstance(self.date, datetime.date), "date is not of type datetime.date"
@@ -31,18 +34,50 @@ class Person:
         assert isinstance( self.move_in, (datetime.date, type(None)) ), "move_in is not of type datetime.time"
         assert isinstance( self.move_out, (datetime.date, type(None)) ), "move_out is not of type datetime.time"
 
+@dataclass(slots=True, unsafe_hash=True)
+class Tariff:
+    """
+    prices of a meter (reading attribute) valid from a given date on until the next tariff of the same meter
+
+    - `base_fee`  : fixed costs per year
+    - `unit_price`: price per consumed unit
+    - `tiers`     : tiered unit prices `( (threshold, price), ... )`, each price applies to the consumption above its threshold
+    """
+    meter     : int
+    valid_from: datetime.date
+    base_fee  : float = 0.0
+    unit_price: float = 0.0
+    tiers     : tuple[ tuple[float, float], ... ] = ()
+    
+    def assert_validity(self, attribute_count:int) -> Optional[AssertionError]:
+        assert isinstance( self.meter, int ) and 0 <= self.meter < attribute_count, f"meter is not an index in [0; {attribute_count})"
+        assert isinstance( self.valid_from, datetime.date ), "valid_from is not of type datetime.date"
+        assert isinstance( self.base_fee, (float, int) ), "base_fee is not of type float | int"
+        assert isinstance( self.unit_price, (float, int) ), "unit_price is not of type float | int"
+        assert all( map( lambda t: len(t) == 2 and all( isinstance(x, (float, int)) for x in t ), self.tiers ) ), "tiers are not of type tuple[ tuple[float, float], ... ]"
+        assert list(self.tiers) == sorted(self.tiers), "tiers are not sorted by their threshold"
+
 class DBSession():
     __attributes_count: int
     __connection: sqlite3.Connection
     __db_path: Path
     
+    __revision: int
+    '''advanced by every connection which changed the database'''
+    __count_hits: int
+    '''connections to the database, i.e. statements which were run'''
+    
     def __init__(self, path_to_db:Path, attributes_count:int ) -> None:
         self.__attributes_count = attributes_count
         self.__db_path = path_to_db
         
+        self.__revision   = 0
+        self.__count_hits = 0
+        
         with self.__connect() as con:
             con.execute( """ CREATE TABLE IF NOT EXISTS readings( date DATE PRIMARY KEY, electricity REAL, gas REAL, water REAL ) """ )
             con.execute( """ CREATE TABLE IF NOT EXISTS persons( nameID TEXT PRIMARY KEY, move_in DATE, move_out DATE ) """ )
+            con.execute( """ CREATE TABLE IF NOT EXISTS tariffs( meter INTEGER, valid_from DATE, base_fee REAL, unit_price REAL, tiers TEXT, PRIMARY KEY (meter, valid_from) ) """ )
 
 
     def add_reading( self, reading: Reading ) -> None:
@@ -65,6 +100,18 @@ class DBSession():
                           person.name )
                         )
     
+    def add_tariff( self, tariff: Tariff ) -> None:
+        tariff.assert_validity( self.__attributes_count )
+        
+        with self.__connect() as con:
+            con.execute( """ INSERT OR REPLACE INTO tariffs(meter, valid_from, base_fee, unit_price, tiers) VALUES (?, ?, ?, ?, ?) """,
+                        ( tariff.meter,
+                          tariff.valid_from,
+                          tariff.base_fee,
+                          tariff.unit_price,
+                          self.__tiers_to_str( tariff.tiers ) )
+                        )
+    
     
     def remove_readings( self, date_low_bound:datetime.date, date_up_bound:datetime.date, *, additional_condition:str=None ) -> None:
         #! todo: sanitize additional_condition!!! if exploited very dangerous
@@ -83,6 +130,10 @@ class DBSession():
                           additional_condition if additional_condition else True )
                         )
     
+    def remove_tariff( self, meter:int, valid_from:datetime.date ) -> None:
+        with self.__connect() as con:
+            con.execute( """ DELETE FROM tariffs WHERE meter=? AND valid_from=? """, ( meter, valid_from ) )
+    
     
     def get_reading_all(self) -> list[ Reading ]:
         with self.__connect() as con:
@@ -109,6 +160,19 @@ class DBSession():
     def get_person_all(self) -> list[ Person ]:
         return self.get_person_where( 'TRUE' )
     
+    
+    def get_tariff_where(self, where:str) -> list[ Tariff ]:
+        #! todo: sanitize where condition!!! if exploited very dangerous
+        with self.__connect() as con:
+            out = con.execute( f""" SELECT * FROM tariffs WHERE {where} ORDER BY meter, valid_from """ ).fetchall()
+            return [ Tariff( t[0], t[1], t[2], t[3], self.__str_to_tiers( t[4] ) ) for t in out ]
+    
+    def get_tariff_all(self) -> list[ Tariff ]:
+        return self.get_tariff_where( 'TRUE' )
+    
+    def get_tariff_of(self, meter:int) -> list[ Tariff ]:
+        return self.get_tariff_where( "meter = %d" % meter )
+    
     def exists_readings(self, date_low_bound:datetime.date, date_up_bound:datetime.date, additional_condition:str=None) -> tuple[ bool, list[ Reading ] ]:
         #! todo: sanitize additional_condition!!! if exploited very dangerous
         entry = self.get_reading_where(
@@ -129,6 +193,14 @@ class DBSession():
         return bool(entry), entry if bool(entry) else None
     
     
+    def get_revision(self) -> int:
+        """ revision of the database content, read results remain valid as long as it does not change """
+        return self.__revision
+    
+    def get_count_hits(self) -> int:
+        """ total count of connections opened for queries and writes """
+        return self.__count_hits
+    
     def ping(self) -> tuple[str, bool]:
         # todo: refactor correct Exception codes
         try:
@@ -138,12 +210,28 @@ class DBSession():
         finally:
             return "Successful connection", True
     
+    @staticmethod
+    def __tiers_to_str( tiers:tuple[ tuple[float, float], ... ] ) -> str:
+        return ';'.join( f"{threshold!r}:{price!r}" for threshold, price in tiers )
+    
+    @staticmethod
+    def __str_to_tiers( tiers:str|None ) -> tuple[ tuple[float, float], ... ]:
+        if not tiers:
+            return ()
+        
+        return tuple( tuple( map( float, t.split(':') ) ) for t in tiers.split(';') )
+    
     @contextmanager
     def __connect(self):
         try:
             self.__connection = sqlite3.connect( self.__db_path.absolute(), detect_types=sqlite3.PARSE_DECLTYPES|sqlite3.PARSE_COLNAMES )
             yield self.__connection
         finally:
+            self.__count_hits += 1
+            
+            if self.__connection.total_changes:
+                self.__revision += 1
+            
             self.__connection.commit()
             self.__connection.close()
 
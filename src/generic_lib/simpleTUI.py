@@ -1,19 +1,24 @@
 from __future__      import annotations
-from collections.abc import Mapping
-from typing          import Self, Protocol, Callable, Sequence, Optional, Literal,\
-                            TypeVar, Final, final, runtime_checkable, overload, Any, ClassVar
-
-from enum     import Enum, auto
-from math     import floor, sqrt
-from datetime import date
-from textwrap import fill
-
+from collections.abc import Mapping, Hashable
+from typing          import Self, Protocol, Callable, Sequence, Iterable, Iterator, Optional, Literal,\
+                            TypeVar, Final, final, runtime_checkable, overload, Any, ClassVar, NamedTuple
+
+from enum      import Enum, auto
+from math      import floor, sqrt
+from datetime  import date
+from textwrap  import fill
+from itertools import islice
+from contextlib import contextmanager
+
+import asyncio
 import inspect
+import sys
 
 
 from generic_lib.logger    import get_logger, logging
-from generic_lib.consoleIO import Console, Key, keyboard, Point, ansilen, Style, STYLE_TYPE
+from generic_lib.consoleIO import Console, Key, keyboard, Point, Style, STYLE_TYPE
 from generic_lib.utils     import *
+from generic_lib.completionIndex import Name_Index, Position_Index, Fuzzy_Index, Sequence_View
 
 from constants import PATH_LOGS
 
@@ -117,6 +122,9 @@ class Result():
 #---------------------#
 # Registerable helper #
 #---------------------#
+rule_stats_t = NamedTuple( "rule_stats_t", [("evaluations", int), ("cached", int)] )
+'''evaluations: calls of rule functions, e.g. database lookups, cached: rule results reused from the memo'''
+
 @final
 @LOGGER.remember_class
 class Register():
@@ -124,26 +132,59 @@ class Register():
     #   ==> Security! It is safer since only objects that call with the correct object instance can set a value for that object. 
     #       YES! It is still possible to get around this barrier, but it is definitely not like to happen on accident
     
-    __id_manager: int = -1
+    # every Manager owns its Register, hence several forms can coexist without sharing any state
+    
+    __data_version: ClassVar[Callable[[], Hashable]] = lambda: None
+    __data_hits   : ClassVar[Callable[[], int]]      = lambda: 0
+    
+    __id_manager: int
 
-    __frames: list[Registerable] = []
+    __frames: list[Registerable]
     
-    __lookup_frames: dict[int, Registerable] = dict()
+    __index_of_name: dict[str, int]
+    '''dict[ name, index ], the first frame of a name'''
+    
+    __lookup_frames: dict[int, Registerable]
     '''dict[ id, registerable_of_id ]'''
     
     
-    __register: dict[int, object] = dict()
+    __register: dict[int, object]
     '''dict[ id, data ]'''
     
-    __rule_set: dict[int, list[tuple[int, object]]] = dict()
+    __rule_set: dict[int, list[tuple[int, object]]]
     '''dict[ id_tx: list[ (id_rx, func) ] ]'''
 
-    __revert_register: dict[int, dict[int, list[str]]] = dict()
+    __revert_register: dict[int, dict[int, list[str]]]
     '''dict[ id_tx: list[ (id_rx, data_list) ] ]'''
     
-
-    @classmethod
-    def set_rule(cls, transceiver:int|str, receiver:int|str, tx_transform_function: Callable[[list[str]], tuple[bool, list[str]]]) -> Register:
+    __deferred: bool
+    
+    __pending: dict[int, None]
+    '''dict[ id_tx: None ], transceivers with deferred rules, the least recently transceived first'''
+    
+    __rule_cache: dict[tuple[Callable, tuple[str, ...]], tuple[Hashable, bool, tuple[str, ...]]]
+    '''dict[ (func, data_tx): (data_version, do_send, data_rx) ]'''
+    
+    __count_evaluations: int
+    __count_cached     : int
+    
+    def __init__(self, manager:Manager) -> None:
+        assert isinstance( manager, Manager ), f"the supplied manager was of type {type(manager)} but MUST be of type Manager"
+        
+        self.__id_manager        = id( manager )
+        self.__frames            = []
+        self.__index_of_name     = dict()
+        self.__lookup_frames     = dict()
+        self.__register          = dict()
+        self.__rule_set          = dict()
+        self.__revert_register   = dict()
+        self.__deferred          = False
+        self.__pending           = dict()
+        self.__rule_cache        = dict()
+        self.__count_evaluations = 0
+        self.__count_cached      = 0
+    
+    def set_rule(self, transceiver:int|str, receiver:int|str, tx_transform_function: Callable[[list[str]], tuple[bool, list[str]]]) -> Register:
         """
         set transceive and receive instructions 
         
@@ -157,10 +198,10 @@ class Register():
         Returns:
             `Register`: monad design
         """
-        foc_tx = cls.__frames[ cls._map_to_index( transceiver ) ]
-        foc_rx = cls.__frames[ cls._map_to_index( receiver ) ]
+        foc_tx = self.__frames[ self._map_to_index( transceiver ) ]
+        foc_rx = self.__frames[ self._map_to_index( receiver ) ]
         
-        test_run = tx_transform_function( foc_tx.get_data() )
+        test_run = self.__evaluate( tx_transform_function, foc_tx.get_data() )
         assert isinstance(test_run, tuple)      \
            and isinstance(test_run[0], bool)    \
            and all( [ isinstance(char, str) for char in test_run[1] ] ), \
@@ -169,60 +210,118 @@ class Register():
         id_tx = id(foc_tx)
         id_rx = id(foc_rx)
         
-        if not id_tx in cls.__rule_set:
-            cls.__rule_set |= { id_tx: [] }
+        if not id_tx in self.__rule_set:
+            self.__rule_set |= { id_tx: [] }
             
-        cls.__rule_set[id_tx].append( (id_rx, tx_transform_function) )
+        self.__rule_set[id_tx].append( (id_rx, tx_transform_function) )
         
         LOGGER.debug(f"new rule {transceiver} -> {receiver}")
-        return cls
+        return self
     
-    @classmethod
-    def transceive(cls, caller_frame:Registerable) -> None:
-        """ transceive to all previously set Focuses where the transceiver is same as the caller_focus, except for the Focus_Manager he can initiate all transceivings """
+    def transceive(self, caller_frame:Registerable) -> None:
+        """
+        transceive to all previously set Focuses where the transceiver is same as the caller_focus, except for the Focus_Manager he can initiate all transceivings
+        
+        while the Register is deferred the rules of a Focus are only marked as pending, see `defer(...)`
+        """
         id_foc = id(caller_frame)
         
-        if id_foc == cls.__id_manager:
-            for id_tx in cls.__rule_set.keys():
-                cls.__transmit_rule( id_tx )
+        if id_foc == self.__id_manager:
+            self.__pending.clear()
+            
+            for id_tx in self.__rule_set.keys():
+                self.__transmit_rule( id_tx )
         
-        elif id_foc in cls.__rule_set:
-            cls.__transmit_rule( id_foc )
+        elif id_foc in self.__rule_set:
+            if self.__deferred:
+                self.__pending.pop( id_foc, None )
+                self.__pending[ id_foc ] = None
+                return
+            
+            self.__transmit_rule( id_foc )
         
     
     @classmethod
-    def revert(cls, caller_frame:Registerable) -> None:
-        """ revert/undo all previously set data-lists of the Focuses where the transceiver is same as the caller_focus, except for the Focus_Manager he can revert all Focuses """
-        id_foc = id(caller_frame)
-        
-        if id_foc == cls.__id_manager:
-            for id_tx in cls.__rule_set.keys():
-                cls.__revert_rule( id_tx )
-            return
-        
-        if id_foc in cls.__rule_set:
-            cls.__revert_rule( id_foc )
+    def set_data_version(cls, data_version:Callable[[], Hashable]) -> None:
+        """
+        results of the rules are memoized per rule and data of the transceiver,
+        they are reused as long as `data_version` returns the same value as when they were evaluated
         
+        e.g. a revision of the database which every write advances, so rules which look up data are only run again if it may have changed.
+        The data version is shared by the Registers of all Managers, by default memoized results are valid as long as their Register exists
+
+        Args:
+            data_version (`() -> Hashable`): returns the current version of the data the rules depend on
+        """
+        cls.__data_version = data_version
     
     @classmethod
-    def reset(cls) -> None:
-        cls.__id_manager      = -1
-        cls.__frames          = []
-        cls.__lookup_frames   = dict()
-        cls.__register        = dict()
-        cls.__rule_set        = dict()
-        cls.__revert_register = dict()
-        LOGGER.info( "rested to default values" )
+    def set_data_hits(cls, data_hits:Callable[[], int]) -> None:
+        """
+        count of accesses to the data the rules depend on, e.g. queries of the database,
+        the Managers log how many of them were made per form
+
+        Args:
+            data_hits (`() -> int`): returns the total count of data accesses so far
+        """
+        cls.__data_hits = data_hits
     
     @classmethod
-    def set_manager(cls, manager:Manager) -> None:
-        assert isinstance( manager, Manager ), f"the supplied manager was of type {type(manager)} but MUST be of type Manager"
-        assert cls.__id_manager == -1, "An manager has already been set"
+    def get_data_hits(cls) -> int:
+        """ total count of data accesses, see `set_data_hits(...)` """
+        return cls.__data_hits()
+    
+    def get_rule_stats(self) -> rule_stats_t:
+        """ evaluations of rule functions, e.g. database lookups, and results served from the memo of this Register """
+        return rule_stats_t( self.__count_evaluations, self.__count_cached )
+    
+    def defer(self, deferred:bool) -> None:
+        """
+        defer the rules transceived by the Focuses instead of carrying them out right away
         
-        cls.__id_manager = id( manager )
+        a pending rule is carried out once by `transceive_next()` or `flush()`, no matter how often it was transceived in between,
+        hence lookups of outdated inputs can be skipped. Leaving the deferred mode discards all pending rules
+
+        Args:
+            deferred (`bool`): whether to defer the rules
+        """
+        self.__deferred = deferred
+        self.__pending.clear()
     
-    @classmethod
-    def append(cls, focus:Registerable) -> None:
+    def has_pending(self) -> bool:
+        return bool( self.__pending )
+    
+    def transceive_next(self) -> None:
+        """ carry out the rules of the least recently transceived Focus with pending rules """
+        if self.__pending:
+            id_tx = next( iter( self.__pending ) )
+            del self.__pending[ id_tx ]
+            
+            self.__transmit_rule( id_tx )
+    
+    def flush(self) -> None:
+        """ carry out all pending rules """
+        while self.__pending:
+            self.transceive_next()
+    
+    
+    def revert(self, caller_frame:Registerable) -> None:
+        """ revert/undo all previously set data-lists of the Focuses where the transceiver is same as the caller_focus, except for the Focus_Manager he can revert all Focuses """
+        id_foc = id(caller_frame)
+        
+        if id_foc == self.__id_manager:
+            self.__pending.clear()
+            
+            for id_tx in self.__rule_set.keys():
+                self.__revert_rule( id_tx )
+            return
+        
+        if id_foc in self.__rule_set:
+            self.__pending.pop( id_foc, None )
+            self.__revert_rule( id_foc )
+        
+    
+    def append(self, focus:Registerable) -> None:
         """
         ! should only be used by `Focus_Manager` !
 
@@ -233,12 +332,13 @@ class Register():
         Args:
             focus (`Focus_Input`): focus
         """
-        cls.__frames.append( focus )
-        cls.__lookup_frames |= { id(focus): focus }
-        cls.__register      |= { id(focus): None }
+        self.__index_of_name.setdefault( focus.get_name(), len(self.__frames) )
+        
+        self.__frames.append( focus )
+        self.__lookup_frames |= { id(focus): focus }
+        self.__register      |= { id(focus): None }
     
-    @classmethod
-    def set( cls, focus:Registerable, data:object ) -> None:
+    def set( self, focus:Registerable, data:object ) -> None:
         """
         ! should only be used by objects and children of `Focus_Input` !
         
@@ -250,10 +350,9 @@ class Register():
             focus (`Focus_Input`): _description_
             data (`object`): _description_
         """
-        cls.__register[ id(focus) ] = data
+        self.__register[ id(focus) ] = data
     
-    @classmethod
-    def get( cls, focus:int|str ) -> object:
+    def get( self, focus:int|str ) -> object:
         """
         ! should only be used by objects and children of `Focus_Input` !
         
@@ -267,48 +366,59 @@ class Register():
         Returns:
             `object`: data in the registry of the specified focus. Defaults to None
         """
-        return cls.__register.get( id(cls.__frames[cls._map_to_index(focus)]), None )
+        return self.__register.get( id(self.__frames[self._map_to_index(focus)]), None )
     
-    @classmethod
-    def info_str(cls) -> str:
-        return '{\n' + '\n'.join( [ f"{k:>10d}: {str(v) if v else ''}" for k, v in cls.__register.items() ] ) + '\n}'
+    def info_str(self) -> str:
+        return '{\n' + '\n'.join( [ f"{k:>10d}: {str(v) if v else ''}" for k, v in self.__register.items() ] ) + '\n}'
     
-    @classmethod
-    def _map_to_index(cls, foc:int|str) -> int:
-        list_of_focus_names = list(map( lambda f: f.get_name(), cls.__frames ))
-        
-        assert isinstance( foc, int ) and 0 <= foc <= len(cls.__frames) or isinstance(foc, str) and foc in list_of_focus_names, f"supplied focus reference (= {foc}) is either of wrong type or incorrect value"
+    def _map_to_index(self, foc:int|str) -> int:
+        assert isinstance( foc, int ) and 0 <= foc < len(self.__frames) or isinstance(foc, str) and foc in self.__index_of_name, f"supplied focus reference (= {foc}) is either of wrong type or incorrect value"
         
-        return foc if isinstance(foc, int) else next( i for i, n in enumerate(list_of_focus_names) if n == foc )
+        return foc if isinstance(foc, int) else self.__index_of_name[foc]
 
-    @classmethod
-    def __transmit_rule(cls, id_tx:int) -> None:
-        assert id_tx in cls.__rule_set.keys(), "The supplied id has no registered rule to transmit"
+    def __transmit_rule(self, id_tx:int) -> None:
+        assert id_tx in self.__rule_set.keys(), "The supplied id has no registered rule to transmit"
         
-        for id_rx, func in cls.__rule_set[id_tx]:
-            foc_tx = cls.__lookup_frames[id_tx]
-            foc_rx = cls.__lookup_frames[id_rx]
+        for id_rx, func in self.__rule_set[id_tx]:
+            foc_tx = self.__lookup_frames[id_tx]
+            foc_rx = self.__lookup_frames[id_rx]
             
-            do_send, data_list_str = func( foc_tx.get_data() )
+            do_send, data_list_str = self.__evaluate( func, foc_tx.get_data() )
             
             if not do_send:
                 return
             
-            if not id_tx in cls.__revert_register:
-                cls.__revert_register |= { id_tx: dict() }
+            if not id_tx in self.__revert_register:
+                self.__revert_register |= { id_tx: dict() }
             
-            if not id_rx in cls.__revert_register[id_tx]:
-                cls.__revert_register[id_tx][id_rx] = foc_rx.get_data()
+            if not id_rx in self.__revert_register[id_tx]:
+                self.__revert_register[id_tx][id_rx] = foc_rx.get_data()
             
             foc_rx.set_data( data_list_str )
 
-    @classmethod
-    def __revert_rule(cls, id_tx:int) -> None:
-        if not id_tx in cls.__revert_register:
+    def __evaluate(self, func:Callable[[list[str]], tuple[bool, list[str]]], data:list[str]) -> tuple[bool, list[str]]:
+        key     = ( func, tuple( data ) )
+        version = Register.__data_version()
+        
+        if key in self.__rule_cache and self.__rule_cache[key][0] == version:
+            self.__count_cached += 1
+            _, do_send, data_rx = self.__rule_cache[key]
+        
+        else:
+            self.__count_evaluations += 1
+            do_send, data_rx = func( data )
+            
+            self.__rule_cache[key] = ( version, do_send, tuple( data_rx ) )
+        
+        # the receiver edits its data list in place, hence it must not share it with the memo
+        return do_send, list( data_rx )
+    
+    def __revert_rule(self, id_tx:int) -> None:
+        if not id_tx in self.__revert_register:
             return
         
-        for id_rx, data in cls.__revert_register.pop(id_tx).items():
-            cls.__lookup_frames[id_rx].set_data( data )
+        for id_rx, data in self.__revert_register.pop(id_tx).items():
+            self.__lookup_frames[id_rx].set_data( data )
 
 @runtime_checkable
 class Registerable( Protocol ):
@@ -344,6 +454,11 @@ class Manager():
     # - keyboard.Key.esc
     # - keyboard.Key.enter
     
+    FRAME_INTERVAL: ClassVar[float] = 1/60
+    '''minimum time in seconds between two frames flushed to the terminal, about the refresh rate of a terminal'''
+    FETCH_DELAY   : ClassVar[float] = 0.05
+    '''time in seconds the input has to rest before the deferred `Register` rules, i.e. the data lookups, are carried out'''
+    
     __frames: list[Frame]
     
     __interactables: list[Interactable]
@@ -363,6 +478,14 @@ class Manager():
     __status: Status
     
     __read_key: Key
+    __cursor  : Point[int]
+    '''cursor position in the area of this Manager, kept while other Managers draw'''
+    
+    __register: Register
+    
+    __fetch_task : asyncio.Task|None
+    __render_task: asyncio.Task|None
+    __last_render: float
     
     def __init__(self, use_enter_key_movement:bool=True, use_up_down_key_movement:bool=False) -> None:
         self.__frames = []
@@ -383,9 +506,13 @@ class Manager():
         self.__status = Status.IDLE
         
         self.__read_key = None
+        self.__cursor   = Point( 0, 0 )
         
-        Register.reset()
-        Register.set_manager( self )
+        self.__fetch_task  = None
+        self.__render_task = None
+        self.__last_render = 0.0
+        
+        self.__register = Register( self )
         
         LOGGER.info( '='*120 )
     
@@ -428,7 +555,7 @@ class Manager():
 
     def append_rule(self, transceiver:int|str, receiver:int|str, tx_transform_function: Callable[[list[str]], tuple[bool, list[str]]]) -> Self:
         """
-        ### Thin wrapper for the Register.set_tx_rx( transceiver_index, receiver_index, tx_transform_function ) classmethod
+        ### Thin wrapper for the Register.set_rule( transceiver_index, receiver_index, tx_transform_function ) method of the Register of this Manager
         
         ---
         
@@ -444,12 +571,30 @@ class Manager():
         Returns:
             `Register`: monad design
         """
-        Register.set_rule( transceiver, receiver, tx_transform_function )
+        self.__register.set_rule( transceiver, receiver, tx_transform_function )
         
         return self
     
     
     def join(self, entry_point_index:int=0) -> Result:
+        # the keys are read by a worker thread, while the frames, the data lookups of the `Register` rules
+        # and the flushes to the terminal are tasks of an event loop in this thread, hence they never run concurrently
+        return asyncio.run( self.run( entry_point_index ) )
+    
+    async def run(self, entry_point_index:int=0, read_key:Callable[[], Key]|None=None) -> Result:
+        """
+        coroutine of `join()`, run the form in the running event loop
+        
+        Managers awaited together, e.g. by `asyncio.gather(...)`, are driven in parallel,
+        each drawing into its own area and keeping its own `Register`
+
+        Args:
+            entry_point_index (`int`, optional): index of the interactable to be focused first. Defaults to 0.
+            read_key (`() -> Key`, optional): blocking source of the keys of this form, called in a worker thread. Defaults to Console.read_key.
+
+        Returns:
+            `Result`: results of the interactables
+        """
         assert self.__frames, "No Interactable Frame objects had been appended"
         assert self.__status == Status.IDLE, "A Manager instance can only be joined once"
         
@@ -460,31 +605,16 @@ class Manager():
         
         self._log_debug()
         
-        with Console.virtual_area( self.__bound_lt, self.__bound_rb ):
-            Console.hide_cursor()
-            
-            self.__render_all_frames()
-            self.__awake_all()
-            
-            self.__active_interactable.enter_via_enter()
-            
-            while True:
-                self.__awake()
-                
-                self.__read_key = Console.get_key()
-                Console.hide_cursor()
-                
-                self.__pre_forward_key()
-                self.__forward_key()
-                
-                if self.__status == Status.COMPLETED\
-                or self.__status == Status.USER_INTERRUPT:
-                    break
-                
-                self.__post_forward_key()
+        cursor_stats = Console.get_cursor_stats()
+        output_stats = Console.get_output_stats()
+        data_hits    = Register.get_data_hits()
         
-        Console.show_cursor()
-        Console.set_cursor( 0, self.__bound_rb[1]+1, absolute=True )
+        count_frames = await self.__loop( read_key or Console.read_key )
+        
+        reads, queries   = ( now - before for now, before in zip( Console.get_cursor_stats(), cursor_stats ) )
+        written, flushes = ( now - before for now, before in zip( Console.get_output_stats(), output_stats ) )
+        LOGGER.info( f"finished after {count_frames} frames with {reads/count_frames:.1f} cursor reads, {queries/count_frames:.1f} terminal queries, {written/count_frames:.0f} characters written and {flushes/count_frames:.1f} flushes per frame" )
+        LOGGER.info( "rules evaluated {:d} times, {:d} results reused, {:d} data hits".format( *self.__register.get_rule_stats(), Register.get_data_hits() - data_hits ) )
         
         LOGGER.info("finished: returning results")
         
@@ -493,6 +623,11 @@ class Manager():
     def get_result(self) -> Result:
         return Result( self.__status == Status.COMPLETED, { f.get_name(): f.result() for f in self.__interactables_no_confirm } )
     
+    @property
+    def register(self) -> Register:
+        """ `Register` holding the data and rules of the Registerables of this Manager """
+        return self.__register
+    
     
     def get_bbox(self) -> tuple[ tuple[int, int], tuple[int, int] ]:
         return (self.__bound_lt.T, self.__bound_rb.T)
@@ -545,7 +680,7 @@ class Manager():
         return self
     
     def __append_Registerable(self, _o:Registerable, /) -> Self:
-        Register.append( _o )
+        self.__register.append( _o )
         return self
     
     def __append_confirmation_focus(self, _o:Confirmation, /) -> Self:
@@ -628,6 +763,123 @@ class Manager():
     #---------------------#
     # general loop stuffs #
     #---------------------#
+    async def __loop(self, read_key:Callable[[], Key]) -> int:
+        loop = asyncio.get_running_loop()
+        count_frames = 0
+        
+        self.__register.defer( True )
+        
+        try:
+            # the transaction holds the output back until the next throttled flush
+            with Console.transaction():
+                with self.__drawing():
+                    self.__render_all_frames()
+                    self.__awake_all()
+                    
+                    self.__active_interactable.enter_via_enter()
+                    self.__awake()
+                
+                self.__request_render()
+                
+                while True:
+                    count_frames += 1
+                    
+                    self.__read_key = await loop.run_in_executor( None, read_key )
+                    
+                    # the new key supersedes the lookups of the previous input which have not been carried out yet
+                    self.__settle( self.__fetch_task )
+                    
+                    with self.__drawing():
+                        self.__pre_forward_key()
+                        self.__forward_key()
+                        
+                        if self.__status == Status.COMPLETED\
+                        or self.__status == Status.USER_INTERRUPT:
+                            break
+                        
+                        active_interactable = self.__active_interactable
+                        self.__post_forward_key()
+                        
+                        # the next interactable must not show data which is still about to be transmitted to it
+                        if self.__active_interactable is not active_interactable:
+                            self.__register.flush()
+                        
+                        self.__awake()
+                    
+                    self.__request_fetch()
+                    self.__request_render()
+                
+                Console.show_cursor()
+                Console.set_cursor( 0, self.__bound_rb[1]+1, absolute=True )
+        
+        finally:
+            self.__settle( self.__fetch_task )
+            self.__settle( self.__render_task )
+            self.__register.defer( False )
+        
+        return count_frames
+    
+    @contextmanager
+    def __drawing(self):
+        """
+        draw a frame off-screen into the area of this Manager, only the cells it changed are written to the terminal
+        
+        the area is never entered across an await, hence Managers running in the same event loop do not disturb each other
+        """
+        with Console.buffered():
+            with Console.virtual_area( self.__bound_lt, self.__bound_rb, reset_cursor_on_exit=False ):
+                Console.set_cursor( self.__cursor )
+                Console.hide_cursor()
+                
+                try:
+                    yield
+                finally:
+                    self.__cursor = Console.get_cursor()
+    
+    def __request_fetch(self) -> None:
+        if self.__register.has_pending():
+            self.__fetch_task = asyncio.create_task( self.__fetch() )
+    
+    async def __fetch(self) -> None:
+        await asyncio.sleep( self.FETCH_DELAY )
+        
+        while self.__register.has_pending():
+            with self.__drawing():
+                self.__register.transceive_next()
+                self.__awake()
+            
+            self.__request_render()
+            
+            # the lookups are synchronous, hence a new key can only cancel the remaining ones
+            await asyncio.sleep( 0 )
+    
+    def __request_render(self) -> None:
+        if self.__render_task and not self.__render_task.done():
+            return
+        
+        self.__render_task = asyncio.create_task( self.__render() )
+    
+    async def __render(self) -> None:
+        # frames drawn until the next refresh of the terminal are flushed together
+        loop = asyncio.get_running_loop()
+        
+        await asyncio.sleep( self.__last_render + self.FRAME_INTERVAL - loop.time() )
+        
+        Console.commit()
+        self.__last_render = loop.time()
+    
+    @staticmethod
+    def __settle(task:asyncio.Task|None) -> None:
+        """ cancel the task if it is still pending, otherwise raise the exception it may have failed with """
+        if task is None or task.cancelled():
+            return
+        
+        if task.done():
+            task.result()
+            return
+        
+        task.cancel()
+    
     def __pre_forward_key(self) -> None:
         # prefilter input key
         
@@ -674,6 +926,9 @@ class Manager():
         fmt = "\t{:>%ds} | {:>%ds} | {:s}, {:s}\n" % ( max_width_of_strings( [x.get_name() for x in self.__interactables_no_confirm] )[1], max_width_of_strings( [s.name for s in Status] )[1] )
         debug_msg = f"Checking statuses: current internal status: {self.__status}\n"
         
+        # the results must include the data of all rules
+        self.__register.flush()
+        
         if self.__status == Status.USER_INTERRUPT:
             LOGGER.debug( debug_msg + "=== INTERRUPT-ESC KEY ===" )
             return True
@@ -730,7 +985,7 @@ class Manager():
         
         success, res = self.__active_interactable.get_parsed_data()
         if success:
-            Register.set( self.__active_interactable, res )
+            self.__register.set( self.__active_interactable, res )
 
     def __awake(self) -> None:
         self.__active_interactable.clear()
@@ -738,7 +993,7 @@ class Manager():
         self.__active_interactable.awake()
 
     def __awake_all(self) -> None:
-        Register.transceive( self )
+        self.__register.transceive( self )
         for focus in self.__interactables:
             self.__active_interactable = focus
             self.__awake()
@@ -895,7 +1150,7 @@ class Input( Interactable, Registerable ):
         self.pos_validate = Point(0, 0)
         
         self.name = prompt_name
-        self.formatted_name = ("{:>%ds}" % ansilen(self.name)).format( self.name ) + CONFIG.DELIMITER
+        self.formatted_name = ("{:>%ds}" % printable_len(self.name)).format( self.name ) + CONFIG.DELIMITER
         
         self.status       = Status.IDLE
         self.input_size   = max( 0, input_size )
@@ -1028,7 +1283,7 @@ class Input( Interactable, Registerable ):
                 self.data[self.data_ptr] = ch
                 self.data_ptr = min( self.data_ptr+1, self.input_size )
 
-        Register.transceive(self)
+        self.manager.register.transceive(self)
     
     
     def render(self) -> None:
@@ -1142,7 +1397,7 @@ class Input( Interactable, Registerable ):
     #-----------------------#
     @final
     def get_required_name_size(self) -> int:
-        return ansilen( self.formatted_name )
+        return printable_len( self.formatted_name )
     @final
     def get_required_dimensions(self) -> Point[int]:
         return self.cursor( get_max_position=True )
@@ -1156,7 +1411,7 @@ class Input( Interactable, Registerable ):
     
     @final
     def set_offsets(self, name_format_shift:int, validate:Optional[tuple[int, int]]=None) -> None:
-        self.formatted_name = ("{:>%ds}" % max( 0, name_format_shift - ansilen(CONFIG.DELIMITER) )).format( self.name ) + CONFIG.DELIMITER
+        self.formatted_name = ("{:>%ds}" % max( 0, name_format_shift - printable_len(CONFIG.DELIMITER) )).format( self.name ) + CONFIG.DELIMITER
         self.pos_input = self.position + ( self.get_required_name_size(), 0 )
         
         pos_valid_off     = validate if validate else ( self.cursor( get_max_position=True ).col + CONFIG.SIZE_TAB, 0 )
@@ -1186,11 +1441,13 @@ class Date( Input ):
     
     in_select_mode: bool
     select_index  : int
-    select_dates  : list[date]
+    select_dates  : Sequence[list[str]]
 
     must_be_listed: bool
     
     dates: list[str]
+    date_index: Position_Index
+    '''formatted preset dates by the digit at each position, built with the input so the first Tab is as fast as the following'''
     
     def __init__(
                  self,
@@ -1214,6 +1471,7 @@ class Date( Input ):
         
         self.must_be_listed = must_be_listed
         self.dates = preset_dates
+        self.date_index = Position_Index( format_date( d, self.DATE_FORMAT ) for d in self.dates )
     
     def render_foreground(self) -> None:
         Console.write_at( self.DATE_DELIMITER, Point(2, 0), False )
@@ -1253,10 +1511,10 @@ class Date( Input ):
 
                 # is select_index at the original user input
                 if self.select_index == len(self.select_dates)-1:
-                    Register.revert(self)
+                    self.manager.register.revert(self)
                     return
                 
-                Register.transceive(self)
+                self.manager.register.transceive(self)
             
             case Key( np=None, an=ch ) if ch.isdigit():
                 self.in_select_mode = False
@@ -1278,17 +1536,9 @@ class Date( Input ):
         # select all dates that have the same digits at the same locations like the user pre-typed input
         # e.g:  user writes: __.12.___
         #       select all dates from the preset_dates list that are in December
-        self.select_dates = [
-            list( d.strftime( self.DATE_FORMAT ) )
-            for d 
-            in self.dates
-            if all(
-                    map( # skip empty characters of self.data or compare the characters of a pair
-                        lambda chrs: chrs[0] == chrs[1] or not chrs[1], 
-                        zip( list(d.strftime( self.DATE_FORMAT )), self.data ) # pair up all characters of d and self.data
-                    )
-                )
-            ] + [ self.data ]
+        matches = self.date_index.matching( self.data )
+        
+        self.select_dates = Sequence_View( list, ( matches, 0, len(matches) ), ( [ self.data ], 0, 1 ) )
     
     def enter_via_enter(self) -> None:
         super().enter_via_arrow( *(self.pos_input + self.cursor(len( stringify( self.data ) ))) )
@@ -1303,11 +1553,13 @@ class Date_no_day( Input ):
     
     in_select_mode: bool
     select_index  : int
-    select_dates  : list[date]
+    select_dates  : Sequence[list[str]]
 
     must_be_listed: bool
     
     dates: list[str]
+    date_index: Position_Index
+    '''formatted preset dates by the digit at each position, built with the input so the first Tab is as fast as the following'''
     
     def __init__(
                  self,
@@ -1331,6 +1583,7 @@ class Date_no_day( Input ):
         
         self.must_be_listed = must_be_listed
         self.dates = preset_dates
+        self.date_index = Position_Index( format_date( d, self.DATE_FORMAT ) for d in self.dates )
     
     def render_foreground(self) -> None:
         Console.write_at( self.DATE_DELIMITER, Point(2, 0), False )
@@ -1369,10 +1622,10 @@ class Date_no_day( Input ):
 
                 # is select_index at the original user input
                 if self.select_index == len(self.select_dates)-1:
-                    Register.revert(self)
+                    self.manager.register.revert(self)
                     return
                 
-                Register.transceive(self)
+                self.manager.register.transceive(self)
             
             case Key( np=None, an=ch ) if ch.isdigit():
                 self.in_select_mode = False
@@ -1394,17 +1647,9 @@ class Date_no_day( Input ):
         # select all dates that have the same digits at the same locations like the user pre-typed input
         # e.g:  user writes: __.12.___
         #       select all dates from the preset_dates list that are in December
-        self.select_dates = [
-            list( d.strftime( self.DATE_FORMAT ) )
-            for d 
-            in self.dates
-            if all(
-                    map( # skip empty characters of self.data or compare the characters of a pair
-                        lambda chrs: chrs[0] == chrs[1] or not chrs[1], 
-                        zip( list(d.strftime( self.DATE_FORMAT )), self.data ) # pair up all characters of d and self.data
-                    )
-                )
-            ] + [ self.data ]
+        matches = self.date_index.matching( self.data )
+        
+        self.select_dates = Sequence_View( list, ( matches, 0, len(matches) ), ( [ self.data ], 0, 1 ) )
     
     def enter_via_enter(self) -> None:
         super().enter_via_arrow( *(self.pos_input + self.cursor(len( stringify( self.data ) ))) )
@@ -1552,11 +1797,17 @@ class Name( String ):
     in_select_mode: bool
     select_prefix : str
     select_index  : int
-    select_names  : list[str]
+    select_names  : Sequence[list[str]]
 
     must_be_listed: bool
     
     names: list[str]
+    name_index: Name_Index
+    '''canonical preset names for prefix and infix completion, built with the input so the first Tab is as fast as the following'''
+    
+    dropdown   : Dropdown|None
+    '''lists the preset names most similar to the typed name, see `set_dropdown(...)`'''
+    fuzzy_index: Fuzzy_Index|None
     
     def __init__( 
                  self,
@@ -1576,6 +1827,10 @@ class Name( String ):
         self.must_be_listed = must_be_listed
         
         self.names = list( map( self.normalize, preset_names ) )
+        self.name_index = Name_Index( self.names, self.canonicalize )
+        
+        self.dropdown    = None
+        self.fuzzy_index = None
     
     def forward_key(self, key: Key) -> None:
         match key:
@@ -1588,13 +1843,25 @@ class Name( String ):
 
                 self.data = self.select_names[self.select_index]
                 self.enter_via_enter() # set cursor to the right position of the selected name
+                
+                if self.dropdown:
+                    self.dropdown.select( self.select_index )
 
-                Register.transceive(self)
+                self.manager.register.transceive(self)
 
             case _:
                 self.in_select_mode = False
         
                 super().forward_key(key)
+                
+                if self.dropdown:
+                    self.suggest()
+    
+    def render(self) -> None:
+        super().render()
+        
+        if self.dropdown:
+            self.dropdown.render()
     
     def transform(self) -> object:
         return self.normalize( stringify(self.data) )
@@ -1607,15 +1874,33 @@ class Name( String ):
         self.select_prefix  = stringify(self.data)
         self.select_index   = -1
         
-        prefix = self.canonicalize( self.select_prefix )
+        if self.dropdown:
+            # only the names listed by the dropdown
+            matches = self.dropdown.matches
+        
+        else:
+            # names starting with the typed prefix first, then the names containing it elsewhere
+            matches = self.name_index.complete( self.select_prefix )
         
-        none_leading = filter( lambda n: ( n:=self.canonicalize(n), prefix in n and not n.startswith( prefix ) )[1], self.names )
-        leading      = filter( lambda n: ( n:=self.canonicalize(n),                     n.startswith( prefix ) )[1], self.names )
+        self.select_names = Sequence_View( lambda n: self.right_fill( list(n) ), ( matches, 0, len(matches) ), ( [ self.select_prefix ], 0, 1 ) )
+    
+    def set_dropdown(self, dropdown:Dropdown) -> None:
+        """
+        ! should only be used by `Dropdown` !
         
-        leading      = sorted( leading )
-        none_leading = sorted( none_leading )
+        the `dropdown` lists the preset names most similar to the typed name, Tab cycles through these instead of all matching names
+
+        Args:
+            dropdown (`Dropdown`): frame listing the ranked names
+        """
+        self.dropdown    = dropdown
+        self.fuzzy_index = Fuzzy_Index( self.names, self.canonicalize )
         
-        self.select_names = [ self.right_fill( list(n) ) for n in leading + none_leading + [self.select_prefix] ]
+        self.suggest()
+    
+    def suggest(self) -> None:
+        """ rank the preset names by their trigram similarity to the typed name and list the best ones in the dropdown """
+        self.dropdown.show( self.fuzzy_index.rank( stringify(self.data), self.dropdown.count ) )
     
     def predicate(self, transformed_data: str) -> bool:
         return (transformed_data in self.names) if (self.must_be_listed) else (bool(transformed_data))
@@ -1628,6 +1913,237 @@ class Name( String ):
     def canonicalize(cls, name:str ) -> str:
         return cls.normalize( name ).lower()
 
+@LOGGER.remember_class
+class Dropdown( Frame ):
+    """
+    compact list of the preset names of a `Name` which are most similar to the typed name, instead of a table of all names
+    
+    The names are ranked by their trigram similarity, see `Fuzzy_Index`, and ranked again with every key typed into the `Name`.
+    Tab and Shift+Tab of the `Name` cycle through the listed names, the selected one is marked.
+    
+    Append the `Dropdown` to the `Manager` right after its `Name`, the names are aligned with the input of the `Name`
+    """
+    MARK: Final[str] = "> "
+    
+    name_input: Name
+    count     : int
+    '''count of listed names, i.e. the height of the frame'''
+    
+    matches : list[str]
+    selected: int
+    '''index of the marked name, -1 if none is selected'''
+    
+    def __init__(self, name_input:Name, count:int=5) -> None:
+        self.position = Point( 0, 0 )
+        self.bounding = Point( len(self.MARK) + name_input.input_size - 1, count - 1 )
+        
+        self.name_input = name_input
+        self.count      = count
+        self.matches    = []
+        self.selected   = -1
+        
+        name_input.set_dropdown( self )
+    
+    def show(self, matches:list[str]) -> None:
+        self.matches  = matches
+        self.selected = -1
+    
+    def select(self, index:int) -> None:
+        self.selected = index
+    
+    def render(self) -> None:
+        col   = max( 0, self.name_input.pos_input.col - len(self.MARK) )
+        width = len(self.MARK) + self.name_input.input_size
+        
+        for i in range( self.count ):
+            mark = self.MARK if i == self.selected else ' ' * len(self.MARK)
+            line = mark + self.matches[i] if i < len(self.matches) else ''
+            
+            Console.write_at( line.ljust( width )[:width], Point( col, self.position.line + i ), True )
+
+
+#-------------#
+# Pager Frame #
+#-------------#
+@LOGGER.remember_class
+class Pager( Interactable ):
+    """
+    scrollable view of a long text whose lines are generated lazily
+    
+    only the visible window of `height` lines is rendered, hence the cost of a render does not depend on the length of the text.
+    Lines are pulled from the source when they are scrolled into view for the first time and are kept afterwards.
+    
+    ---
+    Keys:
+    - `up`, `down`: scroll by one line
+    - `page_up`, `page_down`: scroll by one page
+    - `home`, `end`: jump to the first resp. last page
+    - digits: jump to the date typed as `YYYY[MM[DD]]` via the `locate_date` callback, `backspace` removes the last digit
+    """
+    # cspell:disable
+    MSG_STATUS  : Final[str] = "Zeilen {:d}-{:d} von {:s}  |  Bild auf/ab, Pos1, Ende  |  Datum (JJJJMMTT): {:s}"
+    # cspell:enable
+    DATE_DIGITS : Final[int] = 8
+    
+    name  : str
+    width : int
+    height: int
+    
+    lines : list[str]
+    source: Optional[Iterator[str]]
+    '''remaining lines to be pulled, `None` once exhausted'''
+    
+    top: int
+    '''index of the first visible line'''
+    
+    locate_date: Optional[Callable[[date], int]]
+    date_digits: list[str]
+    
+    def __init__(
+                 self,
+                 name       : str,
+                 lines      : Iterable[str],
+                 height     : int,
+                 width      : Optional[int] = None,
+                 locate_date: Optional[Callable[[date], int]] = None
+                 ) -> None:
+        """
+        Args:
+            name (`str`): name of the pager
+            lines (`Iterable[str]`): lines of the text, may be a generator
+            height (`int`): count of visible lines, the status line is placed below
+            width (`Optional[int]`, optional): width of the view, wider lines are cut off. Defaults to the widest line of the first page.
+            locate_date (`Optional[Callable[[date], int]]`, optional): maps a date to the index of the line to jump to. Defaults to None, i.e. jumping to dates is disabled.
+        """
+        self.name   = name
+        self.height = max( 1, height )
+        
+        self.lines  = []
+        self.source = iter( lines )
+        
+        self.top = 0
+        
+        self.locate_date = locate_date
+        self.date_digits = []
+        
+        self.status = Status.IDLE
+        
+        self._fetch( self.height )
+        self.width = width if width is not None else max( map( len, self.lines ), default=0 )
+        
+        self.position = Point( 0, 0 )
+        self.bounding = Point( self.width-1, self.height )
+    
+    #------------------#
+    # internal helpers #
+    #------------------#
+    def _fetch(self, count:int) -> None:
+        """ pull lines from the source until at least `count` lines are available or the source is exhausted """
+        if self.source is None or count <= len(self.lines):
+            return
+        
+        self.lines.extend( islice( self.source, count - len(self.lines) ) )
+        
+        if len(self.lines) < count:
+            self.source = None
+    
+    def _scroll_to(self, top:int) -> None:
+        self._fetch( top + self.height )
+        self.top = max( 0, min( top, len(self.lines) - self.height ) )
+    
+    def _jump_to_typed_date(self) -> None:
+        digits = stringify( self.date_digits )
+        
+        if self.locate_date is None or len(digits) < 4:
+            return
+        
+        try:
+            day = date( int(digits[:4]), int(digits[4:6]) if len(digits) >= 6 else 1, int(digits[6:8]) if len(digits) >= 8 else 1 )
+        except ValueError:
+            return
+        
+        self._scroll_to( self.locate_date( day ) )
+    
+    def status_line(self) -> str:
+        total = str( len(self.lines) ) if self.source is None else "?"
+        typed = stringify( self.date_digits ).ljust( self.DATE_DIGITS, CONFIG.PLACE_HOLDER )
+        
+        return self.MSG_STATUS.format( self.top+1, min( self.top + self.height, len(self.lines) ), total, typed )
+    
+    #########################
+    # Override Interactable #
+    #########################
+    def awake(self) -> None:
+        Console.hide_cursor()
+    
+    def clear(self, *, force:bool=False) -> None:
+        # `render` overwrites the whole area anyway
+        if force:
+            super().clear(force=True)
+    
+    def render(self) -> None:
+        window = self.lines[ self.top : self.top + self.height ]
+        window += [ '' ] * ( self.height - len(window) )
+        
+        Console.write_in( '\n'.join( [ line[:self.width] for line in window ] + [ self.status_line()[:self.width] ] ), self.position, self.bounding )
+    
+    def forward_key(self, key: Key) -> None:
+        match key:
+            case Key( np=keyboard.Key.up ):
+                self._scroll_to( self.top - 1 )
+            
+            case Key( np=keyboard.Key.down ):
+                self._scroll_to( self.top + 1 )
+            
+            case Key( np=keyboard.Key.page_up ):
+                self._scroll_to( self.top - self.height )
+            
+            case Key( np=keyboard.Key.page_down ):
+                self._scroll_to( self.top + self.height )
+            
+            case Key( np=keyboard.Key.home ):
+                self._scroll_to( 0 )
+            
+            # the only key that has to pull all remaining lines
+            case Key( np=keyboard.Key.end ):
+                self._fetch( sys.maxsize )
+                self._scroll_to( len(self.lines) )
+            
+            case Key( np=keyboard.Key.backspace ):
+                if self.date_digits:
+                    self.date_digits.pop()
+                self._jump_to_typed_date()
+            
+            case Key( np=None, an=ch ) if ch.isdigit() and len(self.date_digits) < self.DATE_DIGITS:
+                self.date_digits.append( ch )
+                self._jump_to_typed_date()
+        
+        self.render()
+    
+    def validate(self) -> None:
+        self.status = Status.COMPLETED
+    
+    def result(self) -> int:
+        return self.top
+    
+    def enter_via_arrow(self, cursor_col:int, cursor_line:int) -> None:
+        pass
+    
+    def enter_via_enter(self) -> None:
+        pass
+    
+    def set_offsets(self, name_format_shift:int, validate:Optional[tuple[int, int]]=None) -> None:
+        pass
+    
+    def get_name(self) -> str:
+        return self.name
+    
+    def get_required_name_size(self) -> int:
+        return 0
+    
+    def get_required_dimensions(self) -> Point[int]:
+        return Point( *self.get_dimensions() )
+
 
 #-------------------------------------#
 # Button and Button Management Frames #
@@ -1727,10 +2243,10 @@ class Button( Frame ):
         else:
             middle = f"{line_v}{filler*self.inner_spacing.col}{self.prompt_name}{filler*self.inner_spacing.col}{line_v}"
 
-        middle_filler = f"{line_v}{filler*(2*self.inner_spacing.col+ansilen(self.prompt_name))}{line_v}"
+        middle_filler = f"{line_v}{filler*(2*self.inner_spacing.col+printable_len(self.prompt_name))}{line_v}"
         
-        bound_top    = bound_top    % ( line_h*(ansilen(middle)-(ansilen(c_lt)+ansilen(c_rt))) )
-        bound_bottom = bound_bottom % ( line_h*(ansilen(middle)-(ansilen(c_lb)+ansilen(c_rb))) )
+        bound_top    = bound_top    % ( line_h*(printable_len(middle)-(printable_len(c_lt)+printable_len(c_rt))) )
+        bound_bottom = bound_bottom % ( line_h*(printable_len(middle)-(printable_len(c_lb)+printable_len(c_rb))) )
         
         return [
             bound_top,
@@ -2235,8 +2751,9 @@ class Button_Manager( Interactable ):
             super().clear(force=True)
     
     def render(self) -> None:
-        while self.need_render_update:
-            self.button_flattened[ self.need_render_update.pop(0) ].render()
+        with Console.transaction():
+            while self.need_render_update:
+                self.button_flattened[ self.need_render_update.pop(0) ].render()
     
     def forward_key(self, key: Key) -> None:
         match key:
@@ -2547,5 +3064,80 @@ if __name__ == "__main__":
     #     Console.write_at( [*result], 4, 2, False )
     #     Console.set_cursor( 0, 3, False )
     
+    # Self-check parallel Managers ===================================================================================
+    # two forms run in the same event loop, each with its own keys, area and Register
+    from time import sleep
+    
+    def replayer( replay:list[str|keyboard.Key] ) -> Callable[[], Key]:
+        keys = iter( map( Key, replay ) )
+        
+        def read_key() -> Key:
+            sleep( 0.02 ) # lets the keys of both forms interleave
+            return next( keys )
+        
+        return read_key
+    
+    def copy_name( name:list[str] ) -> tuple[bool, list[str]]:
+        copy = list( ''.join( name ).upper() )
+        return True, copy + [''] * ( len(name) - len(copy) )
+    
+    async def run_parallel() -> tuple[Result, Result]:
+        forms = [
+            Manager( True, True ).set_position_left_top( 4, 1 + 3*i )
+                .append( String( "Name", True ) )
+                .append( String( "Copy", True ) )
+                .append_rule( "Name", "Copy", copy_name )
+            for i in range( 2 )
+        ]
+        
+        assert forms[0].register is not forms[1].register
+        
+        return await asyncio.gather(
+            forms[0].run( read_key=replayer( [ *"Anna", keyboard.Key.enter, keyboard.Key.enter ] ) ),
+            forms[1].run( read_key=replayer( [ *"Bernd", keyboard.Key.enter, keyboard.Key.enter ] ) )
+        )
+    
+    Console.clear()
+    
+    result_a, result_b = asyncio.run( run_parallel() )
+    
+    assert result_a.success and [ *result_a ] == [ "Anna",  "ANNA"  ], result_a
+    assert result_b.success and [ *result_b ] == [ "Bernd", "BERND" ], result_b
+    
+    # Benchmark cursor round trips, output and lookups ===============================================================
+    # replays a fixed key sequence into a Manager, every cursor read used to be a blocking round trip to the terminal,
+    # every frame used to rewrite all of its interactables and every key used to run the lookup of the date
+    replay = [ *"15032024", keyboard.Key.enter, *"123.4", keyboard.Key.enter, *"Name", keyboard.Key.backspace, keyboard.Key.enter ]
+    keys   = iter( map( Key, replay ) )
+    Console.read_key = lambda: next( keys )
+    
+    lookups: list[str] = []
+    
+    def slow_lookup( date_:list[str] ) -> tuple[bool, list[str]]:
+        # stands in for a database query like `TX_func_factory.date_2_value`
+        lookups.append( ''.join( date_ ) )
+        sleep( 0.01 )
+        return False, [''] * 6
+    
+    Register.set_data_hits( lambda: len( lookups ) )
+    
+    Console.clear()
+    Console.reset_cursor_stats()
+    Console.reset_output_stats()
+    
+    FM = Manager( True, True ).set_position_left_top( 4, 1 )
+    
+    FM\
+        .append( Date ( "Date" , True, "" ) )\
+        .append( Value( "Value", True, None, digit_layout_t(3, 3) ) )\
+        .append( String( "Name", True ) )\
+        .append_rule( "Date", "Value", slow_lookup )\
+        .join()
+    
+    reads, queries   = Console.get_cursor_stats()
+    written, flushes = Console.get_output_stats()
+    _, cached        = FM.register.get_rule_stats()
+    Console.write_line( f"{len(replay)} frames: {reads/len(replay):6.1f} cursor reads, {queries/len(replay):6.1f} terminal queries, {written/len(replay):8.1f} characters written, {flushes/len(replay):6.1f} flushes per frame, {len(lookups)} lookups, {cached} reused" )
+    
     
     Console.stop()
\ No newline at end of file
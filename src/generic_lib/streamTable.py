@@ -0,0 +1,283 @@
+from typing    import Iterable, Iterator, Sequence
+from itertools import chain
+from math      import isinf, isnan
+
+import re
+
+
+# minimum padding `tabulate` adds to the width of a header
+MIN_PADDING: int = 2
+
+# line layouts as ( begin, fill, separator, end ), `None` if the format does not draw that line
+_TABLE_FORMATS: dict[str, dict[str, tuple[str, str, str, str]|None]] = {
+    "grid": {
+        "line_above"        : ( "+", "-", "+", "+" ),
+        "line_below_header" : ( "+", "=", "+", "+" ),
+        "line_between_rows" : ( "+", "-", "+", "+" ),
+        "line_below"        : ( "+", "-", "+", "+" ),
+    },
+    "psql": {
+        "line_above"        : ( "+", "-", "+", "+" ),
+        "line_below_header" : ( "|", "-", "+", "|" ),
+        "line_between_rows" : None,
+        "line_below"        : ( "+", "-", "+", "+" ),
+    },
+}
+
+TABLE_FORMATS: tuple[str, ...] = tuple( _TABLE_FORMATS )
+
+# numbers like "1,000.5" count as numeric for the decimal alignment as well
+_THOUSANDS_SEPARATED = re.compile( r"^(([+-]?[0-9]{1,3})(?:,([0-9]{3}))*)?(?(1)\.[0-9]*|\.[0-9]+)?$" )
+
+
+#-----------#
+#  helpers  #
+#-----------#
+
+def header_width( header:str ) -> int:
+    """
+    width `tabulate` reserves for a (multiline) header, i.e. its widest line plus `MIN_PADDING`
+    
+    Args:
+        header (`str`): header of a column
+    
+    Returns:
+        `int`: minimum width of the column in characters
+    """
+    return max( map( len, header.split( '\n' ) ) ) + MIN_PADDING
+
+def column_widths( headers:Sequence[str], cell_widths:Sequence[int] ) -> list[int]:
+    """
+    widths of the columns as `tabulate` would choose them,
+    given the widest (stripped) line any cell of each column can have
+    
+    Args:
+        headers (`Sequence[str]`): headers of the columns
+        cell_widths (`Sequence[int]`): widest possible line of a cell per column
+    
+    Returns:
+        `list[int]`: width of each column excluding the padding
+    """
+    return [ max( header_width( h ), w ) for h, w in zip( headers, cell_widths ) ]
+
+def table_width( colwidths:Sequence[int] ) -> int:
+    """
+    width of each line of a table rendered by `stream_table(...)`
+    
+    Args:
+        colwidths (`Sequence[int]`): width of each column excluding the padding
+    
+    Returns:
+        `int`: width of the table in characters
+    """
+    # "| " + " | ".join( cells ) + " |"
+    return sum( colwidths ) + 3 * len( colwidths ) + 1
+
+def table_height( headers:Sequence[str], count_rows:int, lines_per_row:int, tablefmt:str = "grid" ) -> int:
+    """
+    count of lines of a table rendered by `stream_table(...)` whose rows all span the same count of lines
+    
+    Args:
+        headers (`Sequence[str]`): (multiline) headers of the columns
+        count_rows (`int`): count of rows
+        lines_per_row (`int`): count of lines of every row
+        tablefmt (`str`, optional): one of `TABLE_FORMATS`. Defaults to "grid".
+    
+    Returns:
+        `int`: count of lines of the table
+    """
+    separators = max( 0, count_rows - 1 ) if _TABLE_FORMATS[ tablefmt ]["line_between_rows"] else 0
+    
+    return 1 + max( h.count( '\n' ) + 1 for h in headers ) + 1 + count_rows * lines_per_row + separators + 1
+
+def cell_widths( rows:Sequence[Sequence[str]], colalign:Sequence[str], max_decimals:Sequence[int]|None = None ) -> list[int]:
+    """
+    measure the widest line of the cells of each column, as `tabulate` would after stripping resp. decimal alignment
+    
+    intended for short tables whose rows are already materialized,
+    long tables should derive their widths from their known cell layouts instead
+    
+    Args:
+        rows (`Sequence[Sequence[str]]`): rows of (multiline) cells
+        colalign (`Sequence[str]`): `left`, `center`, `right` or `decimal` for each column
+        max_decimals (`Sequence[int]|None`, optional): see `stream_table(...)`. Defaults to None.
+    
+    Returns:
+        `list[int]`: widest line of a cell per column, 0 for columns without any content
+    """
+    max_decimals = max_decimals or [ -1 ] * len( colalign )
+    widths       = [ 0 ] * len( colalign )
+    
+    for row in rows:
+        for k, cell in enumerate( row ):
+            if colalign[k] == "decimal":
+                cell += ' ' * ( max_decimals[k] - decimal_places( cell ) )
+            else:
+                cell = cell.strip()
+            
+            widths[k] = max( widths[k], *map( len, cell.split( '\n' ) ) )
+    
+    return widths
+
+def decimal_places( s:str ) -> int:
+    """
+    count of symbols after the decimal point of a numeric string, -1 if there is none or if `s` is not numeric
+    
+    mirrors the `decimal` alignment rules of `tabulate`
+    
+    Args:
+        s (`str`): cell content
+    
+    Returns:
+        `int`: count of decimal places
+    """
+    if not s or s.isspace():
+        return -1
+    
+    try:
+        value   = float( s )
+        numeric = not ( isinf( value ) or isnan( value ) ) or s.lower() in ( "inf", "-inf", "nan" )
+    except ValueError:
+        numeric = False
+    
+    if not ( numeric or _THOUSANDS_SEPARATED.match( s ) ):
+        return -1
+    
+    pos = s.rfind( '.' )
+    
+    if pos < 0:
+        try:
+            int( s )
+            return -1
+        except ValueError:
+            pos = s.lower().rfind( 'e' )
+    
+    return len( s ) - pos - 1 if pos >= 0 else -1
+
+
+def _line( widths:Sequence[int], layout:tuple[str, str, str, str] ) -> str:
+    begin, fill, sep, end = layout
+    return ( begin + sep.join( fill * (w + 2) for w in widths ) + end ).rstrip()
+
+def _aligner( alignment:str, width:int ):
+    if alignment == "left":
+        return ( "{:<%ds}" % width ).format
+    if alignment == "center":
+        return ( "{:^%ds}" % width ).format
+    return ( "{:>%ds}" % width ).format
+
+
+#------------#
+#  renderer  #
+#------------#
+
+def stream_table( rows          : Iterable[Sequence[str]],
+                  headers       : Sequence[str],
+                  colwidths     : Sequence[int],
+                  colalign      : Sequence[str],
+                  tablefmt      : str = "grid",
+                  max_decimals  : Sequence[int]|None = None
+                ) -> Iterator[str]:
+    """
+    render a table of string cells line by line, the output is identical to
+    `'\\n'.join( tabulate( rows, headers, tablefmt, disable_numparse=True, colalign=colalign ) )`
+    
+    `tabulate` scans every cell to size the columns and builds the whole table in memory.
+    Here the widths are supplied upfront, so rows are consumed lazily and each line is yielded as soon as it is complete.
+    
+    The supplied widths must be the ones `tabulate` would choose, see `column_widths(...)`.
+    For `decimal` aligned columns `max_decimals` must hold the largest `decimal_places(...)` of any cell of that column.
+    Multiline cells are only supported if at least one header is multiline as well.
+    
+    Args:
+        rows (`Iterable[Sequence[str]]`): rows of (multiline) cells, may be a generator
+        headers (`Sequence[str]`): (multiline) headers of the columns
+        colwidths (`Sequence[int]`): width of each column excluding the padding
+        colalign (`Sequence[str]`): `left`, `center`, `right` or `decimal` for each column
+        tablefmt (`str`, optional): one of `TABLE_FORMATS`. Defaults to "grid".
+        max_decimals (`Sequence[int]|None`, optional): largest count of decimal places per column, only used for `decimal` columns. Defaults to None.
+    
+    Yields:
+        `Iterator[str]`: lines of the table without line breaks
+    """
+    assert tablefmt in _TABLE_FORMATS, f"tablefmt must be one of {TABLE_FORMATS} but is '{tablefmt}'"
+    assert len( headers ) == len( colwidths ) == len( colalign ), "headers, colwidths and colalign must have the same length"
+    
+    layout       = _TABLE_FORMATS[ tablefmt ]
+    max_decimals = max_decimals or [ -1 ] * len( headers )
+    
+    rows      = iter( rows )
+    first_row = next( rows, None )
+    
+    # tabulate aligns the headers of a table without any rows to the left
+    header_align = colalign if first_row is not None else [ "left" ] * len( headers )
+    
+    # tabulate drops rows without any content only in multiline mode
+    min_lines = 0 if any( '\n' in h for h in headers ) else 1
+    
+    pads   = [ _aligner( a, w ) for a, w in zip( colalign, colwidths ) ]
+    blanks = [ ' ' * w for w in colwidths ]
+    
+    def cell_lines( cell:str, k:int ) -> list[str]:
+        if colalign[k] == "decimal":
+            cell += ' ' * ( max_decimals[k] - decimal_places( cell ) )
+        else:
+            cell = cell.strip()
+        
+        return [ pads[k]( line ) for line in cell.splitlines() ]
+    
+    def row_lines( cells:list[list[str]] ) -> Iterator[str]:
+        count_lines = max( min_lines, *map( len, cells ) )
+        
+        for i in range( count_lines ):
+            yield "| " + " | ".join( c[i] if i < len(c) else blanks[k] for k, c in enumerate( cells ) ) + " |"
+    
+    
+    yield _line( colwidths, layout["line_above"] )
+    
+    yield from row_lines( [
+        [ _aligner( "right" if a == "decimal" else a, w )( line ) for line in h.split( '\n' ) ]
+        for h, a, w in zip( headers, header_align, colwidths )
+    ] )
+    
+    yield _line( colwidths, layout["line_below_header"] )
+    
+    if first_row is not None:
+        between = _line( colwidths, layout["line_between_rows"] ) if layout["line_between_rows"] else None
+        
+        for n, row in enumerate( chain( [ first_row ], rows ) ):
+            if between and n:
+                yield between
+            
+            yield from row_lines( [ cell_lines( cell, k ) for k, cell in enumerate( row ) ] )
+    
+    yield _line( colwidths, layout["line_below"] )
+
+
+if __name__ == "__main__":
+    # self-check against tabulate and benchmark of a long multiline table
+    from tabulate import tabulate
+    from time     import perf_counter
+    
+    headers  = [ "Datum\n      Delta", "Wert", "Zahl" ]
+    colalign = [ "left", "center", "decimal" ]
+    rows     = [
+        [ f"{i:>5d}\n    Tage:{i%7:>3d}", f"  {i*1.5:9.1f}\n  {'x'*(i%4)}", f"{i/8:8.3f}" if i%5 else "   " ]
+        for i in range( 100_000 )
+    ]
+    
+    max_decimals = [ -1, -1, max( map( decimal_places, ( r[2] for r in rows ) ) ) ]
+    widths       = column_widths( headers, cell_widths( rows, colalign, max_decimals ) )
+    
+    for tablefmt in TABLE_FORMATS:
+        t = perf_counter()
+        reference = tabulate( rows, headers=headers, tablefmt=tablefmt, disable_numparse=True, colalign=colalign )
+        t_tabulate = perf_counter() - t
+        
+        t = perf_counter()
+        streamed = '\n'.join( stream_table( rows, headers, widths, colalign, tablefmt, max_decimals ) )
+        t_stream = perf_counter() - t
+        
+        assert streamed == reference, f"streamed {tablefmt} table differs from tabulate"
+        
+        print( f"{tablefmt}: tabulate {t_tabulate:6.2f}s   stream_table {t_stream:6.2f}s" )
@@ -5,14 +5,17 @@ from typing      import NamedTuple, TypeVar, Generic, Iterable
 
 from datetime import date, timedelta
 from math     import floor
+from functools import lru_cache
 
-from colors import ansilen
+import re
 
 T = TypeVar("T")
 
 
 digit_layout_t = NamedTuple( "digit_layout_t", [("pre_point", int), ("post_point", int)] )
 stats_t = NamedTuple( "stats_t", [("mean", float), ("median", T), ("variance", float)] )
+styled_segment_t = NamedTuple( "styled_segment_t", [("csi", str), ("text", str)] )
+date_format_stats_t = NamedTuple( "date_format_stats_t", [("hits", int), ("misses", int), ("size", int), ("hit_rate", float)] )
 
 #-----------#
 #  generic  #
@@ -58,6 +61,124 @@ def digit_layout_to_format_specifier( digit_layout:digit_layout_t ) -> str:
 #  string manipulation  #
 #-----------------------#
 
+# ansi escape codes for colors and styles as well as `K` (erase to end of line), like `colors.strip_color` strips them
+CSI_REGEX: re.Pattern = re.compile( r"\x1b\[(K|.*?m)" )
+
+class Styled_Text():
+    """
+    text with embedded ansi escape codes, tokenized once into segments of ( csi codes, printable text )
+    
+    The width and consuming the text chunk by chunk via `take(...)` are linear in the length of the text,
+    in contrast to stripping resp. re-slicing the string for every csi code
+    
+    Example:
+    >>> t = Styled_Text( "ab\x1b[31mcd\x1b[0mef" )
+    >>> t.width
+    6
+    >>> t.take( 4 ), t.take( 4 )
+    ('ab\x1b[31mcd\x1b[0m', 'ef')
+    """
+    __slots__ = [ "segments", "width", "_index", "_offset" ]
+    
+    segments: list[styled_segment_t]
+    '''csi codes directly preceding a run of printable text, the last segment may consist of csi codes only'''
+    width   : int
+    '''count of printable characters'''
+    
+    def __init__(self, text:str) -> None:
+        self.segments = []
+        
+        pos, csi = 0, []
+        for m in CSI_REGEX.finditer( text ):
+            if m.start() > pos:
+                self.segments.append( styled_segment_t( ''.join( csi ), text[ pos:m.start() ] ) )
+                csi = []
+            
+            csi.append( m.group() )
+            pos = m.end()
+        
+        if pos < len( text ) or csi:
+            self.segments.append( styled_segment_t( ''.join( csi ), text[ pos: ] ) )
+        
+        self.width   = sum( len( seg.text ) for seg in self.segments )
+        self._index  = 0
+        self._offset = 0
+    
+    def __bool__(self) -> bool:
+        """ `True` as long as `take(...)` did not consume all of the text """
+        return self._index < len( self.segments )
+    
+    def __str__(self) -> str:
+        return ''.join( csi + text for csi, text in self.segments )
+    
+    def take(self, width:int) -> str:
+        """
+        consume the next `width` printable characters of the text,
+        together with all csi codes in between and directly following them
+        
+        Args:
+            width (`int`): count of printable characters to consume
+        
+        Returns:
+            `str`: consumed part of the text, concatenating all consumed parts yields the original text
+        """
+        out  = []
+        left = width
+        i, k = self._index, self._offset
+        
+        while i < len( self.segments ):
+            csi, text = self.segments[i]
+            
+            if k < len( csi ):
+                out.append( csi[k:] )
+                k = len( csi )
+            
+            start = k - len( csi )
+            
+            if len( text ) - start > left:
+                out.append( text[ start:start+left ] )
+                k += left
+                break
+            
+            out.append( text[ start: ] )
+            left -= len( text ) - start
+            i, k  = i+1, 0
+        
+        self._index, self._offset = i, k
+        
+        return ''.join( out )
+    
+    @staticmethod
+    def truncate( text:str, width:int ) -> str:
+        """
+        truncate a (stylized) text to `width` printable characters, keeping all csi codes up to the cut
+        
+        Args:
+            text (`str`): (stylized) text
+            width (`int`): count of printable characters to keep
+        
+        Returns:
+            `str`: truncated text, a prefix of `text`
+        """
+        if '\x1b' not in text:
+            return text[ :width ]
+        
+        return Styled_Text( text ).take( width )
+
+def printable_len( s:str ) -> int:
+    """
+    length of the supplied string without ansi escape codes, i.e. the width it spans on the terminal
+    
+    same as `colors.ansilen`, but plain strings are measured without any regex pass
+
+    Args:
+        s (`str`): (stylized) string
+
+    Returns:
+        `int`: count of printable characters
+    """
+    return len( s ) if '\x1b' not in s else Styled_Text( s ).width
+
 def get_string_dimensions( s:str ) -> tuple[int, int]:
     # cspell:ignore nccc nddd
     """
@@ -91,9 +212,12 @@ def max_width_of_strings( list_of_str:list[str] ) -> tuple[str, int]:
     if not list_of_str:
         return None, 0
     
-    res: str = max( list_of_str, key=ansilen )
+    # measure every line once
+    list_of_str = list( list_of_str )
+    widths      = list( map( printable_len, list_of_str ) )
+    width       = max( widths, default=0 )
     
-    return res, ansilen(res)
+    return ( list_of_str[ widths.index( width ) ], width ) if widths else ( None, 0 )
 
 def replace_substring( string_to_be_overwritten:str, at_index:int, substring:str ) -> str:
     # will not work with colorized strings
@@ -157,59 +281,103 @@ class Intersection(Enum):
 div_t      = NamedTuple("div_t",       [("quotient", int), ("remainder", int)])
 calender_t = NamedTuple( "calender_t", [("days", int), ("months", int), ("years", int)] )
 class Dates_Delta:
+    """
+    range between two dates
+    
+    Value type: only the bounds and `days` are determined on construction,
+    the derived calendar views (`months`, `years`, `as_*`) are computed on their first access and cached
+    """
+    __slots__ = [
+        "date_low", "date_high", "ordinal_low", "ordinal_high", "days",
+        "_months", "_as_months_days", "_years", "_as_years_days", "_as_years_months", "_as_years_months_days"
+    ]
+    
     DAYS_IN_YEAR : float = 365.25
     DAYS_IN_MONTH: float = DAYS_IN_YEAR / 12.0
     
     date_low : date
     date_high: date
     
-    days  : int
-    months: float
-    years : float
+    ordinal_low : int
+    ordinal_high: int
     
-    as_months_days: div_t
-
-    as_years_days       : div_t
-    as_years_months     : div_t
-    as_years_months_days: calender_t
+    days  : int
     
     
     def __init__(self, date_low: date, date_high: date) -> None:
         self.date_low  = date_low
         self.date_high = date_high
         
-        self.days = (self.date_high - self.date_low).days
-
-        self.months         = self.days_to_months( self.days )
-        self.as_months_days = self.days_to_months_days( self.days )
-
-        self.years                = self.days_to_years( self.days )
-        self.as_years_days        = self.days_to_years_days( self.days )
-        self.as_years_months      = self.days_to_years_months( self.days )
-        self.as_years_months_days = self.days_to_years_months_days( self.days )
+        self.ordinal_low  = date_low.toordinal()
+        self.ordinal_high = date_high.toordinal()
+        
+        self.days = self.ordinal_high - self.ordinal_low
+        
+        self._months               = None
+        self._as_months_days       = None
+        self._years                = None
+        self._as_years_days        = None
+        self._as_years_months      = None
+        self._as_years_months_days = None
+    
+    @property
+    def months(self) -> float:
+        if self._months is None:
+            self._months = self.days_to_months( self.days )
+        return self._months
+    @property
+    def as_months_days(self) -> div_t:
+        if self._as_months_days is None:
+            self._as_months_days = self.days_to_months_days( self.days )
+        return self._as_months_days
+    
+    @property
+    def years(self) -> float:
+        if self._years is None:
+            self._years = self.days_to_years( self.days )
+        return self._years
+    @property
+    def as_years_days(self) -> div_t:
+        if self._as_years_days is None:
+            self._as_years_days = self.days_to_years_days( self.days )
+        return self._as_years_days
+    @property
+    def as_years_months(self) -> div_t:
+        if self._as_years_months is None:
+            self._as_years_months = self.days_to_years_months( self.days )
+        return self._as_years_months
+    @property
+    def as_years_months_days(self) -> calender_t:
+        if self._as_years_months_days is None:
+            self._as_years_months_days = self.days_to_years_months_days( self.days )
+        return self._as_years_months_days
     
     def intersect( self, date_range: Dates_Delta ) -> Intersection:
-        if date_range.date_low == self.date_low and date_range.date_high == self.date_high:
+        # compares the ordinals (int) of the bounds, which is considerably faster than comparing dates
+        low , high  = self.ordinal_low, self.ordinal_high
+        r_low, r_high = date_range.ordinal_low, date_range.ordinal_high
+        
+        if r_low == low and r_high == high:
             return Intersection.EQUAL
         
-        if date_range.date_low < self.date_low:
+        if r_low < low:
             # possible intersection => SUB_SET or DISJOINT or PARTIAL_LEFT
             
-            if date_range.date_high < self.date_low:
+            if r_high < low:
                 return Intersection.DISJOINT
             
-            if date_range.date_high >= self.date_high:
+            if r_high >= high:
                 return Intersection.SUB_SET
             
             return Intersection.PARTIAL_OVERLAP_LEFT
             
-        else: # date_range.date_low >= self.date_low
+        else: # r_low >= low
             # possible intersection => SUPER_SET or DISJOINT or PARTIAL_RIGHT or EQUAL
             
-            if date_range.date_low > self.date_high:
+            if r_low > high:
                 return Intersection.DISJOINT
             
-            if date_range.date_high > self.date_high:
+            if r_high > high:
                 return Intersection.PARTIAL_OVERLAP_RIGHT
             
             return Intersection.SUPER_SET
@@ -266,12 +434,66 @@ class Dates_Delta:
     def __str__(self) -> str:
         return f"DD( {str(self.date_low)}, {str(self.date_high)} )"
     
+    def __eq__(self, __other: object) -> bool:
+        if not isinstance( __other, Dates_Delta ):
+            return NotImplemented
+        return self.ordinal_low == __other.ordinal_low and self.ordinal_high == __other.ordinal_high
+    
+    def __hash__(self) -> int:
+        return hash( (self.ordinal_low, self.ordinal_high) )
+    
     @staticmethod
     def __to_int( *args ) -> list[int]:
         return [ int(x) for x in args ]
     @staticmethod
     def __int_divmod( x, y ) -> div_t:
-        return div_t( *[ int(v) for v in divmod( x, y ) ] )
+        quotient, remainder = divmod( x, y )
+        return div_t( int(quotient), int(remainder) )
+
+
+#-------------------#
+#  Date formatting  #
+#-------------------#
+
+# `strftime` is locale aware and comparatively slow, tables and selection lists format the same dates over and over
+DATE_FORMAT_CACHE_SIZE: int = 2**14
+
+@lru_cache( maxsize=DATE_FORMAT_CACHE_SIZE )
+def _format_ordinal( ordinal:int, date_format:str ) -> str:
+    return date.fromordinal( ordinal ).strftime( date_format )
+
+def format_date( _date:date, date_format:str ) -> str:
+    """
+    `_date.strftime( date_format )` served from a shared LRU cache keyed by ( ordinal, date_format )
+
+    only the date part is formatted, hence `date_format` must not contain time directives
+
+    Args:
+        _date (`date`): date to be formatted
+        date_format (`str`): `strftime` format string
+
+    Returns:
+        `str`: formatted date
+    """
+    return _format_ordinal( _date.toordinal(), date_format )
+
+def date_format_cache_info() -> date_format_stats_t:
+    """
+    hit-rate instrumentation of the shared date format cache
+
+    Returns:
+        `date_format_stats_t`: (hits, misses, current size, hit rate in [0, 1])
+    """
+    info  = _format_ordinal.cache_info()
+    total = info.hits + info.misses
+    
+    return date_format_stats_t( info.hits, info.misses, info.currsize, info.hits / total if total else 0.0 )
+
+def clear_date_format_cache() -> None:
+    """
+    clear the shared date format cache and its statistics, has to be called after the locale has changed
+    """
+    _format_ordinal.cache_clear()
 
 
 #-----------------#
@@ -326,4 +548,52 @@ if __name__ == "__main__":
     print( float_to_data_format( -123.456, digit_layout_t(2,2)) )
     print( float_to_data_format(  0.0456 , digit_layout_t(2,2)) )
     print( float_to_data_format( -0.0456 , digit_layout_t(2,2)) )
-    print( float_to_data_format(  1.0    , digit_layout_t(2,2)) )
\ No newline at end of file
+    print( float_to_data_format(  1.0    , digit_layout_t(2,2)) )    
+    
+    # microbenchmark: Dates_Delta creation and intersection
+    from timeit import timeit
+    
+    BENCH_NUMBER: int = 200_000
+    
+    d_low , d_high = date( 2023, 1, 1 ), date( 2023, 12, 31 )
+    r_low , r_high = date( 2023, 6, 1 ), date( 2024,  6, 30 )
+    dd_a, dd_b     = Dates_Delta( d_low, d_high ), Dates_Delta( r_low, r_high )
+    
+    t_create    = timeit( lambda: Dates_Delta( d_low, d_high ), number=BENCH_NUMBER )
+    t_create_v  = timeit( lambda: Dates_Delta( d_low, d_high ).as_years_months_days, number=BENCH_NUMBER )
+    t_intersect = timeit( lambda: dd_a.intersect( dd_b ), number=BENCH_NUMBER )
+    
+    print( f"Dates_Delta creation:                 {t_create    / BENCH_NUMBER * 1e9:8.1f} ns" )
+    print( f"Dates_Delta creation + calender view: {t_create_v  / BENCH_NUMBER * 1e9:8.1f} ns" )
+    print( f"Dates_Delta intersection:             {t_intersect / BENCH_NUMBER * 1e9:8.1f} ns" )
+    
+    # microbenchmark: cached date formatting, e.g. a table of daily readings rendered repeatedly
+    dates = [ d_low + timedelta( days=i ) for i in range( 5_000 ) ]
+    
+    clear_date_format_cache()
+    t_strftime = timeit( lambda: [ d.strftime( "%x" ) for d in dates ], number=10 )
+    t_cached   = timeit( lambda: [ format_date( d, "%x" ) for d in dates ], number=10 )
+    
+    assert [ format_date( d, "%x" ) for d in dates ] == [ d.strftime( "%x" ) for d in dates ]
+    
+    print( f"date.strftime:          {t_strftime / (10*len(dates)) * 1e9:8.1f} ns" )
+    print( f"format_date (cached):   {t_cached   / (10*len(dates)) * 1e9:8.1f} ns" )
+    print( f"date format cache:      {date_format_cache_info()}" )
+    
+    # microbenchmark: width of table lines and chunking of a long styled line into terminal lines
+    lines  = [ f"| {i:>8d} | {i*1.5:>12.3f} | {'x'*(i%30):<30s} |" for i in range( 100_000 ) ]
+    styled = ''.join( f"\x1b[0;3{i%8}m{i:>6d}\x1b[0m" for i in range( 10_000 ) )
+    
+    t_strip = timeit( lambda: max( len( CSI_REGEX.sub( '', l ) ) for l in lines ), number=1 )
+    t_width = timeit( lambda: max_width_of_strings( lines ), number=1 )
+    
+    def chunks( text:str, width:int ) -> list[str]:
+        t = Styled_Text( text )
+        return [ t.take( width ) for _ in iter( lambda: bool( t ), False ) ]
+    
+    assert ''.join( chunks( styled, 80 ) ) == styled
+    t_chunks = timeit( lambda: chunks( styled, 80 ), number=1 )
+    
+    print( f"widest of {len(lines)} lines, regex strip:    {t_strip*1e3:8.1f} ms" )
+    print( f"widest of {len(lines)} lines, printable_len:  {t_width*1e3:8.1f} ms" )
+    print( f"{len(styled)} characters styled line in 80 columns chunks: {t_chunks*1e3:8.1f} ms" )
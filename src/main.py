@@ -3,6 +3,8 @@ from datetime import date
 from textwrap import indent
 from typing   import Callable, Optional, Generic, TypeVar, Final
 from locale   import setlocale, LC_ALL
+from threading import Event
+from concurrent.futures import ThreadPoolExecutor, wait
 
 # Custom packages
 from generic_lib.logger    import get_logger
@@ -17,7 +19,7 @@ import formatter     as fmt
 import pdf_gen       as pdf
 
 from generic_lib.simpleTUI import Result, Register
-from generic_lib.simpleTUI import Manager, Name, Date, Date_no_day, Value, Plain_Text
+from generic_lib.simpleTUI import Manager, Name, Dropdown, Date, Date_no_day, Value, Plain_Text, Pager
 from generic_lib.simpleTUI import Button_Manager, Button, Confirm_yes_no
 
 
@@ -71,6 +73,7 @@ from generic_lib.simpleTUI import Button_Manager, Button, Confirm_yes_no
 #----------------------------------------------------------------------------------------------------------------------
 
 setlocale( LC_ALL, LANGUANGE_CODE )
+clear_date_format_cache() # cached date strings depend on the locale
 
 
 #----------------------------------------------------------------------------------------------------------------------
@@ -86,8 +89,22 @@ LOGGER = get_logger( PATH_LOGS, "main", identifier = lambda r: r.funcName )
 def visualize_readings():
     Console.write_line( " --- ABLESUNGEN AUSGEBEN --- ", NL )
     #todo: better description
-
-    Console.write_line( ctrl.generate_printout_readings_all( db.get_all_readings() ) )
+    
+    readings = db.get_all_readings()
+    console  = Console.get_console_size()
+    
+    # leave space for the status line of the pager and the prompt to return to the menu
+    height = console.line - Console.get_cursor().line - 1 - 2
+    
+    Manager( False, False )\
+        .append( Pager(
+            "Ablesungen",
+            ctrl.iter_printout_readings_all( readings ),
+            height,
+            width = console.col - 1,
+            locate_date = ctrl.readings_detail_line_locator( readings )
+        ) )\
+        .join()
 
 def visualize_persons():
     Console.write_line( " --- PERSONEN AUSGEBEN --- ", NL )
@@ -127,21 +144,20 @@ def manipulate_persons():
     Console.write_at( " --- PERSON HINZUFÜGEN / ÜBERSCHREIBEN --- ", Point(0, 0) )
     
     names = db.get_all_names()
-    tab   = ctrl.get_tabular_names(names)
-    
-    width, height = get_string_dimensions( tab )
     
-    Console.write_in( tab, Point(4, 2), Point(4+width, 2+height) )
-    
-    with Console.virtual_area( (4+width+ 4, 2), reset_cursor_on_exit=False ):
+    with Console.virtual_area( (SIZE_TAB, 2), reset_cursor_on_exit=False ):
         Console.write_at( "Name der zu hinzufügenden oder zu überschreibenden db.Person eingeben", Point(0, 0) )
 
         FM = Manager( True, True ).set_position_left_top( SIZE_TAB, 2 )
         
+        # the most similar names are listed below the input instead of a table of all names
+        name = Name( "Name", False, SIZE_NAME, False, names )
+        
         FM\
-            .append( Name( "Name", False, SIZE_NAME, False, names ) )\
+            .append( name )\
+            .append( Dropdown( name, SIZE_DROPDOWN ) )\
             .append( Date( "Einzugsdatum", True, "" ) )\
-            .append( Date( "Auszugsdatum", True, "", lambda dat: not Register.get(1) or dat >= Register.get(1) ) )\
+            .append( Date( "Auszugsdatum", True, "", lambda dat: not FM.register.get(1) or dat >= FM.register.get(1) ) )\
             .append_rule( 0, 1, ctrl.TX_func_factory.name_2_dates( False ) )\
             .append_rule( 0, 2, ctrl.TX_func_factory.name_2_dates( True  ) )
         
@@ -197,20 +213,17 @@ def delete_person():
     #todo: better description
     
     names = db.get_all_names()
-    table = ctrl.get_tabular_names(names)
-    
-    tab_width, tab_height = get_string_dimensions( table )
-    
-    Console.write_in( table, Point(SIZE_TAB, 2), Point(SIZE_TAB+tab_width, 2+tab_height) )
-    
     
-    with Console.virtual_area( (SIZE_TAB + tab_width + SIZE_TAB, 2), reset_cursor_on_exit=False ):
+    with Console.virtual_area( (SIZE_TAB, 2), reset_cursor_on_exit=False ):
         Console.write_at( "Name der zu entfernenden db.Person eingeben", Point(0, 0) )
         
         FM = Manager(True, True).set_position_left_top( SIZE_TAB, 2 )
         
+        name = Name( "Name", False, SIZE_NAME, True, names )
+        
         FM\
-            .append( Name( "Name", False, SIZE_NAME, True, names ) )
+            .append( name )\
+            .append( Dropdown( name, SIZE_DROPDOWN ) )
         
         manage_interactables(
             FM,
@@ -233,7 +246,7 @@ def do_invoice():
     
     result: Result = FM\
         .append( Date_no_day( "Rechnungsbeginn",False, "" ) )\
-        .append( Date_no_day( "Rechnungsende", False, "", lambda dat: dat >= Register.get(0) ) )\
+        .append( Date_no_day( "Rechnungsende", False, "", lambda dat: dat >= FM.register.get(0) ) )\
         .append( Value( f"Gesamtkosten in {LOCAL_CURRENCY}", False, None, DIGIT_LAYOUT_MONEY ) )\
         .join()
     
@@ -276,7 +289,7 @@ def do_analyze():
     
     result:Result = FM\
         .append( Date( "Datum Anfang", False, "", must_be_listed=False, preset_dates=db.get_all_reading_dates() ) )\
-        .append( Date( "Datum Ende",   False, "", must_be_listed=False, preset_dates=db.get_all_reading_dates(), predicate=lambda dat: not Register.get(0) or dat >= Register.get(0) ) )\
+        .append( Date( "Datum Ende",   False, "", must_be_listed=False, preset_dates=db.get_all_reading_dates(), predicate=lambda dat: not FM.register.get(0) or dat >= FM.register.get(0) ) )\
         .append( Plain_Text( "Soll ein PDF Protokoll erstellt werden?" ) )\
         .append( Button_Manager( (1,0), (1,0) ).append_at(0,0, Button( "PDF erstellen", (3,0) )).finalize() )\
         .join()
@@ -292,31 +305,40 @@ def do_analyze():
     
     readings, persons = db.get_data_between( date_low, date_high )
     
-    table_readings_raw   = ctrl.generate_printout_readings_detail( readings )
-    table_readings_stats = ctrl.generate_printout_readings_statistics( readings, False )
+    table_readings_raw, table_readings_stats = ctrl.generate_printout_readings_tables( readings, False )
     table_persons        = ctrl.get_tabular_person_detail( persons )
     
     Console.write( table_readings_raw, table_readings_stats, table_persons, sep="\n\n" )
     
     if create_pdf.success and create_pdf.data[0]:
         export_to_pdf(
-            table_readings_raw,
-            table_readings_stats,
-            table_persons,
-            name="export_span_%s_%s.pdf" % (date_low.strftime("%Y%m%d"), date_high.strftime("%Y%m%d"))
+            lambda: ( table_readings_raw, table_readings_stats, table_persons ),
+            export_name="export_span_%s_%s.pdf" % (format_date( date_low, "%Y%m%d" ), format_date( date_high, "%Y%m%d" ))
         )
         return
     
     Console.write_line()
 
 def do_export_pdf():
+    # the database is read up front, only the tables are built on the worker
     readings, persons = db.get_all_readings(), db.get_all_persons()
     
-    table_readings_raw   = ctrl.generate_printout_readings_detail( readings )
-    table_readings_stats = ctrl.generate_printout_readings_statistics( readings, True )
-    table_persons        = ctrl.get_tabular_person_detail( persons )
+    def build_tables() -> tuple[pdf.pdf_table_t|str, str, str]:
+        analysis = model.Analyze_Reading( readings )
+        
+        # the detail table is the only one that grows with the history, its lines are generated while the pages are drawn
+        table_readings_raw = pdf.pdf_table_t(
+            ctrl.iter_printout_readings_detail( readings, deltas=analysis.deltas ),
+            *ctrl.readings_detail_dimensions( readings )
+        )
+        
+        return (
+            table_readings_raw,
+            ctrl.generate_printout_readings_statistics( readings, True, analysis=analysis ),
+            ctrl.get_tabular_person_detail( persons )
+        )
     
-    export_to_pdf( table_readings_raw, table_readings_stats, table_persons )
+    export_to_pdf( build_tables )
 
 #----------------------------------------------------------------------------------------------------------------------
 # HELPER FUNCTIONS
@@ -351,7 +373,7 @@ def delete_reading_multiple():
     
     FM\
         .append( Date( "Datum ab",  False, "", must_be_listed=False, preset_dates=db.get_all_reading_dates() ) )\
-        .append( Date( "Datum bis", False, "", must_be_listed=False, preset_dates=db.get_all_reading_dates(), predicate=lambda dat: not Register.get(0) or dat >= Register.get(0) ) )
+        .append( Date( "Datum bis", False, "", must_be_listed=False, preset_dates=db.get_all_reading_dates(), predicate=lambda dat: not FM.register.get(0) or dat >= FM.register.get(0) ) )
     
     manage_interactables(
         FM,
@@ -365,13 +387,50 @@ def delete_reading_multiple():
         "Kein Einträge im angegebenen Zeitraum gefunden"
     )
 
-def export_to_pdf( table_readings_raw: str, table_readings_stats: str, table_persons: str, export_name: str="export_%s.pdf" % date.today().strftime("%Y%m%d") ):
+def export_to_pdf( build_tables: Callable[[], tuple[pdf.pdf_table_t|str, pdf.pdf_table_t|str, pdf.pdf_table_t|str]], export_name: str="export_%s.pdf" % format_date( date.today(), "%Y%m%d" ) ):
+    """
+    build the tables and export them as pdf on a worker thread, while the progress is drawn and `Esc` cancels the export
+
+    Args:
+        build_tables (`Callable[[], tuple[pdf.pdf_table_t|str, pdf.pdf_table_t|str, pdf.pdf_table_t|str]]`): returns the ( readings, statistics, persons ) tables, must not access the database
+        export_name (`str`, optional): name of the pdf file. Defaults to "export_%s.pdf" % format_date( date.today(), "%Y%m%d" ).
+    """
     Console.write_line( " --- PROTOKOLL EXPORTIEREN - PDF --- ", NL )
     
-    pdf.export_to_pdf( table_readings_raw, table_readings_stats, table_persons, PATH_PDF, export_name )
+    progress = [ 0, 0 ] # pages done, pages total
+    cancel   = Event()
+    
+    def report( done:int, total:int ) -> None:
+        progress[:] = done, total
+    
+    def on_press( key:keyboard.Key|keyboard.KeyCode ) -> None:
+        if key == keyboard.Key.esc:
+            cancel.set()
+    
+    line = Console.get_cursor().line
+    
+    with ThreadPoolExecutor( max_workers=1 ) as executor, keyboard.Listener( on_press=on_press ):
+        job = executor.submit( lambda: pdf.export_to_pdf( *build_tables(), PATH_PDF, export_name, report, cancel ) )
+        
+        while not wait( [job], timeout=EXPORT_PROGRESS_INTERVAL ).done:
+            draw_export_progress( *progress, line )
+        
+        draw_export_progress( *progress, line )
+    
+    # keys pressed during the export, e.g. Esc, were not read by the menu
+    Console.discard_keys()
+    
+    Console.set_cursor( 0, line+2 )
+    
+    try:
+        job.result()
+    except pdf.Export_Cancelled as e:
+        LOGGER.info( str(e) )
+        Console.write_line( "\tExport wurde abgebrochen, es wurde keine Datei erstellt", "" , sep='\n' )
+        return
     
     Console.write_line(
-        f"\tProtokoll über alle Werte wurde am {date.today().strftime( DATE_STR_FORMAT )} erstellt", 
+        f"\tProtokoll über alle Werte wurde am {format_date( date.today(), DATE_STR_FORMAT )} erstellt", 
         f"\tund als \"{export_name}\" in Ihrem Dokumenten-Ordner \"{PATH_PDF.absolute()}\" gespeichert",
         "",
         sep='\n' )
@@ -381,12 +440,13 @@ def export_to_pdf( table_readings_raw: str, table_readings_stats: str, table_per
 # UI - GENERAL FLOW FUNCTIONS #
 #-----------------------------#
 def flush_menu() -> None:
-    Console.clear()
-    Console.write_line( TITLE )
-    
-    Console.write_line( "Eine Option mit den Tasten 1-9 auswählen" )
-    print_menu_options()
-    Console.write_line( "Um das Programm zu verlassen: Esc drücken", NL )
+    with Console.transaction():
+        Console.clear()
+        Console.write_line( TITLE )
+        
+        Console.write_line( "Eine Option mit den Tasten 1-9 auswählen" )
+        print_menu_options()
+        Console.write_line( "Um das Programm zu verlassen: Esc drücken", NL )
 
 def print_menu_options() -> None:
     tab = tabulate( MENUS, tablefmt="simple", disable_numparse=True, colalign=('right', 'left') )
@@ -398,6 +458,17 @@ def user_decline_prompt( col:int=None, line:int=None, absolute:bool=True ) -> No
         Console.set_cursor( col, line, absolute=absolute )
     Console.write_line( " --- Handlung wurde abgebrochen" )
 
+def draw_export_progress( pages_done:int, pages_total:int, line:int ) -> None:
+    with Console.transaction():
+        if not pages_total:
+            Console.write_in( "Tabellen werden erstellt ...   (Esc: Abbrechen)", Point( SIZE_TAB, line ) )
+            return
+        
+        size_bar = 40
+        filled   = size_bar * pages_done // pages_total
+        
+        Console.write_in( "[%s%s] %d / %d Seiten   (Esc: Abbrechen)" % ( '#'*filled, '-'*(size_bar-filled), pages_done, pages_total ), Point( SIZE_TAB, line ) )
+
 def user_to_menu_prompt() -> None:
     Console.write_line( "--- Eingabe-Taste drücken um in das Menü zurückzukehren" )
     Console.await_key( Key( keyboard.Key.enter ), Key( keyboard.Key.esc) )
@@ -579,6 +650,10 @@ def main() -> None:
     Console.setup( APP_NAME )
     Console.clear()
     
+    # lookups of the forms are reused until the database is written
+    Register.set_data_version( db.get_revision )
+    Register.set_data_hits( db.get_count_hits )
+    
     try:
         while True:
             Console.hide_cursor()
@@ -6,14 +6,34 @@ from reportlab.lib.pagesizes      import A4
 from reportlab.lib.units          import cm, mm
 from reportlab.pdfbase.pdfmetrics import stringWidth
 
+from typing    import Callable, Iterable, NamedTuple
+from threading import Event
+
 import webbrowser
+import tempfile
 
-from math     import floor
+from math     import floor, ceil
 from datetime import datetime, date, UTC
 
 from generic_lib.utils import *
 from constants import *
 
+pdf_table_t = NamedTuple( "pdf_table_t", [("lines", Iterable[str]), ("width", int), ("count_lines", int)] )
+'''lines of a table, may be a generator, together with the printable width of its widest line and its count of lines'''
+
+def pdf_table_from_str( table:str ) -> pdf_table_t:
+    """
+    wrap an already rendered table, its size is measured from its lines
+
+    Args:
+        table (`str`): rendered table
+
+    Returns:
+        `pdf_table_t`: lines and size of the table
+    """
+    lines = table.splitlines()
+    return pdf_table_t( lines, max_width_of_strings( lines )[1], len(lines) )
+
 def find_fitting_fontsize( len_of_str:int, hor_space_avail:int ) -> int: 
     # should be representative for all ranges of font sizes, under assumption of monospace font
     char_width_size_ratio = stringWidth( ' ', PDF_FONT_TABLE, 100 ) / 100
@@ -22,6 +42,49 @@ def find_fitting_fontsize( len_of_str:int, hor_space_avail:int ) -> int:
     
     return hor_space_avail / width_ratio_required
 
+def pdf_page_layout( max_row_len:int, width:int, height:int, rx:int, ry:int, offset_ry:int ) -> tuple[float, int, int]:
+    """
+    layout of a table drawn by `draw_pdf_page(...)`
+
+    Args:
+        max_row_len (`int`): printable width of the widest line of the table
+        width (`int`): width of the page
+        height (`int`): height of the page
+        rx (`int`): horizontal margin
+        ry (`int`): vertical margin
+        offset_ry (`int`): additional offset of the table on its first page
+
+    Returns:
+        `tuple[float, int, int]`: ( font size, count of lines on the first page, count of lines on every following page )
+    """
+    FONT_SIZE = find_fitting_fontsize( max_row_len, width-2*rx )
+    
+    # (ROWS - LINE_UPPER_SEPARATOR - SPACE_BOTTOM) / LINES_PER_ENTRY
+    entries_first_page = floor( ( floor( (height-(ry+offset_ry)-rx) / FONT_SIZE )-1-1 ) / 3 )
+    entries_per_page   = floor( ( floor( (height-ry-rx)             / FONT_SIZE )-1-1 ) / 3 )
+    
+    return FONT_SIZE, 3 * entries_first_page, 3 * entries_per_page
+
+def count_pdf_pages( table:pdf_table_t, width:int, height:int, rx:int, ry:int, offset_ry:int ) -> int:
+    """
+    count of pages `draw_pdf_page(...)` will need for a table, see `pdf_page_layout(...)` for the arguments
+
+    only the size of the table is used, its lines are not consumed
+
+    Returns:
+        `int`: count of pages
+    """
+    _, lines_first_page, lines_per_page = pdf_page_layout( table.width, width, height, rx, ry, offset_ry )
+    
+    # for very narrow tables the font is so large that a page holds no lines at all, `draw_pdf_page` then never resp. only once breaks the page
+    if table.count_lines <= lines_first_page or lines_first_page < 0:
+        return 1
+    
+    if lines_per_page <= 0:
+        return 2
+    
+    return 1 + ceil( ( table.count_lines - lines_first_page ) / lines_per_page )
+
 def add_info_pdf_page( canv:canvas.Canvas ) -> None:
     pageNum = canv.getPageNumber()
 
@@ -34,27 +97,21 @@ def add_info_pdf_page( canv:canvas.Canvas ) -> None:
     
     canv.setFont( f, fs, lead )
 
-def draw_pdf_page( table_lines:str, can:canvas.Canvas, width:int, height:int, rx:int, ry:int, offset_ry:int, font:str, table_continue_str:str ) -> None:
-    max_row_len = max_width_of_strings( table_lines.splitlines() )[1]
-    
-    RW, RH = width-2*rx, height-(ry+offset_ry)-rx
-    
-    FONT_SIZE = find_fitting_fontsize( max_row_len, RW )
+def draw_pdf_page( table:pdf_table_t, can:canvas.Canvas, width:int, height:int, rx:int, ry:int, offset_ry:int, font:str, table_continue_str:str, on_page:Callable[[], None]|None=None ) -> None:
+    # the layout only depends on the size of the table, hence the lines are consumed one by one
+    # and every page is handed to the canvas as soon as it is full
+    RW = width-2*rx
     
-    ROWS = floor( RH / FONT_SIZE )
-    ENTRIES_PER_PAGE = floor( (ROWS-1-1) / 3 ) # (ROWS - LINE_UPPER_SEPARATOR - SPACE_BOTTOM) / LINES_PER_ENTRY
+    FONT_SIZE, lines_on_page, lines_per_page = pdf_page_layout( table.width, width, height, rx, ry, offset_ry )
     
     textObj = can.beginText( rx, ry+offset_ry )
     textObj.setFont( font, FONT_SIZE, FONT_SIZE )
     
     lines_idx = 0
-    for line in table_lines.splitlines():
-        if lines_idx == 3 * ENTRIES_PER_PAGE:     # ENTRIES_PER_PAGE = 3 * REQUIRED_LINES_PER_PAGE
+    for line in table.lines:
+        if lines_idx == lines_on_page:
             lines_idx = 0
-            
-            RH = height-ry-rx 
-            ROWS = floor( RH / FONT_SIZE )
-            ENTRIES_PER_PAGE = floor( (ROWS-1-1) / 3 )
+            lines_on_page = lines_per_page
             
             textObj.moveCursor( ( RW - FONT_SIZE*len(table_continue_str) )//2, 0 )
             textObj.textOut( table_continue_str )
@@ -65,6 +122,8 @@ def draw_pdf_page( table_lines:str, can:canvas.Canvas, width:int, height:int, rx
             add_info_pdf_page(can)
             can.showPage()
             
+            if on_page:
+                on_page()
             
             textObj = can.beginText( rx, ry )
             textObj.setFont( PDF_FONT_TABLE, FONT_SIZE, FONT_SIZE )
@@ -77,67 +136,132 @@ def draw_pdf_page( table_lines:str, can:canvas.Canvas, width:int, height:int, rx
     # finalize this page and initiate new page
     add_info_pdf_page(can)
     can.showPage()
+    
+    if on_page:
+        on_page()
+
+class Export_Cancelled( Exception ):
+    """raised by `export_to_pdf(...)` if its `cancel` event was set while the pages were drawn"""
 
 def export_to_pdf(
-    table_readings_raw  : str,
-    table_readings_stats: str,
-    table_persons       : str,
+    table_readings_raw  : str|pdf_table_t,
+    table_readings_stats: str|pdf_table_t,
+    table_persons       : str|pdf_table_t,
     output_path         : Path = PATH_PDF,
-    name                : str = "export_%s.pdf" % date.today().strftime("%Y%m%d"),
-    ) -> None:
-    #todo: better description
+    name                : str = "export_%s.pdf" % format_date( date.today(), "%Y%m%d" ),
+    progress            : Callable[[int, int], None]|None = None,
+    cancel              : Event|None = None,
+    ) -> Path:
+    """
+    draw the tables into a pdf file and open it in the browser
+
+    the pdf is written to a temporary file next to the target, which is only renamed to `name` once it is complete.
+    Hence an interrupted or cancelled export never leaves a partial file behind. Safe to be run on a worker thread.
     
+    Tables given as `pdf_table_t` are streamed, their lines are only generated while their pages are drawn.
+
+    Args:
+        table_readings_raw (`str|pdf_table_t`): table of detailed readings
+        table_readings_stats (`str|pdf_table_t`): table of readings statistics
+        table_persons (`str|pdf_table_t`): table of persons
+        output_path (`Path`, optional): directory of the pdf file. Defaults to PATH_PDF.
+        name (`str`, optional): name of the pdf file. Defaults to "export_%s.pdf" % format_date( date.today(), "%Y%m%d" ).
+        progress (`Callable[[int, int], None]|None`, optional): called with ( pages done, pages total ) after each page. Defaults to None.
+        cancel (`Event|None`, optional): once set the export stops after the current page. Defaults to None.
+
+    Raises:
+        `Export_Cancelled`: if `cancel` was set before the export completed
+
+    Returns:
+        `Path`: path of the pdf file
+    """
     TABLE_CONTINUE_STR = '. . .'
     
     # (210mm, 297mm)
     # (595pt, 842pt)
     WIDTH, HEIGHT = A4
     
-    file_name = output_path.joinpath( str(name) )
-    
-    file_name.unlink(True)
-    file_pdf = file_name.open("xb")
-    
-    c = canvas.Canvas( file_pdf, A4, 0 )
-    
-      #########
-     # TITLE #
-    #########
-    c.setFont( PDF_FONT_TITLE, 20 )
-    c.drawCentredString( WIDTH/2, 50, "Verbrauchsprotokollator" )
-    c.drawCentredString( WIDTH/2, 70, "Übersicht vom %s" % date.today().strftime( DATE_STR_FORMAT ) )
-    c.line( 100, 80, WIDTH-100, 80 )
-    c.line( 100, 82, WIDTH-100, 82 )
-    
-    
     RX, RY = 50, 50
     
-      ############
-     # READINGS #
-    ############
+    table_readings_raw, table_readings_stats, table_persons = [
+        table if isinstance( table, pdf_table_t ) else pdf_table_from_str( table )
+        for table in ( table_readings_raw, table_readings_stats, table_persons )
+    ]
     
-    # individual readings
-    c.setFont( PDF_FONT_TABLE, 16 )
-    c.drawString( RX, 120, "Ablesungen:" )
+    pages_total = count_pdf_pages( table_readings_raw,   WIDTH, HEIGHT, RX, RY, 80 )\
+                + count_pdf_pages( table_readings_stats, WIDTH, HEIGHT, RX, RY, 0  )\
+                + count_pdf_pages( table_persons,        WIDTH, HEIGHT, RX, RY, 0  )
+    pages_done  = 0
     
-    draw_pdf_page( table_readings_raw, c, WIDTH, HEIGHT, RX, RY, 80, PDF_FONT_TABLE, TABLE_CONTINUE_STR )
+    def check_cancel() -> None:
+        if cancel is not None and cancel.is_set():
+            raise Export_Cancelled( f"export cancelled after {pages_done} of {pages_total} pages" )
     
-    # statistics readings
-    c.setFont( PDF_FONT_TABLE, 16 )
-    c.drawString( RX, RY-20, "Statistiken:" )
+    def page_done() -> None:
+        nonlocal pages_done
+        pages_done += 1
+        
+        if progress:
+            progress( pages_done, pages_total )
+        
+        check_cancel()
     
-    draw_pdf_page( table_readings_stats, c, WIDTH, HEIGHT, RX, RY, 0, PDF_FONT_TABLE, TABLE_CONTINUE_STR )
-
-     
-      ###########
-     # PERSONS #
-    ###########
-    c.setFont( PDF_FONT_TABLE, 16 )
-    c.drawString( RX, RY-20, "Personen:" )
+    if progress:
+        progress( pages_done, pages_total )
     
-    draw_pdf_page( table_persons, c, WIDTH, HEIGHT, RX, RY, 0, PDF_FONT_TABLE, TABLE_CONTINUE_STR )
+    check_cancel()
     
+    file_name = output_path.joinpath( str(name) )
+    file_temp = tempfile.NamedTemporaryFile( "wb", dir=output_path, prefix=f"{name}.", suffix=".part", delete=False )
     
-    c.save()
+    try:
+        with file_temp as file_pdf:
+            c = canvas.Canvas( file_pdf, A4, 0 )
+            
+              #########
+             # TITLE #
+            #########
+            c.setFont( PDF_FONT_TITLE, 20 )
+            c.drawCentredString( WIDTH/2, 50, "Verbrauchsprotokollator" )
+            c.drawCentredString( WIDTH/2, 70, "Übersicht vom %s" % format_date( date.today(), DATE_STR_FORMAT ) )
+            c.line( 100, 80, WIDTH-100, 80 )
+            c.line( 100, 82, WIDTH-100, 82 )
+            
+            
+              ############
+             # READINGS #
+            ############
+            
+            # individual readings
+            c.setFont( PDF_FONT_TABLE, 16 )
+            c.drawString( RX, 120, "Ablesungen:" )
+            
+            draw_pdf_page( table_readings_raw, c, WIDTH, HEIGHT, RX, RY, 80, PDF_FONT_TABLE, TABLE_CONTINUE_STR, page_done )
+            
+            # statistics readings
+            c.setFont( PDF_FONT_TABLE, 16 )
+            c.drawString( RX, RY-20, "Statistiken:" )
+            
+            draw_pdf_page( table_readings_stats, c, WIDTH, HEIGHT, RX, RY, 0, PDF_FONT_TABLE, TABLE_CONTINUE_STR, page_done )
+            
+             
+              ###########
+             # PERSONS #
+            ###########
+            c.setFont( PDF_FONT_TABLE, 16 )
+            c.drawString( RX, RY-20, "Personen:" )
+            
+            draw_pdf_page( table_persons, c, WIDTH, HEIGHT, RX, RY, 0, PDF_FONT_TABLE, TABLE_CONTINUE_STR, page_done )
+            
+            
+            c.save()
+        
+        # atomic on the same file system, replaces an older export of the same name
+        Path( file_temp.name ).replace( file_name )
+    except BaseException:
+        Path( file_temp.name ).unlink( True )
+        raise
     
     webbrowser.open_new( file_name.as_uri() )
+    
+    return file_name
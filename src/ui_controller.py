@@ -1,6 +1,7 @@
-from typing    import Callable
+from typing    import Callable, Iterator
 from tabulate  import tabulate, PRESERVE_WHITESPACE
 from datetime  import date
+from bisect    import bisect_left
 
 from constants         import *
 from generic_lib.utils import *
@@ -9,6 +10,8 @@ import dbWrapper     as db
 import formatter     as fmt
 import backend_model as model
 
+import generic_lib.streamTable as stream
+
 # from tabulate namespace
 PRESERVE_WHITESPACE = True
 
@@ -30,7 +33,7 @@ class TX_func_factory():
                 _date = person.move_out
             
             if _date:
-                res = list( _date.strftime("%d%m%Y") )
+                res = list( format_date( _date, "%d%m%Y" ) )
             
             return exists, res
         return f
@@ -153,8 +156,8 @@ def get_tabular_person_detail( persons:list[ db.Person ], tablefmt="grid" ) -> s
     table_data = []
     
     for p in persons:
-        move_in_str  = p.move_in.strftime(  DATE_STR_FORMAT ) if p.move_in  else PLACE_HOLDER
-        move_out_str = p.move_out.strftime( DATE_STR_FORMAT ) if p.move_out else PLACE_HOLDER
+        move_in_str  = format_date( p.move_in,  DATE_STR_FORMAT ) if p.move_in  else PLACE_HOLDER
+        move_out_str = format_date( p.move_out, DATE_STR_FORMAT ) if p.move_out else PLACE_HOLDER
         
         effective_months_str = PLACE_HOLDER
         invoices = PLACE_HOLDER
@@ -169,7 +172,7 @@ def get_tabular_person_detail( persons:list[ db.Person ], tablefmt="grid" ) -> s
                 
                 delta_str = "%s%d" % ( '<' if delta_fraction < 15 else '', delta_months+1 )
                 
-                effective_months_str = ''.join( [delta_str, NL, p.move_in.strftime("%b%y"), ' - ', artifical_move_out.strftime("%b%y") ] )
+                effective_months_str = ''.join( [delta_str, NL, format_date( p.move_in, "%b%y" ), ' - ', format_date( artifical_move_out, "%b%y" ) ] )
             else:
                 effective_months_str = "noch nicht\neingezogen\n"
                 years_str_list = [ f"( {p.move_in.year} )" ]
@@ -178,7 +181,7 @@ def get_tabular_person_detail( persons:list[ db.Person ], tablefmt="grid" ) -> s
             
             # hint today's date in the moving_out slot in the table if no moving_out date is present
             if not p.move_out:
-                move_out_str = NL.join( [ PLACE_HOLDER, f"( { date.today().strftime( DATE_STR_FORMAT ) } )" ] )
+                move_out_str = NL.join( [ PLACE_HOLDER, f"( { format_date( date.today(), DATE_STR_FORMAT ) } )" ] )
         
         table_data.append( [
             p.name,
@@ -214,24 +217,50 @@ def get_tabular_reading_simple( readings:list[ db.Reading ], tablefmt="psql" ) -
     Returns:
         `str`: string of table
     """
-    readings = [
-        [
-            r.date.strftime( DATE_STR_FORMAT ),
-            *[
-                fmt.format_decimal( r.attributes[k], LIST_DIGIT_OBJ_LAYOUTS[k] ) for k in range(COUNT_READING_ATTRIBUTES)
-            ]
-        ]
-        for r in readings
+    return NL.join( iter_tabular_reading_simple( readings, tablefmt ) )
+
+def iter_tabular_reading_simple( readings:list[ db.Reading ], tablefmt="psql" ) -> Iterator[str]:
+    """
+    lazily generate the lines of the simple table of readings, see `get_tabular_reading_simple(...)`
+
+    the column widths are derived from the digit layouts, so no formatted cell has to be kept in memory
+
+    Args:
+        readings (`list[db.Reading]`): list of readings to be tabulated
+        tablefmt (`str`, optional): `grid` or `psql`. Defaults to "psql".
+
+    Yields:
+        `Iterator[str]`: lines of the table
+    """
+    # decimal alignment pads blank cells to the decimal places of the numbers, hence only columns holding numbers resp. blanks are as wide as these
+    has_value = [ any(     r.attributes[k] for r in readings ) for k in range(COUNT_READING_ATTRIBUTES) ]
+    has_blank = [ not all( r.attributes[k] for r in readings ) for k in range(COUNT_READING_ATTRIBUTES) ]
+    
+    max_decimals = [ -1 ] + [ layout.post_point if has_value[k] else -1 for k, layout in enumerate(LIST_DIGIT_OBJ_LAYOUTS) ]
+    
+    cell_widths = [ _date_str_width( readings ) ] + [
+        max(
+            sum(layout) + 1 + 1                          if has_value[k] else 0,
+            sum(layout) + max_decimals[k+1] - (-1)       if has_blank[k] else 0
+        )
+        for k, layout in enumerate(LIST_DIGIT_OBJ_LAYOUTS)
     ]
     
-    return tabulate(
-        readings,
-        headers=TABLE_HEADER_READINGS_SIMPLE,
-        tablefmt=tablefmt,
-        disable_numparse=True,
-        colalign=('left', *['decimal']*COUNT_READING_ATTRIBUTES)
+    columns = fmt.format_columns( ( r.attributes for r in readings ), LIST_DIGIT_OBJ_LAYOUTS )
+    
+    yield from stream.stream_table(
+        ( [ format_date( r.date, DATE_STR_FORMAT ), *cells ] for r, *cells in zip( readings, *columns ) ),
+        TABLE_HEADER_READINGS_SIMPLE,
+        stream.column_widths( TABLE_HEADER_READINGS_SIMPLE, cell_widths ),
+        ('left', *['decimal']*COUNT_READING_ATTRIBUTES),
+        tablefmt,
+        max_decimals
     )
 
+def _date_str_width( readings:list[ db.Reading ] ) -> int:
+    # `DATE_STR_FORMAT` yields zero padded dates, hence the (sorted) readings' first and last dates are the widest
+    return max( ( len( format_date( r.date, DATE_STR_FORMAT ) ) for r in readings[:1] + readings[-1:] ), default=0 )
+
 
 def generate_printout_readings_all( readings:list[ db.Reading ], use_years_for_stats_section:bool=True ) -> str:
     """
@@ -248,12 +277,74 @@ def generate_printout_readings_all( readings:list[ db.Reading ], use_years_for_s
     Returns:
         str: Tables of readings formatted to be printed on screen or pdf
     """
-    table_raw = generate_printout_readings_detail( readings )
-    table_stats = generate_printout_readings_statistics( readings, use_years_for_stats_section )
+    table_raw, table_stats = generate_printout_readings_tables( readings, use_years_for_stats_section )
     
     return ''.join([table_raw, NL, NL, table_stats, NL])
 
-def generate_printout_readings_detail( readings:list[ db.Reading ], tablefmt="grid" ) -> str:
+def iter_printout_readings_all( readings:list[ db.Reading ], use_years_for_stats_section:bool=True ) -> Iterator[str]:
+    """
+    lazily generate the lines of `generate_printout_readings_all(...)`, e.g. for a scrollable view
+
+    the detail table is streamed row by row, the statistics are only analyzed once the detail table has been consumed
+
+    Args:
+        readings (`list[ db.Reading ]`): raw data directly from database
+        use_years_for_stats_section (`bool`, optional): if `True` groups readings in `Table 2` by year and months, `False` groups only by months. Defaults to `True`.
+
+    Yields:
+        `Iterator[str]`: lines of both tables, separated by an empty line
+    """
+    analysis = model.Analyze_Reading( readings )
+    
+    yield from iter_printout_readings_detail( readings, deltas=analysis.deltas )
+    yield ''
+    yield from generate_printout_readings_statistics( readings, use_years_for_stats_section, analysis=analysis ).splitlines()
+
+def readings_detail_line_locator( readings:list[ db.Reading ], tablefmt="grid" ) -> Callable[[date], int]:
+    """
+    create a lookup of the line of the detail table (see `iter_printout_readings_detail(...)`) at which the first reading on or after a date starts
+
+    every reading takes up two lines (plus a separating line for `grid`), hence the line is calculated from the index of the reading,
+    which is found by a binary search in the readings sorted by date
+
+    Args:
+        readings (`list[ db.Reading ]`): readings sorted by date, e.g. directly from database
+        tablefmt (`str`, optional): `grid` or `psql`. Defaults to "grid".
+
+    Returns:
+        `Callable[[date], int]`: maps a date to the index of the line in the detail table
+    """
+    # line above, header lines and line below the header
+    count_head_lines = 1 + max( h.count( NL ) + 1 for h in TABLE_HEADER_READINGS_DETAIL ) + 1
+    lines_per_row    = 2 + ( 1 if tablefmt == "grid" else 0 )
+    
+    def locate( day:date ) -> int:
+        index = min( bisect_left( readings, day, key=lambda r: r.date ), max( 0, len(readings)-1 ) )
+        return count_head_lines + lines_per_row * index
+    
+    return locate
+
+def generate_printout_readings_tables( readings:list[ db.Reading ], use_years_for_stats_section:bool=True ) -> tuple[str, str]:
+    """
+    generate the table of detailed readings and the table of readings statistics
+
+    both tables share one analysis, i.e. the deltas of the readings are calculated only once
+
+    Args:
+        readings (`list[ db.Reading ]`): raw data directly from database
+        use_years_for_stats_section (`bool`, optional): if `True` groups readings in `Table 2` by year and months, `False` groups only by months. Defaults to `True`.
+
+    Returns:
+        `tuple[str, str]`: ( table of detailed readings, table of readings statistics )
+    """
+    analysis = model.Analyze_Reading( readings )
+    
+    return (
+        generate_printout_readings_detail( readings, deltas=analysis.deltas ),
+        generate_printout_readings_statistics( readings, use_years_for_stats_section, analysis=analysis )
+    )
+
+def generate_printout_readings_detail( readings:list[ db.Reading ], tablefmt="grid", deltas:model.Reading_Deltas|None=None ) -> str:
     """
     generate string of table for detailed readings output
 
@@ -282,72 +373,118 @@ def generate_printout_readings_detail( readings:list[ db.Reading ], tablefmt="gr
     Args:
         readings (`list[ db.Reading ]`): raw data directly from database
         tablefmt (`str`, optional): table format to be used by the `tabulate` module. Defaults to "grid".
+        deltas (`model.Reading_Deltas | None`, optional): already calculated deltas of `readings`, e.g. of the statistics' analysis. Defaults to None.
 
     Returns:
         str: Table of detailed readings formatted to be printed on screen or pdf
     """
-    table_data = []
+    return NL.join( iter_printout_readings_detail( readings, tablefmt, deltas ) )
+
+def iter_printout_readings_detail( readings:list[ db.Reading ], tablefmt="grid", deltas:model.Reading_Deltas|None=None ) -> Iterator[str]:
+    """
+    lazily generate the lines of the table of detailed readings, see `generate_printout_readings_detail(...)`
+
+    the column widths are derived from the header constants and the digit layouts,
+    hence the rows are formatted one after another while the lines are consumed
+
+    Args:
+        readings (`list[ db.Reading ]`): raw data directly from database
+        tablefmt (`str`, optional): `grid` or `psql`. Defaults to "grid".
+        deltas (`model.Reading_Deltas | None`, optional): already calculated deltas of `readings`. Defaults to None.
+
+    Yields:
+        `Iterator[str]`: lines of the table
+    """
+    if not readings: # Database has no entries
+        rows = _READINGS_DETAIL_NO_DATA
+    else:
+        deltas   = deltas or model.Reading_Deltas( readings )
+        readings = deltas.readings
+        rows     = _readings_detail_rows( deltas )
+    
+    yield from stream.stream_table(
+        rows,
+        TABLE_HEADER_READINGS_DETAIL,
+        _readings_detail_column_widths( readings ),
+        _READINGS_DETAIL_COLALIGN,
+        tablefmt
+    )
+
+def readings_detail_dimensions( readings:list[ db.Reading ], tablefmt="grid" ) -> tuple[int, int]:
+    """
+    size of the table of detailed readings (see `iter_printout_readings_detail(...)`) without rendering it,
+    e.g. to lay out pages before the lines are generated
+
+    Args:
+        readings (`list[ db.Reading ]`): raw data directly from database
+        tablefmt (`str`, optional): `grid` or `psql`. Defaults to "grid".
+
+    Returns:
+        `tuple[int, int]`: ( width of the lines in characters, count of lines )
+    """
+    readings = sorted( readings, key=lambda r: r.date )
     
-    tabulating = lambda tab_data: tabulate( 
-                                           tab_data,
-                                           headers=TABLE_HEADER_READINGS_DETAIL,
-                                           tablefmt=tablefmt,
-                                           disable_numparse=True,
-                                           colalign=('left', *['center']*COUNT_READING_ATTRIBUTES)
-                                           )
+    width = stream.table_width( _readings_detail_column_widths( readings ) )
     
-    if not readings: # Database has no entries
-        return tabulating( [["no data"]*len(TABLE_HEADER_READINGS_DETAIL)] )
+    if not readings:
+        return width, stream.table_height( TABLE_HEADER_READINGS_DETAIL, len(_READINGS_DETAIL_NO_DATA), 1, tablefmt )
+    
+    # each reading: date resp. "    Tage:ddd"
+    return width, stream.table_height( TABLE_HEADER_READINGS_DETAIL, len(readings), 2, tablefmt )
+
+_READINGS_DETAIL_COLALIGN = ('left', *['center']*COUNT_READING_ATTRIBUTES)
+_READINGS_DETAIL_NO_DATA  = [ ["no data"]*len(TABLE_HEADER_READINGS_DETAIL) ]
+
+def _readings_detail_column_widths( readings:list[ db.Reading ] ) -> list[int]:
+    # readings must be sorted by date
+    if not readings:
+        return stream.column_widths( TABLE_HEADER_READINGS_DETAIL, stream.cell_widths( _READINGS_DETAIL_NO_DATA, _READINGS_DETAIL_COLALIGN ) )
+    
+    max_days = max( ( (b.date - a.date).days for a, b in zip( readings, readings[1:] ) ), default=0 )
+    
+    # date column: date resp. "    Tage:ddd"
+    # value columns: value resp. "delta/day absolute_delta"
+    cell_widths = [ max( _date_str_width( readings ), len( f"    Tage:{max_days:>3d}" ) ) ] + [
+        max( sum(layout) + 1 + 1, (sum(DIGIT_LAYOUT_DELTA) + 1 + 1) + 1 + (sum(layout) + 1 + 1) )
+        for layout in LIST_DIGIT_OBJ_LAYOUTS
+    ]
     
+    return stream.column_widths( TABLE_HEADER_READINGS_DETAIL, cell_widths )
+
+def _readings_detail_rows( deltas:model.Reading_Deltas ) -> Iterator[list[str]]:
+    readings = deltas.readings
+    
+    fmt_values = [ fmt.get_decimal_formatter( layout ) for layout in LIST_DIGIT_OBJ_LAYOUTS ]
+    fmt_delta  = fmt.get_decimal_formatter( DIGIT_LAYOUT_DELTA )
     
-    # append first entry since the following loop start iterating at the second entry
-    table_data.append( [
-        readings[0].date.strftime( DATE_STR_FORMAT ) +NL+ f"    Tage:---",
-        *[
-            fmt.format_decimal( readings[0].attributes[k], LIST_DIGIT_OBJ_LAYOUTS[k] ) +NL+\
-            fmt.format_decimal( None, DIGIT_LAYOUT_DELTA ) +" "+ fmt.format_decimal( None, LIST_DIGIT_OBJ_LAYOUTS[k] )
-            for k in range(COUNT_READING_ATTRIBUTES)
-        ]
-    ] )
+    # cell of a missing value resp. of a value without an earlier value to compare to
+    blank_cells = [ f.blank +NL+ fmt_delta.blank +" "+ f.blank for f in fmt_values ]
+    first_cells = [ f( readings[0].attributes[k] ) +NL+ fmt_delta.blank +" "+ f.blank for k, f in enumerate(fmt_values) ]
+    
+    # yield first entry since the following loop start iterating at the second entry
+    yield [ format_date( readings[0].date, DATE_STR_FORMAT ) +NL+ f"    Tage:---", *first_cells ]
     
-    # "can't" use enumerate(...) since indexing should start at 1 and enumerate can't work with that
-    # it would be feasible to use enumerate but for now this seems simpler
     for i in range(1, len(readings)):
         r = readings[i]
         
-        delta = [None] * COUNT_READING_ATTRIBUTES
-        
-        table_data.append( [ r.date.strftime( DATE_STR_FORMAT ) +NL+ f"    Tage:{(r.date - readings[i-1].date).days:>3d}" ] )
+        row = [ format_date( r.date, DATE_STR_FORMAT ) +NL+ f"    Tage:{(r.date - readings[i-1].date).days:>3d}" ]
         
         for k in range( COUNT_DIGIT_OBJS ):
             if r.attributes[k] is None:
-                table_data[-1].append(
-                    fmt.format_decimal( None, LIST_DIGIT_OBJ_LAYOUTS[k] ) +NL+\
-                    fmt.format_decimal( None, DIGIT_LAYOUT_DELTA ) +" "+ fmt.format_decimal( None, LIST_DIGIT_OBJ_LAYOUTS[k] )
-                )
+                row.append( blank_cells[k] )
                 continue
             
-            delta[k]  = None
-            earlier_v = None
-            n = (i-1)+1
+            # change since the nearest earlier value, shared with the statistics
+            change = deltas[ i, k ]
             
-            # search for an earlier value to calculate a delta value
-            while (n:=n-1) >= 0:
-                earlier_v = readings[n].attributes[k]
-                if earlier_v is not None:
-                    delta[k] = r.attributes[k] - earlier_v
-                    break
-            
-            ddays = ( r.date - readings[n].date ).days
-            
-            table_data[-1].append(
-                fmt.format_decimal( r.attributes[k], LIST_DIGIT_OBJ_LAYOUTS[k] ) +NL+\
-                fmt.format_decimal( delta[k]/ddays if delta[k] else None, DIGIT_LAYOUT_DELTA ) +" "+ fmt.format_decimal( delta[k], LIST_DIGIT_OBJ_LAYOUTS[k] )
+            row.append(
+                fmt_values[k]( r.attributes[k] ) +NL+\
+                fmt_delta( change.rate if change else None ) +" "+ fmt_values[k]( change.delta if change else None )
             )
-    
-    return tabulating( table_data )
+        
+        yield row
 
-def generate_printout_readings_statistics( readings:list[ db.Reading ], use_years_for_stats_section:bool=True, tablefmt="grid" ) -> str:
+def generate_printout_readings_statistics( readings:list[ db.Reading ], use_years_for_stats_section:bool=True, tablefmt="grid", analysis:model.Analyze_Reading|None=None ) -> str:
     """
     generate string of table of readings grouped and summarized by [optional](years and) months
 
@@ -359,12 +496,13 @@ def generate_printout_readings_statistics( readings:list[ db.Reading ], use_year
         readings (`list[ db.Reading ]`): raw data directly from database
         use_years_for_stats_section (`bool`, optional): if `True` groups readings in `Table 2` by year and months, `False` groups only by months. Defaults to `True`.
         tablefmt (`str`, optional): table format to be used by the `tabulate` module. Defaults to "grid".
+        analysis (`model.Analyze_Reading | None`, optional): already created analysis of `readings`. Defaults to None.
 
     Returns:
         str: Table of readings grouped and summarized by [optional](year and) month with additional statistical information to be printed on screen or pdf
     """
     
-    ana_reading = model.Analyze_Reading( readings )
+    ana_reading = analysis or model.Analyze_Reading( readings )
     years = ana_reading.monthly()
     
     if use_years_for_stats_section:
@@ -462,11 +600,54 @@ def readings_tabulate_data(
         table_data = [["no data"]*len(TABLE_HEADER_READINGS_STATS)]
     
     
-    return tabulate(
+    colalign = ('left', 'center', 'center', 'center')
+    
+    # one row per month, short enough to measure the cells instead of deriving their widths
+    return NL.join( stream.stream_table(
         table_data,
-        headers=TABLE_HEADER_READINGS_STATS,
-        tablefmt=tablefmt,
-        disable_numparse=True,
-        colalign=('left', 'center', 'center', 'center')
-    )
+        TABLE_HEADER_READINGS_STATS,
+        stream.column_widths( TABLE_HEADER_READINGS_STATS, stream.cell_widths( table_data, colalign ) ),
+        colalign,
+        tablefmt
+    ) )
 
+
+
+if __name__ == "__main__":
+    # memory benchmark: render the full readings report over a large synthetic history
+    import sys, random, tracemalloc
+    from time     import perf_counter
+    from datetime import timedelta
+    
+    COUNT_READINGS = int( sys.argv[1] ) if len( sys.argv ) > 1 else 100_000
+    
+    random.seed( 0 )
+    tracemalloc.start()
+    
+    start = date( 1750, 1, 1 )
+    readings = [
+        db.Reading(
+            start + timedelta( days=i ),
+            [
+                1000.0 + 2.5*i + random.random(),
+                50.0 + 0.3*i + 0.1*random.random() if i % 3 else None,
+                10.0 + 0.1*i + 0.01*random.random()
+            ]
+        )
+        for i in range( COUNT_READINGS )
+    ]
+    
+    memory_readings, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    
+    t = perf_counter()
+    report = generate_printout_readings_all( readings )
+    t = perf_counter() - t
+    
+    _, memory_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    
+    print( f"readings: {COUNT_READINGS}" )
+    print( f"memory of readings:    {memory_readings / 2**20:8.2f} MiB" )
+    print( f"peak while reporting:  {memory_peak / 2**20:8.2f} MiB" )
+    print( f"report: {len( report )} characters in {t:.2f}s" )